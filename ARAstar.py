@@ -0,0 +1,142 @@
+import heapq
+import time
+from node import Node
+from search_stats import Progress, SearchStats
+
+
+def arastar(initial_state, heuristic, successorFn, isGoal, weight=3.0, decrement=0.5, final_weight=1.0,
+            time_limit=None, on_solution=None, stats=None, progress=None, every=1000):
+    """
+    Anytime repairing A* (ARA*): weighted A* searches ordered by f = g + w * h,
+    lowering w after each solution and reusing the previous search (g values,
+    open list and cached h) instead of starting over.
+    - initial_state, heuristic, successorFn, isGoal: as for astar
+    - weight: first w; decrement: how much w drops per iteration, down to
+      final_weight (1 gives a proven optimal solution at the end)
+    - time_limit: seconds after which no new iteration is started and the
+      current one stops; the first solution is always completed  [optional]
+    - on_solution(node, bound): called whenever the solution gets shorter or its
+      suboptimality bound (solution length <= bound * optimal) gets tighter,
+      never twice for the same pair  [optional]
+    - stats: SearchStats to fill in; also records iterations and the final
+      bound  [optional]
+    - progress(stats) -> bool: called every `every` expansions; return True to
+      stop and return the best solution so far  [optional]
+    With an admissible heuristic, each solution is at most w times optimal, and
+    the reported bound is usually tighter: its length over the smallest g + h
+    left unexpanded.
+    Starts that initial_state.reachability() proves unsolvable return None without searching.
+    Returns best goal Node or None.
+    """
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+    deadline = None if time_limit is None else started + time_limit
+    successorFn = stats.timedSuccessors(successorFn)
+    heuristic, incremental = stats.timedHeuristic(heuristic)
+    report = Progress(progress, every)
+    if not isGoal(initial_state) and not initial_state.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return None
+
+    start_key = initial_state.getStateKey()
+    start = Node(initial_state)
+    h_values = {start_key: heuristic(initial_state)}
+    stats.heuristic_calls += 1
+    g_costs = {start_key: 0}
+    best = start if isGoal(initial_state) else None
+    # Nodes waiting to be (re)expanded: open (keyed by the current w) and
+    # incons (improved after being closed in this iteration)
+    frontier = {start_key: start}
+    w = max(weight, final_weight)
+    reported = None  # (length, bound) last passed to on_solution
+
+    while True:
+        stats.iterations += 1
+        open_list = []
+        for key, node in frontier.items():
+            node.f = node.g + w * h_values[key]
+            open_list.append((node.f, node))
+        heapq.heapify(open_list)
+        closed = set()
+        incons = {}
+
+        while open_list and (best is None or best.g > open_list[0][0]):
+            _, current = heapq.heappop(open_list)
+            cur_key = current.state.getStateKey()
+            if cur_key in closed or g_costs[cur_key] != current.g:
+                stats.duplicates += 1
+                continue
+
+            closed.add(cur_key)
+            stats.expanded += 1
+            if (stats.expanded == report.next and report(stats)) or \
+                    (best is not None and deadline is not None and stats.expanded & 255 == 0
+                     and time.perf_counter() > deadline):
+                # Put it back unexpanded so the bound below still accounts for it
+                closed.discard(cur_key)
+                stats.expanded -= 1
+                heapq.heappush(open_list, (current.f, current))
+                break
+
+            parent_h = h_values[cur_key]
+            for action, succ in successorFn(current.state):
+                succ_key = succ.getStateKey()
+                g_new = current.g + 1
+                if g_new >= g_costs.get(succ_key, g_new + 1):
+                    stats.duplicates += 1
+                    continue
+                g_costs[succ_key] = g_new
+                child = Node(succ, current, action, g_new)
+                if isGoal(succ):
+                    # Goals are never expanded; the best one is the incumbent
+                    if best is None or g_new < best.g:
+                        best = child
+                    continue
+                h = h_values.get(succ_key)
+                if h is None:
+                    h = incremental(current.state, parent_h, succ) if incremental is not None else heuristic(succ)
+                    h_values[succ_key] = h
+                    stats.heuristic_calls += 1
+                stats.generated += 1
+                if succ_key in closed:
+                    incons[succ_key] = child
+                else:
+                    child.f = g_new + w * h
+                    heapq.heappush(open_list, (child.f, child))
+            if len(open_list) > stats.peak_open:
+                stats.peak_open = len(open_list)
+
+        stats.peak_closed = max(stats.peak_closed, len(closed))
+        frontier = incons
+        for _, node in open_list:
+            key = node.state.getStateKey()
+            if key not in closed and g_costs[key] == node.g:
+                frontier[key] = node
+        if best is None:
+            break
+        # Optimal length >= min(best.g, smallest g + h still waiting); a waiting
+        # state is not a goal, so it is at least one move from one
+        lower = min((node.g + h_values[key] for key, node in frontier.items()), default=best.g)
+        stats.bound = min(w, best.g / max(lower, 1)) if lower < best.g else 1.0
+        stats.depth = best.g
+        if on_solution is not None and (reported is None or best.g < reported[0] or stats.bound < reported[1]):
+            reported = (best.g, stats.bound)
+            on_solution(best, stats.bound)
+        if stats.bound <= final_weight or stats.aborted or \
+                (deadline is not None and time.perf_counter() > deadline):
+            break
+        w = max(min(w - decrement, stats.bound), final_weight)
+
+    stats.elapsed = time.perf_counter() - started
+    return best
+
+
+def weighted_astar(initial_state, heuristic, successorFn, isGoal, weight=2.0, stats=None, progress=None, every=1000):
+    """
+    Weighted A*: one ARA* iteration ordered by f = g + weight * h, so the
+    solution is at most weight times optimal (stats.bound is usually tighter).
+    Arguments and result as for arastar.
+    """
+    return arastar(initial_state, heuristic, successorFn, isGoal, weight=weight, final_weight=weight,
+                   stats=stats, progress=progress, every=every)
@@ -1,72 +1,335 @@
 # a.py
 import heapq
+import time
 from node import Node
+from search_stats import Progress, SearchStats
 
-def astar(initial_state, heuristic, successorFn, isGoal):
+def astar(initial_state, heuristic, successorFn, isGoal, closed=None, max_open=None,
+          stats=None, progress=None, every=1000, g_costs=None):
     """
     A* search.
     - initial_state: RushHourPuzzle
-    - heuristic: function(state) -> number (h)
+    - heuristic: function(state) -> number (h); if it also has
+      fromParent(parent, parent_h, state), children are scored incrementally
     - successorFn(state) -> list of (action, successor)  [optional]
     - isGoal(state) -> bool  [optional]
+    - closed: set-like store for expanded keys, with add, in and discard
+      (see visited.py)  [optional]
+    - g_costs: empty dict-like store for the best g per key; defaults to a
+      dict, visited.IntHashMap takes a fraction of its memory  [optional]
+    - max_open: cap on the open list (SMA*-style); past it the worst nodes are
+      dropped and their parents reopened at the dropped f (see _drop_worst),
+      which bounds memory at the cost of re-expansions and may return a longer
+      solution  [optional]
+    - stats: SearchStats to fill in (see search_stats.py)  [optional]
+    - progress(stats) -> bool: called every `every` expansions; return True to abort  [optional]
+    Starts that initial_state.reachability() proves unsolvable return None without searching.
     Returns goal Node or None.
     """
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+    successorFn = stats.timedSuccessors(successorFn)
+    heuristic, incremental = stats.timedHeuristic(heuristic)
+    report = Progress(progress, every)
+    if not isGoal(initial_state) and not initial_state.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return None
+
     start = Node(initial_state, None, None, 0)
     start.setF(heuristic)
+    stats.heuristic_calls += 1
 
     open_list = []
     heapq.heappush(open_list, (start.f, start))
-    g_costs = {initial_state.getStateKey(): 0}
-    closed = set()
+    if g_costs is None:
+        g_costs = {}
+    g_costs[initial_state.getStateKey()] = 0
+    if closed is None:
+        closed = set()
+    stats.peak_open = 1
+    result = None
 
     while open_list:
-        _, current = heapq.heappop(open_list)
+        f, current = heapq.heappop(open_list)
+        # A reopened node's f is backed up from its forgotten subtree (see _drop_worst), which
+        # bounds every child it regenerates (pathmax); without a cap it is the node's own f
+        floor = f if max_open is not None else 0
 
         cur_key = current.state.getStateKey()
-        if cur_key in closed:
+        if cur_key in closed or (max_open is not None and g_costs.get(cur_key) != current.g):
+            stats.duplicates += 1
             continue
 
         if isGoal(current.state):
-            return current
+            result = current
+            stats.depth = current.g
+            break
 
         closed.add(cur_key)
+        stats.expanded += 1
+        if stats.expanded == report.next and report(stats):
+            break
 
         for action, succ in successorFn(current.state):
             succ_key = succ.getStateKey()
             g_new = current.g + 1
 
             if succ_key in g_costs and g_new >= g_costs[succ_key]:
+                stats.duplicates += 1
                 continue
+            if max_open is not None:
+                # Dropping can close a state on a longer path first; reopen it on a shorter one
+                closed.discard(succ_key)
 
             child = Node(succ, current, action, g_new)
-            child.setF(heuristic)
+            if incremental is not None:
+                child.f = g_new + incremental(current.state, current.f - current.g, succ)
+            else:
+                child.setF(heuristic)
+            stats.heuristic_calls += 1
 
             g_costs[succ_key] = g_new
 
-            heapq.heappush(open_list, (child.f, child))
+            heapq.heappush(open_list, (child.f if child.f >= floor else floor, child))
+            stats.generated += 1
+
+        if max_open is not None and len(open_list) > max_open:
+            _drop_worst(open_list, max_open, g_costs, closed, stats)
+        if len(open_list) > stats.peak_open:
+            stats.peak_open = len(open_list)
+
+    stats.peak_closed = len(closed)
+    stats.elapsed = time.perf_counter() - started
+    return result
+
 
-    return None
+def _open_order(entry):
+    """Sort key matching the heap's own order of (f, Node) entries, without Node comparisons."""
+    return entry[0], entry[1].f
+
+
+def _drop_worst(open_list, max_open, g_costs, closed, stats):
+    """Trim open_list to 3/4 of max_open, SMA*-style.
+
+    Nodes tied with the best f are never dropped, so the best layer is always
+    expanded. Each dropped node's parent keeps the smallest f of its dropped
+    children (backed up): it is taken out of closed and re-queued at that f, so
+    once the forgotten subtree looks best again the parent is re-expanded and
+    regenerates it. A solution is still found whenever its path fits in the cap.
+    """
+    open_list.sort(key=_open_order)  # a sorted list is still a heap
+    keep = max(1, max_open * 3 // 4)
+    best = open_list[0][0]
+    size = len(open_list)
+    while keep < size and open_list[keep][0] <= best:
+        keep += 1
+    dropped = open_list[keep:]
+    del open_list[keep:]
+    stats.dropped += len(dropped)
+
+    backed_up = {}  # parent key -> (smallest f of its dropped children, parent)
+    for f, node in dropped:
+        key = node.state.getStateKey()
+        if key in closed or g_costs.get(key) != node.g:
+            continue  # stale entry: the state was expanded or reached more cheaply since
+        if node.parent is None:
+            # The start (reopened earlier) is never forgotten
+            heapq.heappush(open_list, (f, node))
+            continue
+        del g_costs[key]
+        parent_key = node.parent.state.getStateKey()
+        if parent_key not in backed_up or f < backed_up[parent_key][0]:
+            backed_up[parent_key] = (f, node.parent)
+    for parent_key, (f, parent) in backed_up.items():
+        # A parent dropped in this same pass is covered by its own parent's backup
+        if g_costs.get(parent_key) == parent.g:
+            closed.discard(parent_key)
+            heapq.heappush(open_list, (f, parent))
 
 
 # =========================
 #        Heuristics
 # =========================
-def h1(state):
-    """Distance in columns from rightmost cell of X to the board right edge (number of empty squares)."""
-    red = next(v for v in state.vehicles if v["id"] == "X")
-    distance = state.board_width - (red["col"] + red["length"])
-    return distance
-
-def h2(state):
-    """h1 + number of distinct vehicles blocking the exit row in front of X."""
-    red = next(v for v in state.vehicles if v["id"] == "X")
-    y = red["row"]
-    blocking_ids = set()
-    for x in range(red["col"] + red["length"], state.board_width):
-        cell = state.board[y][x]
-        if cell != " " and cell != "#":
-            blocking_ids.add(cell)
-    return h1(state) + len(blocking_ids)
+class ExitIndex:
+    """Per-layout indexes used by the exit-row heuristics (built once per layout)."""
+
+    def __init__(self, layout):
+        if layout.x_index is None:
+            raise ValueError("puzzle has no X vehicle")
+        self.layout = layout
+        self.x = layout.x_index
+        self.x_horizontal = layout.orientations[self.x] == "H"
+        self.x_length = layout.lengths[self.x]
+        width = layout.board_width
+        # Horizontal vehicles per row and vertical vehicles per column (X excluded)
+        self.row_h = [[] for _ in range(layout.board_height)]
+        self.col_v = [[] for _ in range(width)]
+        for j, (orientation, line) in enumerate(zip(layout.orientations, layout.lines)):
+            if j == self.x:
+                continue
+            (self.row_h if orientation == "H" else self.col_v)[line].append(j)
+
+    @staticmethod
+    def of(layout):
+        index = getattr(layout, "exit_index", None)
+        if index is None:
+            index = layout.exit_index = ExitIndex(layout)
+        return index
+
+    def exitRow(self, positions):
+        """(row, first column ahead of X) for the scan done by h2/h3."""
+        layout = self.layout
+        pos = layout.position(positions, self.x)
+        if self.x_horizontal:
+            return layout.lines[self.x], pos + self.x_length
+        return pos, layout.lines[self.x] + self.x_length
+
+    def h1(self, positions):
+        layout = self.layout
+        col = layout.position(positions, self.x) if self.x_horizontal else layout.lines[self.x]
+        return layout.board_width - (col + self.x_length)
+
+    def blockers(self, positions, occupied):
+        """Indexes of distinct vehicles occupying X's row ahead of X."""
+        layout = self.layout
+        shifts, pos_mask, lengths = layout.shifts, layout.pos_mask, layout.lengths
+        y, start = self.exitRow(positions)
+        if y >= layout.board_height:
+            return []
+        blocking = [j for j in self.row_h[y]
+                    if ((positions >> shifts[j]) & pos_mask) + lengths[j] > start]
+        width = layout.board_width
+        row_base = y * width
+        for c in range(max(start, 0), width):
+            bit = 1 << (row_base + c)
+            if occupied & bit and not layout.wall_mask & bit:
+                for j in self.col_v[c]:
+                    p = (positions >> shifts[j]) & pos_mask
+                    if p <= y < p + lengths[j]:
+                        blocking.append(j)
+                        break
+        return blocking
+
+    def canMove(self, j, positions, occupied):
+        layout = self.layout
+        p = layout.position(positions, j)
+        bits = layout.cell_bits[j]
+        if p - 1 >= 0 and not occupied & bits[p - 1]:
+            return True
+        end = p + layout.lengths[j]
+        return end < len(bits) and not occupied & bits[end]
+
+    def evaluate(self, state, level):
+        positions, occupied = state.positions, state.occupied
+        h = self.h1(positions)
+        if level == 1:
+            return h
+        blocking = self.blockers(positions, occupied)
+        h += len(blocking)
+        if level == 3:
+            for j in blocking:
+                if not self.canMove(j, positions, occupied):
+                    h += 1
+        return h
+
+    def update(self, parent, parent_h, state, level):
+        """Value for state one move away from parent, reusing parent_h when the move cannot change it."""
+        if not self.x_horizontal:
+            return self.evaluate(state, level)
+        layout = self.layout
+        moved = ((parent.positions ^ state.positions).bit_length() - 1) // layout.bits
+        if moved == self.x:
+            return self.evaluate(state, level)
+        if level == 1:
+            return parent_h
+        y, start = self.exitRow(state.positions)
+        line = layout.lines[moved]
+
+        if layout.orientations[moved] == "H":
+            # Row-mates of X never pass it, so the set of blockers is unchanged
+            if level == 2:
+                return parent_h
+            if line == y:
+                behind = layout.position(state.positions, moved) < start
+                return parent_h if behind else self.evaluate(state, level)
+            return self.evaluate(state, level) if self.touchesBlocker(parent, state) else parent_h
+
+        if line < start:
+            return parent_h  # a column behind X's front: never a blocker nor next to one
+        length = layout.lengths[moved]
+        before = layout.position(parent.positions, moved)
+        after = layout.position(state.positions, moved)
+        covered_before = before <= y < before + length
+        covered_after = after <= y < after + length
+        if level == 2:
+            return parent_h + covered_after - covered_before
+        if covered_before or covered_after or self.touchesBlocker(parent, state):
+            return self.evaluate(state, level)
+        return parent_h
+
+    def touchesBlocker(self, parent, state):
+        layout = self.layout
+        y, start = self.exitRow(state.positions)
+        cells = parent.occupied ^ state.occupied
+        while cells:
+            low = cells & -cells
+            cells ^= low
+            c = (low.bit_length() - 1) % layout.board_width
+            if c >= start:
+                for j in self.col_v[c]:
+                    p = layout.position(state.positions, j)
+                    if p <= y < p + layout.lengths[j]:
+                        return True
+        return False
+
+
+class ExitRowHeuristic:
+    """Exit-row heuristic backed by ExitIndex, evaluated in full for every state."""
+
+    def __init__(self, level, doc):
+        self.level = level
+        self.__name__ = f"h{level}"
+        self.__doc__ = doc
+
+    def __call__(self, state):
+        return ExitIndex.of(state.layout).evaluate(state, self.level)
+
+    def __repr__(self):
+        return self.__name__
+
+
+class IncrementalExitRowHeuristic(ExitRowHeuristic):
+    """ExitRowHeuristic whose fromParent lets the searches score children from their parent's value.
+
+    Only h1 and h2 use it: for h3 the checks ExitIndex.update makes before reusing
+    the parent's value cost more than a full indexed evaluation
+    (python -m benchmarks.heuristics).
+    """
+
+    def fromParent(self, parent, parent_h, state):
+        return ExitIndex.of(state.layout).update(parent, parent_h, state, self.level)
+
+
+h1 = IncrementalExitRowHeuristic(1, """Distance in columns from rightmost cell of X to the board right edge (number of empty squares).""")
+
+h2 = IncrementalExitRowHeuristic(2, """h1 + number of distinct vehicles blocking the exit row in front of X.""")
+
+h3 = ExitRowHeuristic(3, """
+    Improved heuristic: h2 + penalty for blocking vehicles that are themselves blocked.
+    Encourages moves that free blockers.
+    """)
+
+
+def hs(state):
+    """Lower bound in slides: one slide of X unless it is at the exit, plus one per vehicle blocking it.
+
+    Admissible with RushHourPuzzle.slideSuccessors, where h1..h3 (counted in cells) overestimate.
+    """
+    if state.isGoal():
+        return 0
+    return 1 + len(ExitIndex.of(state.layout).blockers(state.positions, state.occupied))
+
 
 def can_vehicle_move(state, vehicle):
     """Check if a vehicle has at least one free move (used by h3)."""
@@ -88,25 +351,3 @@ def can_vehicle_move(state, vehicle):
         if r + length < state.board_height and state.board[r + length][c] == " ":
             return True
     return False
-
-def h3(state):
-    """
-    Improved heuristic: h2 + penalty for blocking vehicles that are themselves blocked.
-    Encourages moves that free blockers.
-    """
-    red = next(v for v in state.vehicles if v["id"] == "X")
-    y = red["row"]
-    blocking_ids = set()
-    penalty = 0
-    for x in range(red["col"] + red["length"], state.board_width):
-        cell = state.board[y][x]
-        if cell != " " and cell != "#":
-            blocking_ids.add(cell)
-
-    # For each blocking vehicle, check if it can move at all in current state
-    for bid in blocking_ids:
-        vehicle = next(v for v in state.vehicles if v["id"] == bid)
-        if not can_vehicle_move(state, vehicle):
-            penalty += 1
-
-    return h1(state) + len(blocking_ids) + penalty
\ No newline at end of file
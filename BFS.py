@@ -1,31 +1,67 @@
+import time
 from collections import deque
 from node import Node
+from search_stats import Progress, SearchStats
+
+def bfs(s, successorFn, isGoal, visited=None, stats=None, progress=None, every=1000):
+    """
+    Breadth-first search.
+    - visited: set-like store (see visited.py); defaults to a set
+    - stats: SearchStats to fill in (see search_stats.py)  [optional]
+    - progress(stats) -> bool: called every `every` expansions; return True to abort  [optional]
+    Starts that s.reachability() proves unsolvable return False without searching.
+    Returns goal Node, or False if there is no solution or the search was aborted.
+    """
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+    successorFn = stats.timedSuccessors(successorFn)
+    report = Progress(progress, every)
 
-def bfs(s, successorFn, isGoal):
     Open = deque()
-    visited = set()
+    if visited is None:
+        visited = set()
 
     init_node = Node(state=s)
     if isGoal(init_node.state):
+        stats.depth = 0
+        stats.elapsed = time.perf_counter() - started
         return init_node
+    if not s.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return False
 
     visited.add(init_node.state.getStateKey())
     Open.append(init_node)
+    result = False
 
     while Open:
+        if len(Open) > stats.peak_open:
+            stats.peak_open = len(Open)
         current = Open.popleft()
+        stats.expanded += 1
+        if stats.expanded == report.next and report(stats):
+            break
 
         for (action, successor) in successorFn(current.state):
             key = successor.getStateKey()
             if key in visited:
+                stats.duplicates += 1
                 continue
 
-            child = Node(state=successor, parent=current, action=action)
+            child = Node(state=successor, parent=current, action=action, g=current.g + 1)
+            stats.generated += 1
 
             if isGoal(child.state):
-                return child
+                result = child
+                stats.depth = child.g
+                break
 
             visited.add(key)
             Open.append(child)
+        if result:
+            break
 
-    return False
+    stats.peak_closed = len(visited)
+    stats.elapsed = time.perf_counter() - started
+    return result
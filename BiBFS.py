@@ -0,0 +1,145 @@
+import time
+from itertools import islice
+from node import Node
+from search_stats import Progress, SearchStats
+
+# Most goal states the backward search is seeded with; past it the search stays one-sided
+MAX_SEEDS = 20000
+
+
+def bidirectional_bfs(s, successorFn, isGoal, goalStates=None, max_seeds=MAX_SEEDS, stats=None, progress=None,
+                      every=1000):
+    """
+    Bidirectional breadth-first search meeting in the middle.
+    - s: RushHourPuzzle
+    - successorFn(state) -> list of (action, successor); moves must be reversible
+    - isGoal(state) -> bool
+    - goalStates: iterable of goal states seeding the backward search
+      (defaults to s.goalStates(), every goal within s.reachability() ranges)
+    - max_seeds: past this many goals the backward side is given up  [optional]
+    - stats: SearchStats to fill in (see search_stats.py)  [optional]
+    - progress(stats) -> bool: called every `every` expansions; return True to abort  [optional]
+    Expands whole layers from whichever side has the smaller frontier. Goal seeds
+    are pulled lazily, never more than one past the forward frontier's size: while
+    there are more goals than that, the search stays one-sided (plain BFS with a
+    goal test), and the backward side only starts once all goals are known and
+    no more numerous than the forward frontier. Goal sets larger than max_seeds
+    are dropped and the search finishes one-sided.
+    Starts that s.reachability() proves unsolvable return False without searching.
+    Returns goal Node (same shape as bfs) or False.
+    """
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+    successorFn = stats.timedSuccessors(successorFn)
+    report = Progress(progress, every)
+
+    if isGoal(s):
+        stats.depth = 0
+        stats.elapsed = time.perf_counter() - started
+        return Node(state=s)
+    if not s.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return False
+    if goalStates is None:
+        goalStates = s.goalStates()
+    seeds = iter(goalStates)
+
+    # key -> (state, depth, link): link is (parent key, action) forward, next key backward
+    forward = {s.getStateKey(): (s, 0, None)}
+    backward = {}
+
+    fwd_frontier = [s]
+    bwd_frontier = []
+    fwd_depth = bwd_depth = 0
+    seeding = two_sided = True
+    result = False
+
+    while fwd_frontier and (bwd_frontier or seeding or not two_sided) and not stats.aborted:
+        if seeding:
+            for goal in islice(seeds, max(0, min(len(fwd_frontier), max_seeds) + 1 - len(backward))):
+                backward[goal.getStateKey()] = (goal, 0, None)
+            if len(backward) > max_seeds:
+                # Too many goals for the backward side to pay off: plain BFS with a goal test from here on
+                backward.clear()
+                two_sided = seeding = False
+            elif len(backward) <= len(fwd_frontier):
+                # Asked for one more than this: every goal is known, start the backward side
+                seeding = False
+                bwd_frontier = [entry[0] for entry in backward.values()]
+                if not bwd_frontier:
+                    break
+        stats.peak_open = max(stats.peak_open, len(fwd_frontier) + len(bwd_frontier))
+        if seeding or not two_sided or len(fwd_frontier) <= len(bwd_frontier):
+            fwd_frontier, meet = _expand(fwd_frontier, fwd_depth, forward, backward, successorFn, isGoal,
+                                         stats, report)
+            fwd_depth += 1
+        else:
+            bwd_frontier, meet = _expand(bwd_frontier, bwd_depth, backward, forward, successorFn, None,
+                                         stats, report)
+            bwd_depth += 1
+        if meet is not None:
+            if meet not in backward:
+                backward[meet] = (forward[meet][0], 0, None)
+            result = _join(meet, forward, backward, successorFn)
+            stats.depth = result.g
+            break
+
+    stats.peak_closed = len(forward) + len(backward)
+    stats.elapsed = time.perf_counter() - started
+    return result
+
+
+def _expand(frontier, depth, own, other, successorFn, isGoal, stats, report):
+    """Expand one full layer; returns (next frontier, best meeting key or None).
+
+    isGoal is given for the forward side, which meets the backward one at any goal
+    (seeded or not yet pulled); the backward side passes None.
+    """
+    next_frontier = []
+    meet = None
+    best = None
+    for state in frontier:
+        stats.expanded += 1
+        if stats.expanded == report.next and report(stats):
+            return next_frontier, None
+        key = state.getStateKey()
+        for action, successor in successorFn(state):
+            succ_key = successor.getStateKey()
+            if succ_key in own:
+                stats.duplicates += 1
+                continue
+            own[succ_key] = (successor, depth + 1, (key, action) if isGoal is not None else key)
+            stats.generated += 1
+            next_frontier.append(successor)
+            if isGoal is not None and isGoal(successor):
+                return next_frontier, succ_key
+            if succ_key in other:
+                cost = other[succ_key][1]
+                if best is None or cost < best:
+                    meet, best = succ_key, cost
+    return next_frontier, meet
+
+
+def _join(meet, forward, backward, successorFn):
+    """Build the Node chain start -> meet from parent links, then follow backward links to the goal."""
+    keys = []
+    key = meet
+    while key is not None:
+        keys.append(key)
+        link = forward[key][2]
+        key = link[0] if link else None
+    keys.reverse()
+
+    node = Node(state=forward[keys[0]][0])
+    for key in keys[1:]:
+        state, depth, (_, action) = forward[key]
+        node = Node(state, node, action, depth)
+
+    next_key = backward[meet][2]
+    while next_key is not None:
+        # Backward links only record the neighbour; recover the action leading to it
+        action, state = next((a, succ) for a, succ in successorFn(node.state) if succ.getStateKey() == next_key)
+        node = Node(state, node, action, node.g + 1)
+        next_key = backward[next_key][2]
+    return node
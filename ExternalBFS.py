@@ -0,0 +1,246 @@
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from node import Node
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from LayerBFS import contains_sorted, expand_layer, fits_uint64, move_tables
+from search_stats import SearchStats
+
+# Smallest share of the merge buffer given to one run; more runs than fit are merged in passes
+MIN_RUN_BLOCK = 4096
+
+
+def layer_bytes(layout):
+    """Worst-case working memory per expanded state: unpacked positions plus up to two
+    children per vehicle, each with its parent index and move code, concatenated and sorted."""
+    vehicles = len(layout.ids)
+    return 8 * (vehicles + 2) + 2 * vehicles * (2 * 17 + 16)
+
+
+def read_keys(path):
+    """Sorted uint64 keys of a layer or run file, memory-mapped (empty files cannot be mapped)."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, np.uint64)
+    return np.memmap(path, np.uint64, mode="r")
+
+
+def external_bfs(s, memory=256 << 20, directory=None, keep=False, stats=None, progress=None):
+    """
+    Breadth-first search with the layers on disk, for state spaces larger than RAM.
+    - s: RushHourPuzzle; its goal test is RushHourPuzzle.isGoal
+    - memory: working-memory budget in bytes; layers are expanded in chunks and
+      merged in blocks sized to it (disk use is 8 bytes per reached state)
+    - directory: where the layer files go (a temporary directory inside it,
+      removed afterwards unless keep); defaults to the system temp dir  [optional]
+    - stats: SearchStats to fill in; also records peak_disk (bytes)  [optional]
+    - progress(stats) -> bool: called once per layer; return True to abort  [optional]
+    Each layer is a file of sorted uint64 getStateKey() values. A layer is
+    expanded chunk by chunk into sorted runs, which a streaming merge turns into
+    the next layer, dropping duplicates and states of the two layers before it
+    (moves are reversible, so that is enough). The path is rebuilt backwards:
+    from the goal, some predecessor (a successor, as moves are reversible) is in
+    the previous layer, found by binary search in the memory-mapped file.
+    Layouts that do not fit in 64 bits fall back to bfs.
+    Returns goal Node (same shape as bfs), or False if there is no solution or the search was aborted.
+    """
+    layout = s.layout
+    if not fits_uint64(layout):
+        return bfs(s, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal, stats=stats, progress=progress)
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+
+    if s.isGoal():
+        stats.depth = 0
+        stats.elapsed = time.perf_counter() - started
+        return Node(state=s)
+    if not s.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return False
+
+    chunk = max(1, memory // layer_bytes(layout))
+    block = max(MIN_RUN_BLOCK, memory // 40)  # keys per merge step (blocks, sort buffer, masks)
+    root = tempfile.mkdtemp(prefix="rush-hour-bfs-", dir=directory)
+    store = _LayerStore(root, stats)
+    try:
+        result = _search(s, layout, store, chunk, block, stats, progress)
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+    stats.elapsed = time.perf_counter() - started
+    return result
+
+
+class _LayerStore:
+    """Layer and run files of one search, tracking the disk they take."""
+
+    def __init__(self, root, stats):
+        self.root = root
+        self.stats = stats
+        self.disk = 0
+        self.runs = 0
+
+    def layer(self, depth):
+        return os.path.join(self.root, f"layer-{depth}.u64")
+
+    def newRun(self):
+        self.runs += 1
+        return os.path.join(self.root, f"run-{self.runs}.u64")
+
+    def written(self, nbytes):
+        self.disk += nbytes
+        self.stats.peak_disk = max(self.stats.peak_disk, self.disk)
+
+    def remove(self, path):
+        self.disk -= os.path.getsize(path)
+        os.remove(path)
+
+
+def _search(s, layout, store, chunk, block, stats, progress):
+    tables = move_tables(layout)
+    x_shift = np.uint64(layout.shifts[layout.x_index])
+    pos_mask = np.uint64(layout.pos_mask)
+    goal_pos = np.uint64(layout.goal_pos)
+
+    np.array([s.getStateKey()], np.uint64).tofile(store.layer(0))
+    store.written(8)
+    total = depth = 1
+    while True:
+        current = read_keys(store.layer(depth - 1))
+        if not len(current):
+            break
+        stats.expanded += len(current)
+        stats.peak_open = max(stats.peak_open, len(current))
+
+        runs = []
+        generated = 0
+        for start in range(0, len(current), chunk):
+            children, _, _ = expand_layer(np.array(current[start:start + chunk]), layout, tables)
+            generated += len(children)
+            run = store.newRun()
+            keys = np.unique(children)
+            keys.tofile(run)
+            store.written(keys.nbytes)
+            runs.append(run)
+            del children, keys
+        while len(runs) > max(2, block // MIN_RUN_BLOCK):
+            runs = _merge_pass(runs, store, block)
+
+        exclude = [current] + ([read_keys(store.layer(depth - 2))] if depth >= 2 else [])
+        goal = None
+        count = 0
+        with open(store.layer(depth), "wb") as out:
+            for keys in _merge(runs, block, exclude):
+                keys.tofile(out)
+                store.written(keys.nbytes)
+                count += len(keys)
+                goals = np.flatnonzero(((keys >> x_shift) & pos_mask) == goal_pos)
+                if len(goals):
+                    goal = int(keys[goals[0]])
+                    break
+        for run in runs:
+            store.remove(run)
+        stats.generated += count
+        stats.duplicates += generated - count
+        total += count
+        stats.peak_closed = total
+        del current, exclude
+
+        if goal is not None:
+            result = _path(s, store, depth, goal)
+            stats.depth = result.g
+            return result
+        if progress is not None and progress(stats):
+            stats.aborted = True
+            return False
+        depth += 1
+    return False
+
+
+def _merge_pass(runs, store, block):
+    """Merge groups of runs into fewer, longer runs (when there are too many to merge at once)."""
+    fan_in = max(2, block // MIN_RUN_BLOCK)
+    merged = []
+    for i in range(0, len(runs), fan_in):
+        group = runs[i:i + fan_in]
+        run = store.newRun()
+        with open(run, "wb") as out:
+            for keys in _merge(group, block):
+                keys.tofile(out)
+                store.written(keys.nbytes)
+        for path in group:
+            store.remove(path)
+        merged.append(run)
+    return merged
+
+
+def _merge(runs, block, exclude=()):
+    """Yield the sorted, de-duplicated union of sorted run files in pieces, minus the keys of
+    the sorted arrays in exclude; about `block` keys are held at a time.
+
+    Each step takes the next block / len(runs) keys of every run; everything up to the smallest
+    of their last keys is complete and can be emitted, the rest waits for the next step.
+    """
+    sources = [read_keys(run) for run in runs]
+    sources = [keys for keys in sources if len(keys)]
+    cursors = [0] * len(sources)
+    excluded = [0] * len(exclude)
+    step = max(1, block // max(1, len(sources)))
+    while sources:
+        heads = [keys[i:i + step] for keys, i in zip(sources, cursors)]
+        bound = min(int(head[-1]) for head in heads)
+        pieces = []
+        for k, head in enumerate(heads):
+            taken = int(np.searchsorted(head, np.uint64(bound), "right"))
+            pieces.append(head[:taken])
+            cursors[k] += taken
+        keys = np.unique(np.concatenate(pieces))
+        del pieces, heads
+        for k, layer in enumerate(exclude):
+            excluded[k], keys = _drop_present(layer, excluded[k], keys, block)
+        live = [k for k, keys_k in enumerate(sources) if cursors[k] < len(keys_k)]
+        sources = [sources[k] for k in live]
+        cursors = [cursors[k] for k in live]
+        if len(sources):
+            step = max(1, block // len(sources))
+        if len(keys):
+            yield keys
+
+
+def _drop_present(layer, cursor, keys, block):
+    """Streaming set difference: keys (sorted) minus the sorted layer, whose keys below `cursor`
+    are already known to be smaller than every key still to come. Returns (new cursor, keys left)."""
+    if not len(keys):
+        return cursor, keys
+    end = cursor + int(np.searchsorted(layer[cursor:], keys[-1], "right"))
+    present = np.zeros(len(keys), bool)
+    for start in range(cursor, end, block):
+        present |= contains_sorted(np.asarray(layer[start:min(start + block, end)]), keys)
+    return end, keys[~present]
+
+
+def _path(root, store, depth, goal):
+    """Node chain from the root to goal (in layer `depth`), scanning back one layer at a time."""
+    layout = root.layout
+    keys = [goal]
+    for d in range(depth - 1, 0, -1):
+        layer = read_keys(store.layer(d))
+        state = RushHourPuzzle.fromLayout(layout, keys[-1])
+        for _, child in state.successorFunction():
+            if contains_sorted(layer, np.array([child.positions], np.uint64))[0]:
+                keys.append(child.positions)
+                break
+        del layer
+    keys.reverse()
+
+    node = Node(state=root)
+    for g, key in enumerate(keys, 1):
+        state = RushHourPuzzle.fromLayout(layout, key)
+        move = next(action for action, child in node.state.successorFunction() if child.positions == key)
+        node = Node(state, node, move, g)
+    return node
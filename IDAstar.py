@@ -0,0 +1,112 @@
+import time
+from node import Node
+from search_stats import Progress, SearchStats
+
+
+def idastar(initial_state, heuristic, successorFn, isGoal, table_size=1 << 20,
+            stats=None, progress=None, every=1000, table_key=None):
+    """
+    Iterative-deepening A*: depth-first searches bounded by f = g + h, raising the
+    bound to the smallest f that exceeded it until a goal is found.
+    - initial_state, heuristic, successorFn, isGoal: as for astar
+    - table_size: max entries of the transposition table (key -> smallest g seen
+      in the current iteration); when full, the oldest entry is replaced
+    - table_key(state) -> transposition-table key; defaults to getStateKey. Keys that
+      merge states at equal distance from the goal (canonical.Canonicalizer.key)
+      let equivalent states share entries  [optional]
+    - stats: SearchStats to fill in; also records iterations, peak path depth
+      and peak table size  [optional]
+    - progress(stats) -> bool: called every `every` expansions; return True to abort  [optional]
+    Memory is linear in the solution depth plus the bounded table. Starts that
+    initial_state.reachability() proves unsolvable return None without searching.
+    Returns goal Node or None.
+    """
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+    successorFn = stats.timedSuccessors(successorFn)
+    heuristic, incremental = stats.timedHeuristic(heuristic)
+    report = Progress(progress, every)
+    if not isGoal(initial_state) and not initial_state.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return None
+
+    bound = heuristic(initial_state)
+    stats.heuristic_calls += 1
+    table = {}
+    found = None
+    while not stats.aborted:
+        stats.iterations += 1
+        table.clear()
+        found, next_bound = _bounded_dfs(initial_state, heuristic, incremental, successorFn, isGoal,
+                                         bound, table, table_size, stats, report, table_key)
+        if found is not None or next_bound == float("inf"):
+            break
+        bound = next_bound
+
+    stats.elapsed = time.perf_counter() - started
+    if found is not None:
+        stats.depth = found.g
+    return found
+
+
+def _bounded_dfs(initial_state, heuristic, incremental, successorFn, isGoal, bound, table, table_size, stats, report,
+                 table_key=None):
+    """One IDA* iteration with an explicit stack; returns (goal Node or None, next bound)."""
+    root = Node(initial_state)
+    root.f = heuristic(initial_state)
+    next_bound = float("inf")
+    on_path = {initial_state.getStateKey()}
+    # Each frame: (node, iterator over its successors not yet tried)
+    stack = [(root, None)]
+
+    while stack:
+        node, children = stack[-1]
+        if children is None:
+            if node.f > bound:
+                next_bound = min(next_bound, node.f)
+                stack.pop()
+                on_path.discard(node.state.getStateKey())
+                continue
+            if isGoal(node.state):
+                stats.peak_table = max(stats.peak_table, len(table))
+                return node, bound
+            stats.expanded += 1
+            if stats.expanded == report.next and report(stats):
+                return None, float("inf")
+            children = iter(successorFn(node.state))
+            stack[-1] = (node, children)
+
+        for action, succ in children:
+            key = succ.getStateKey()
+            g = node.g + 1
+            if key in on_path:
+                stats.duplicates += 1
+                continue
+            entry = key if table_key is None else table_key(succ)
+            seen = table.get(entry)
+            if seen is not None and seen <= g:
+                stats.duplicates += 1
+                continue
+            if seen is None and len(table) >= table_size:
+                del table[next(iter(table))]
+            table[entry] = g
+            stats.generated += 1
+
+            child = Node(succ, node, action, g)
+            if incremental is not None:
+                child.f = g + incremental(node.state, node.f - node.g, succ)
+            else:
+                child.f = g + heuristic(succ)
+            stats.heuristic_calls += 1
+            on_path.add(key)
+            stack.append((child, None))
+            if len(stack) - 1 > stats.peak_depth:
+                stats.peak_depth = len(stack) - 1
+            break
+        else:
+            stack.pop()
+            on_path.discard(node.state.getStateKey())
+
+    stats.peak_table = max(stats.peak_table, len(table))
+    return None, next_bound
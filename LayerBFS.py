@@ -0,0 +1,154 @@
+import time
+
+import numpy as np
+
+from node import Node
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from search_stats import SearchStats
+
+ALL_CELLS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def fits_uint64(layout):
+    """True if both the packed positions and the cell bitmask of layout fit in 64 bits."""
+    return len(layout.ids) * layout.bits <= 64 and layout.board_height * layout.board_width <= 64
+
+
+def move_tables(layout):
+    """Per-vehicle uint64 lookup arrays indexed by position: (step, body, forward cell, backward cell).
+
+    A blocked direction (off the board) maps to ALL_CELLS, which always intersects
+    the occupancy mask because the vehicle itself is on it.
+    """
+    tables = []
+    size = 1 << layout.bits
+    for i, shift in enumerate(layout.shifts):
+        bits = layout.cell_bits[i]
+        length = layout.lengths[i]
+        body = np.zeros(size, np.uint64)
+        forward = np.full(size, ALL_CELLS, np.uint64)
+        backward = np.full(size, ALL_CELLS, np.uint64)
+        for p in range(len(bits) - length + 1):
+            body[p] = layout.vehicleMask(i, p)
+            if p + length < len(bits):
+                forward[p] = bits[p + length]
+            if p > 0:
+                backward[p] = bits[p - 1]
+        tables.append((np.uint64(1 << shift), body, forward, backward))
+    return tables
+
+
+def contains_sorted(sorted_keys, values):
+    """Boolean mask of values present in sorted_keys."""
+    if len(sorted_keys) == 0:
+        return np.zeros(len(values), bool)
+    i = np.searchsorted(sorted_keys, values)
+    np.minimum(i, len(sorted_keys) - 1, out=i)
+    return sorted_keys[i] == values
+
+
+def expand_layer(layer, layout, tables):
+    """All one-cell moves from every state of layer at once: (children, parent index, move code) arrays."""
+    pos_mask = np.uint64(layout.pos_mask)
+    occupied = np.full(len(layer), layout.wall_mask, np.uint64)
+    positions = []
+    for (step, body, _, _), shift in zip(tables, layout.shifts):
+        p = ((layer >> np.uint64(shift)) & pos_mask).astype(np.intp)
+        positions.append(p)
+        occupied |= body[p]
+
+    children, parents, moves = [], [], []
+    for i, (step, _, forward, backward) in enumerate(tables):
+        p = positions[i]
+        for move, cells, child_of in ((2 * i, forward, np.add), (2 * i + 1, backward, np.subtract)):
+            index = np.flatnonzero((occupied & cells[p]) == 0)
+            children.append(child_of(layer[index], step))
+            parents.append(index)
+            moves.append(np.full(len(index), move, np.uint8))
+    return np.concatenate(children), np.concatenate(parents), np.concatenate(moves)
+
+
+def layer_bfs(s, stats=None, progress=None):
+    """
+    Level-synchronous breadth-first search over whole layers of packed states.
+    - s: RushHourPuzzle; its goal test is RushHourPuzzle.isGoal
+    - stats: SearchStats to fill in (see search_stats.py)  [optional]
+    - progress(stats) -> bool: called once per layer; return True to abort  [optional]
+    Each layer is a sorted uint64 array of getStateKey() values; successors are
+    generated with vectorized bitmask operations and deduplicated against the
+    current and previous layer only (moves are reversible, so a child can be no
+    older than its parent's parent). Per-layer parent indexes and move codes
+    rebuild the path. Layouts that do not fit in 64 bits fall back to bfs.
+    Returns goal Node (same shape as bfs), or False if there is no solution or the search was aborted.
+    """
+    layout = s.layout
+    if not fits_uint64(layout):
+        return bfs(s, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal, stats=stats, progress=progress)
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+
+    if s.isGoal():
+        stats.depth = 0
+        stats.elapsed = time.perf_counter() - started
+        return Node(state=s)
+    if not s.reachability().solvable:
+        stats.elapsed = time.perf_counter() - started
+        return False
+
+    tables = move_tables(layout)
+    x_shift = np.uint64(layout.shifts[layout.x_index])
+    pos_mask = np.uint64(layout.pos_mask)
+    goal_pos = np.uint64(layout.goal_pos)
+
+    previous = np.empty(0, np.uint64)
+    layers = [np.array([s.getStateKey()], np.uint64)]
+    links = [None]  # links[d] = (parent index into layers[d - 1], move code) per state of layer d
+    result = False
+    total = 1
+
+    while len(layers[-1]):
+        current = layers[-1]
+        stats.expanded += len(current)
+        stats.peak_open = max(stats.peak_open, len(current))
+        children, parents, moves = expand_layer(current, layout, tables)
+
+        keys, first = np.unique(children, return_index=True)
+        fresh = ~(contains_sorted(current, keys) | contains_sorted(previous, keys))
+        layer = keys[fresh]
+        first = first[fresh]
+        stats.generated += len(layer)
+        stats.duplicates += len(children) - len(layer)
+        total += len(layer)
+        layers.append(layer)
+        links.append((parents[first], moves[first]))
+        previous = current
+
+        goals = np.flatnonzero(((layer >> x_shift) & pos_mask) == goal_pos)
+        if len(goals):
+            result = _path(s, layers, links, int(goals[0]))
+            stats.depth = result.g
+            break
+        if progress is not None and progress(stats):
+            stats.aborted = True
+            break
+
+    stats.peak_closed = total
+    stats.elapsed = time.perf_counter() - started
+    return result
+
+
+def _path(root, layers, links, index):
+    """Node chain from the root to layers[-1][index], following per-layer parent links."""
+    steps = []
+    for depth in range(len(layers) - 1, 0, -1):
+        parents, moves = links[depth]
+        steps.append((depth, index, int(moves[index])))
+        index = int(parents[index])
+    steps.reverse()
+
+    node = Node(state=root)
+    for depth, index, move in steps:
+        node = Node(RushHourPuzzle.fromLayout(root.layout, int(layers[depth][index])), node, move, depth)
+    return node
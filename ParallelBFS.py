@@ -0,0 +1,181 @@
+import multiprocessing
+import os
+import time
+from array import array
+
+from node import Node
+from rush_hour import RushHourPuzzle
+from search_stats import SearchStats
+
+ROOT = 255  # move code marking the start state in a shard's parent links
+_MULT = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def owner(key, workers):
+    """Index of the worker whose shard holds key (multiplicative hash, so nearby keys spread out).
+
+    hash() folds keys wider than 64 bits and, unlike str hashes, is the same in every process.
+    """
+    return (((hash(key) * _MULT) & _MASK64) >> 32) % workers
+
+
+def _empty_batch(wide):
+    """Parallel sequences of child keys, parent keys and move codes; keys above 64 bits need lists."""
+    if wide:
+        return [], [], array("B")
+    return array("Q"), array("Q"), array("B")
+
+
+def _worker(index, workers, layout, wide, conn):
+    """Own one shard of the visited set; each "level" message inserts a batch and expands what was new.
+
+    Replies ("goal", key) when a new state is a goal, else ("expanded", new count, batches)
+    with one batch of generated states per destination worker.
+    """
+    visited = {}  # key -> (parent key, move code)
+    stats = {"worker": index, "expanded": 0, "duplicates": 0, "sent": 0, "busy": 0.0}
+    x_shift = layout.shifts[layout.x_index] if layout.x_index is not None else 0
+    pos_mask = layout.pos_mask
+    goal_pos = layout.goal_pos
+    fromLayout = RushHourPuzzle.fromLayout
+
+    while True:
+        message = conn.recv()
+        command = message[0]
+        if command == "level":
+            start = time.perf_counter()
+            _, keys, parents, moves = message
+            frontier = []
+            for key, parent, move in zip(keys, parents, moves):
+                if key in visited:
+                    stats["duplicates"] += 1
+                    continue
+                visited[key] = (parent, move)
+                frontier.append(key)
+
+            goal = next((key for key in frontier if (key >> x_shift) & pos_mask == goal_pos), None)
+            if goal is not None:
+                stats["busy"] += time.perf_counter() - start
+                conn.send(("goal", goal))
+                continue
+
+            batches = [_empty_batch(wide) for _ in range(workers)]
+            for key in frontier:
+                for move, child in fromLayout(layout, key).successorFunction():
+                    child_key = child.positions
+                    batch = batches[owner(child_key, workers)]
+                    batch[0].append(child_key)
+                    batch[1].append(key)
+                    batch[2].append(move)
+            stats["expanded"] += len(frontier)
+            stats["sent"] += sum(len(batch[0]) for batch in batches)
+            stats["busy"] += time.perf_counter() - start
+            conn.send(("expanded", len(frontier), batches))
+        elif command == "parent":
+            conn.send(visited[message[1]])
+        elif command == "stats":
+            conn.send(dict(stats, states=len(visited)))
+        else:
+            conn.close()
+            return
+
+
+def parallel_bfs(s, workers=None, stats=None):
+    """
+    Breadth-first search with the visited set sharded across worker processes.
+    - s: RushHourPuzzle; its goal test is RushHourPuzzle.isGoal
+    - workers: number of processes (default: all cores)
+    - stats: SearchStats to fill in; stats.workers gets one dict per worker
+      (states owned, expanded, duplicates, states sent, busy seconds)  [optional]
+    Each level, every worker deduplicates the states it owns (by key hash),
+    expands the new ones and returns its generated states batched per owner;
+    the coordinator routes the batches for the next level. Levels are
+    synchronous, so the first goal found is at optimal depth.
+    Returns goal Node (same shape as bfs) or False.
+    """
+    layout = s.layout
+    if stats is None:
+        stats = SearchStats()
+    started = time.perf_counter()
+    if s.isGoal():
+        stats.depth = 0
+        return Node(state=s)
+    if not s.reachability().solvable:
+        return False
+
+    workers = workers or os.cpu_count()
+    wide = len(layout.ids) * layout.bits > 64
+    context = multiprocessing.get_context()
+    conns, processes = [], []
+    for index in range(workers):
+        conn, child_conn = context.Pipe()
+        process = context.Process(target=_worker, args=(index, workers, layout, wide, child_conn), daemon=True)
+        process.start()
+        conns.append(conn)
+        processes.append(process)
+
+    try:
+        root = s.getStateKey()
+        incoming = [_empty_batch(wide) for _ in range(workers)]
+        batch = incoming[owner(root, workers)]
+        batch[0].append(root)
+        batch[1].append(root)
+        batch[2].append(ROOT)
+
+        goal = None
+        while goal is None and any(len(batch[0]) for batch in incoming):
+            for conn, batch in zip(conns, incoming):
+                conn.send(("level",) + batch)
+            replies = [conn.recv() for conn in conns]
+            goal = next((reply[1] for reply in replies if reply[0] == "goal"), None)
+            if goal is not None:
+                break
+            stats.peak_open = max(stats.peak_open, sum(reply[1] for reply in replies))
+            incoming = [_empty_batch(wide) for _ in range(workers)]
+            for reply in replies:
+                for target, (keys, parents, moves) in zip(incoming, reply[2]):
+                    target[0].extend(keys)
+                    target[1].extend(parents)
+                    target[2].extend(moves)
+
+        result = _path(s, goal, conns, workers) if goal is not None else False
+
+        for conn in conns:
+            conn.send(("stats",))
+        stats.workers = [conn.recv() for conn in conns]
+        stats.expanded = sum(w["expanded"] for w in stats.workers)
+        stats.duplicates = sum(w["duplicates"] for w in stats.workers)
+        stats.peak_closed = sum(w["states"] for w in stats.workers)
+        stats.generated = stats.peak_closed - 1
+        if result:
+            stats.depth = result.g
+        for conn in conns:
+            conn.send(("stop",))
+    finally:
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+    stats.elapsed = time.perf_counter() - started
+    return result
+
+
+def _path(root, goal, conns, workers):
+    """Follow parent links from goal back to the start across shards, then build the Node chain."""
+    steps = []
+    key = goal
+    while True:
+        conn = conns[owner(key, workers)]
+        conn.send(("parent", key))
+        parent, move = conn.recv()
+        if move == ROOT:
+            break
+        steps.append((move, key))
+        key = parent
+    steps.reverse()
+
+    node = Node(state=root)
+    for move, key in steps:
+        node = Node(RushHourPuzzle.fromLayout(root.layout, key), node, move, node.g + 1)
+    return node
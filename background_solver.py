@@ -0,0 +1,98 @@
+import multiprocessing
+import queue
+import time
+
+from search_stats import SearchStats
+from solvers import get_solver, solver_label
+
+
+def _solve(puzzle, algo, heuristic, results, cancel):
+    """Worker process: solve puzzle, streaming progress stats, improved solutions (ARA*) and then the
+    move list through results."""
+    stats = SearchStats()
+
+    def progress(st):
+        results.put(("progress", st.asDict()))
+        return cancel.is_set()
+
+    def on_solution(node, bound):
+        results.put(("solution", node.getSolution(), bound, stats.asDict()))
+
+    try:
+        node = get_solver(algo, heuristic)(puzzle, stats, progress, on_solution)
+        results.put(("done", node.getSolution() if node else None, stats.asDict()))
+    except Exception as e:
+        results.put(("error", f"{type(e).__name__}: {e}", stats.asDict()))
+
+
+class BackgroundSolver:
+    """One solver running in its own process, so the caller (the UI loop) never blocks.
+
+    Call poll() regularly: it drains progress messages into .stats and sets .done,
+    .actions (move list, or None when there is no solution) and .error when the
+    worker finishes. An anytime solver (arastar) also sets .actions and .bound
+    (solution length <= bound * optimal) each time it improves its solution, before
+    it is done. cancel() asks the solver to stop at its next progress check
+    and kills the process if it does not.
+    """
+
+    def __init__(self, puzzle, algo, heuristic="h3"):
+        self.label = solver_label(algo, heuristic)
+        self.stats = {}
+        self.done = False
+        self.actions = None
+        self.bound = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        context = multiprocessing.get_context()
+        self._results = context.Queue()
+        self._cancel = context.Event()
+        self._process = context.Process(target=_solve, args=(puzzle, algo, heuristic, self._results, self._cancel),
+                                        daemon=True)
+        self._process.start()
+
+    def poll(self):
+        """Apply any messages from the worker; returns True once it has finished."""
+        if self.done:
+            return True
+        self._drain()
+        self.elapsed = time.perf_counter() - self.started
+        if not self.done and not self._process.is_alive():
+            # The worker may have sent its result and exited after the drain above
+            self._drain(timeout=0.1)
+            if not self.done:
+                self._results.close()
+                self.error = "solver process exited unexpectedly"
+                self.done = True
+        if self.done:
+            self._process.join()
+        return self.done
+
+    def _drain(self, timeout=None):
+        """Apply every queued message; with a timeout, wait that long for each one."""
+        while not self.done:
+            try:
+                message = self._results.get(timeout=timeout) if timeout else self._results.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            self.stats = message[-1]
+            if kind == "solution":
+                self.actions, self.bound = message[1], message[2]
+            elif kind == "done":
+                self.actions = message[1]
+                self.bound = self.stats.get("bound")
+                self.done = True
+            elif kind == "error":
+                self.error = message[1]
+                self.done = True
+
+    def cancel(self, grace=0.2):
+        if self._process.is_alive():
+            self._cancel.set()
+            self._process.join(grace)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        self.done = True
@@ -0,0 +1,154 @@
+"""Solve many puzzle files in parallel and stream one JSON line per puzzle.
+
+    python batch.py examples/ --workers 8 --algo astar --heuristic h3 --time-limit 60
+    python batch.py "puzzles/**/*.csv" --memory-limit 2048 > results.jsonl
+    python batch.py corpus.rhc --workers 8 > results.jsonl
+
+A .rhc corpus (see binary_corpus.py) becomes one task per record; workers
+mmap the file and decode only the records they are given.
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from binary_corpus import SUFFIX, expand_sources, load_source, source_name
+from solvers import ALGORITHMS, HEURISTICS, MOVES, get_solver, solver_label
+
+
+class SolveTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise SolveTimeout()
+
+
+def _init_worker(memory_limit_mb):
+    """Per-process setup: cap the address space and route SIGALRM to SolveTimeout."""
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def solve_file(source, algo, heuristic, time_limit, with_solution, moves="cells"):
+    """Solve one puzzle (CSV path or (corpus, index) source) inside a worker; always returns a result dict, never raises."""
+    result = {"file": source_name(source), "solver": solver_label(algo, heuristic, moves)}
+    start = time.perf_counter()
+    if time_limit:
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        puzzle = load_source(source)
+        node = get_solver(algo, heuristic, moves)(puzzle)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        if node:
+            solution = node.getSolution()
+            result.update(status="solved", moves=len(solution))
+            if with_solution:
+                result["solution"] = solution
+        else:
+            result.update(status="unsolvable", moves=None)
+    except SolveTimeout:
+        result.update(status="timeout", moves=None)
+    except MemoryError:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        result.update(status="memory", moves=None)
+    except Exception as e:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        result.update(status="error", moves=None, error=f"{type(e).__name__}: {e}")
+    result["time"] = round(time.perf_counter() - start, 6)
+    # Workers are reused, so this is the high-water mark of every puzzle the worker has solved so far
+    result["worker"] = os.getpid()
+    result["worker_max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def collect_files(patterns):
+    """Expand directories (all *.csv and *.rhc inside) and glob patterns into a sorted, de-duplicated list."""
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.update(glob.glob(os.path.join(pattern, "*.csv")))
+            files.update(glob.glob(os.path.join(pattern, "*" + SUFFIX)))
+        else:
+            files.update(glob.glob(pattern, recursive=True))
+    return sorted(files)
+
+
+def run_batch(sources, algo="bfs", heuristic="h3", workers=None, time_limit=None,
+              memory_limit_mb=None, with_solution=False, moves="cells", out=sys.stdout):
+    """Solve sources (see solve_file) across a process pool, writing each result as a JSON line as soon as it completes.
+
+    A worker that dies (crash, OOM kill) breaks the pool. The puzzles in flight at that moment are
+    then solved again one per fresh process, which pins the crash on the puzzle that caused it
+    (recorded with status "crashed"), and the rest of the batch continues in a new pool.
+    """
+    task = (algo, heuristic, time_limit, with_solution, moves)
+    pending = deque(sources)
+    while pending:
+        for source in _run_pool(pending, workers or os.cpu_count(), memory_limit_mb, task, out):
+            if _run_pool(deque([source]), 1, memory_limit_mb, task, out):
+                out.write(json.dumps({"file": source_name(source), "solver": solver_label(algo, heuristic, moves),
+                                      "status": "crashed", "moves": None, "error": "worker process died"}) + "\n")
+                out.flush()
+
+
+def _run_pool(pending, workers, memory_limit_mb, task, out):
+    """Solve sources taken from the pending deque with at most `workers` in flight.
+
+    Returns [] once pending is empty, or the sources in flight when a worker died (the rest stay in pending).
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(memory_limit_mb,)) as pool:
+        running = {}
+        while pending or running:
+            while pending and len(running) < workers:
+                source = pending.popleft()
+                running[pool.submit(solve_file, source, *task)] = source
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = []
+            for future in done:
+                source = running.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken.append(source)
+                    continue
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            if broken:
+                return broken + list(running.values())
+    return []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many Rush Hour puzzle CSVs in parallel.")
+    parser.add_argument("paths", nargs="+", help="puzzle directories, glob patterns or .rhc corpora")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--algo", choices=ALGORITHMS, default="bfs")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS), default="h3", help="A* heuristic")
+    parser.add_argument("--moves", choices=MOVES, default="cells",
+                        help="optimize one-cell moves or multi-cell slides (use --heuristic hs with A*)")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per puzzle")
+    parser.add_argument("--memory-limit", type=int, default=None, help="MiB of address space per worker")
+    parser.add_argument("--solutions", action="store_true", help="include the move list in each result")
+    args = parser.parse_args(argv)
+
+    sources = expand_sources(collect_files(args.paths))
+    if not sources:
+        parser.error("no puzzle files matched")
+    run_batch(sources, args.algo, args.heuristic, args.workers, args.time_limit,
+              args.memory_limit, args.solutions, args.moves)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Time to a first solution: A* against weighted A* and ARA* (ARAstar.py).
+
+Run from the repository root:  python -m benchmarks.anytime [random 8x8 puzzles] [seed] [max expansions]
+
+Puzzles are examples/*.csv and seeded random 8x8 layouts (generator.py), all
+with h3. Each cell is moves / seconds, plus the reported suboptimality bound
+for the weighted searches; the ARA* columns are its first solution and the
+(proven optimal) last one. Searches past max expansions are stopped ("-").
+"""
+import glob
+import random
+import sys
+import time
+
+from ARAstar import arastar, weighted_astar
+from Astar import astar, h3
+from generator import random_layout
+from rush_hour import RushHourPuzzle
+from search_stats import SearchStats
+
+WEIGHTS = (2.0, 5.0)
+
+
+def timed(search, puzzle, max_expanded, **kwargs):
+    """(goal Node or None, SearchStats), aborting past max_expanded expansions."""
+    stats = SearchStats()
+    node = search(puzzle, h3, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal, stats=stats,
+                  progress=lambda st: st.expanded >= max_expanded, **kwargs)
+    return node, stats
+
+
+def cell(node, stats, bound=False):
+    if node is None or stats.aborted:
+        return "-"
+    text = f"{node.g} / {stats.elapsed:.3f}"
+    return text + f" ({stats.bound:.2f})" if bound else text
+
+
+def main(count=6, seed=1, max_expanded=1000000):
+    rng = random.Random(seed)
+    puzzles = [(path, RushHourPuzzle(path)) for path in sorted(glob.glob("examples/*.csv"))]
+    found = 0
+    while found < count:
+        puzzle = random_layout(rng, 8, 8, 20)
+        if puzzle.reachability().solvable:
+            found += 1
+            puzzles.append((f"random 8x8 #{found}", puzzle))
+
+    header = ["A*"] + [f"w = {w:g}" for w in WEIGHTS] + ["ARA* first", "ARA* last"]
+    print(f"{'puzzle':<22}" + "".join(f"{name:>20}" for name in header))
+    for name, puzzle in puzzles:
+        row = [cell(*timed(astar, puzzle, max_expanded))]
+        for w in WEIGHTS:
+            row.append(cell(*timed(weighted_astar, puzzle, max_expanded, weight=w), bound=True))
+        first = []
+        started = time.perf_counter()
+
+        def on_solution(node, bound):
+            if not first:
+                first.append(f"{node.g} / {time.perf_counter() - started:.3f} ({bound:.2f})")
+        node, stats = timed(arastar, puzzle, max_expanded, weight=WEIGHTS[-1], on_solution=on_solution)
+        row += [first[0] if first else "-", cell(node, stats)]
+        print(f"{name:<22}" + "".join(f"{text:>20}" for text in row))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
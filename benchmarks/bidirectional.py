@@ -0,0 +1,38 @@
+"""Node expansions of bfs vs. bidirectional_bfs on every example.
+
+Run from the repository root:  python -m benchmarks.bidirectional
+"""
+import glob
+import time
+
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from BiBFS import bidirectional_bfs
+
+
+def run(solver, puzzle):
+    expansions = 0
+
+    def successors(state):
+        nonlocal expansions
+        expansions += 1
+        return state.successorFunction()
+
+    start = time.perf_counter()
+    node = solver(puzzle, successors, lambda s: s.isGoal())
+    duration = time.perf_counter() - start
+    return len(node.getSolution()) if node else None, expansions, duration
+
+
+def main():
+    print(f"{'puzzle':<20}{'moves':>7}{'bfs exp':>10}{'bidir exp':>11}{'bfs (s)':>9}{'bidir (s)':>11}")
+    for csv_file in sorted(glob.glob("examples/*.csv")):
+        puzzle = RushHourPuzzle(csv_file)
+        moves, bfs_exp, bfs_time = run(bfs, puzzle)
+        bi_moves, bi_exp, bi_time = run(bidirectional_bfs, puzzle)
+        assert moves == bi_moves, f"{csv_file}: {moves} != {bi_moves}"
+        print(f"{csv_file:<20}{str(moves):>7}{bfs_exp:>10}{bi_exp:>11}{bfs_time:>9.2f}{bi_time:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Distinct states before and after canonicalization (canonical.py).
+
+Run from the repository root:  python -m benchmarks.canonical [symmetric layouts] [seed] [max states]
+
+For each puzzle the whole connected component of its start is enumerated
+and counted twice: by getStateKey (what bfs/astar store) and by
+Canonicalizer.key. The corpus is examples/*.csv, their relabeled and mirrored
+copies, and generated 7x7 layouts built to be their own mirror (X in the middle
+row), the only case where a single search can merge states (and only when
+mirror images share a component). Components above max states are skipped
+(keys are mapped in Python, about 10 us per state). The last line
+counts (layout, state) pairs across the whole corpus, i.e. what a cache shared
+between puzzles would hold.
+"""
+import glob
+import random
+import sys
+
+from canonical import Canonicalizer, mirror_preserves_exit, mirror_puzzle, mirror_vehicle
+from generator import bfs_layers, random_layout
+from rush_hour import RushHourPuzzle
+
+
+def relabeled(puzzle, rng):
+    """Copy of puzzle with the non-X vehicle letters shuffled."""
+    ids = [v["id"] for v in puzzle.vehicles if v["id"] != "X"]
+    mapping = dict(zip(ids, rng.sample(ids, len(ids))))
+    copy = RushHourPuzzle()
+    copy.board_height, copy.board_width = puzzle.board_height, puzzle.board_width
+    copy.walls = list(puzzle.walls)
+    copy.vehicles = [dict(v, id=mapping.get(v["id"], "X")) for v in puzzle.vehicles]
+    copy.setBoard()
+    return copy
+
+
+def symmetric_layout(rng, size=7, vehicles=10):
+    """Random size x size puzzle equal to its own mirror, or None if the mirrored vehicles collide."""
+    base = random_layout(rng, size, size, vehicles)
+    middle = size // 2
+    puzzle = RushHourPuzzle()
+    puzzle.board_height = puzzle.board_width = size
+    top = [v for v in base.vehicles if v["orientation"] == "V" or v["row"] <= middle]
+    extra = [dict(mirror_vehicle(v, size), id=v["id"].lower()) for v in top
+             if v["orientation"] == "H" and v["row"] < middle]
+    puzzle.vehicles = top + extra
+    puzzle.setBoard()
+    if len(puzzle.layout.ids) != len(top) + len(extra) or not Canonicalizer.of(puzzle.layout).symmetric:
+        return None
+    return puzzle
+
+
+def component(puzzle, max_states):
+    """Every state key reachable from puzzle, or None past max_states."""
+    keys = []
+    for layer in bfs_layers(puzzle.layout, [puzzle.positions]):
+        keys.extend(int(key) for key in layer)
+        if len(keys) > max_states:
+            return None
+    return keys
+
+
+def main(count=5, seed=0, max_states=300000):
+    rng = random.Random(seed)
+    corpus = []
+    for path in sorted(glob.glob("examples/*.csv")):
+        puzzle = RushHourPuzzle(path)
+        corpus.append((path, puzzle))
+        corpus.append((path + " relabeled", relabeled(puzzle, rng)))
+        if mirror_preserves_exit(puzzle.layout):
+            corpus.append((path + " mirrored", mirror_puzzle(puzzle)))
+    found = 0
+    while found < count:
+        puzzle = symmetric_layout(rng)
+        if puzzle is not None and puzzle.reachability().solvable:
+            found += 1
+            corpus.append((f"symmetric 7x7 #{found}", puzzle))
+            corpus.append((f"symmetric 7x7 #{found} mirrored", mirror_puzzle(puzzle)))
+
+    raw, merged = set(), set()
+    print(f"{'puzzle':<36}{'states':>9}{'canonical':>11}{'reduction':>11}")
+    for name, puzzle in corpus:
+        canonicalizer = Canonicalizer.of(puzzle.layout)
+        keys = component(puzzle, max_states)
+        if keys is None:
+            print(f"{name:<36}{'(skipped: over ' + str(max_states) + ' states)':>31}")
+            continue
+        canonical = {canonicalizer.key(key) for key in keys}
+        raw.update((puzzle.layout.signature, key) for key in keys)
+        merged.update((canonicalizer.signature, key) for key in canonical)
+        print(f"{name:<36}{len(keys):>9}{len(canonical):>11}{1 - len(canonical) / len(keys):>11.1%}")
+    print(f"{'whole corpus (shared cache)':<36}{len(raw):>9}{len(merged):>11}{1 - len(merged) / len(raw):>11.1%}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
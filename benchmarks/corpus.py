@@ -0,0 +1,34 @@
+"""Seeded corpus of hard puzzles for the benchmark suite.
+
+Run from the repository root:  python -m benchmarks.corpus [count] [directory]
+
+The hardest of a fixed number of random 6x6 layouts from generator.py; the same
+seed always yields the same files, so results stay comparable between runs.
+"""
+import os
+import sys
+
+from generator import generate
+
+DEFAULT_DIR = os.path.join("benchmarks", "corpus")
+
+
+def hard_corpus(count=5, directory=DEFAULT_DIR, seed=0, tries=200):
+    """Write the count hardest of `tries` seeded random layouts to directory; returns the file paths.
+
+    Existing files from an earlier run with the same arguments are reused.
+    """
+    paths = [os.path.join(directory, f"hard-{seed}-{i}.csv") for i in range(count)]
+    if all(os.path.exists(path) for path in paths):
+        return paths
+    puzzles = generate(count, tries=tries, seed=seed)
+    os.makedirs(directory, exist_ok=True)
+    for path, (_, puzzle) in zip(paths, puzzles):
+        puzzle.saveCsv(path)
+    return paths[:len(puzzles)]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    for path in hard_corpus(int(args[0]) if args else 5, *args[1:]):
+        print(path)
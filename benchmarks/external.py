@@ -0,0 +1,62 @@
+"""Working memory of the in-RAM layer search against the disk-backed external_bfs (ExternalBFS.py).
+
+Run from the repository root:  python -m benchmarks.external [budget MiB ...]
+
+Puzzles are examples/*.csv and the hardest starts of two seeded random 8x8
+layouts with walls, whose components have about a million states. Memory is the tracemalloc peak
+of the search (NumPy arrays included; memory-mapped layer files and the OS
+page cache are not); disk is the peak size of the layer and run files.
+"""
+import glob
+import random
+import sys
+import tracemalloc
+
+from ExternalBFS import external_bfs
+from LayerBFS import layer_bfs
+from generator import farthest_states, random_layout
+from rush_hour import RushHourPuzzle
+from search_stats import SearchStats
+
+# (seed, index of the layout drawn) of 8x8 boards with 13 vehicles and 3 walls
+LARGE = ((3, 2), (3, 15))
+
+
+def large_puzzle(seed, index):
+    """Hardest start in the component of a seeded random 8x8 layout (about a million states)."""
+    rng = random.Random(seed)
+    for _ in range(index):
+        random_layout(rng, 8, 8, 13, walls=3)
+    puzzle = random_layout(rng, 8, 8, 13, walls=3)
+    _, keys = farthest_states(puzzle, 1 << 23)
+    return RushHourPuzzle.fromLayout(puzzle.layout, keys[0])
+
+
+def measure(search):
+    """(goal Node, SearchStats, peak traced bytes) of search(stats)."""
+    stats = SearchStats()
+    tracemalloc.start()
+    node = search(stats)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return node, stats, peak
+
+
+def main(budgets=(64, 4)):
+    puzzles = [(path, RushHourPuzzle(path)) for path in sorted(glob.glob("examples/*.csv"))]
+    puzzles += [(f"8x8 walls {seed}/{index}", large_puzzle(seed, index)) for seed, index in LARGE]
+
+    measure(lambda stats: external_bfs(puzzles[0][1], stats=stats))  # first-call imports and allocations
+    print(f"{'puzzle':<22}{'solver':<16}{'moves':>6}{'states':>10}{'time (s)':>10}{'memory (MiB)':>14}{'disk (MiB)':>12}")
+    for name, puzzle in puzzles:
+        runs = [("layer_bfs", lambda stats: layer_bfs(puzzle, stats=stats))]
+        runs += [(f"external {mib} MiB", lambda stats, mib=mib: external_bfs(puzzle, mib << 20, stats=stats))
+                 for mib in budgets]
+        for solver, search in runs:
+            node, stats, peak = measure(search)
+            print(f"{name:<22}{solver:<16}{node.g if node else '-':>6}{stats.peak_closed:>10}"
+                  f"{stats.elapsed:>10.2f}{peak / 2 ** 20:>14.1f}{stats.peak_disk / 2 ** 20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main([int(mib) for mib in sys.argv[1:]] or (64, 4))
@@ -0,0 +1,83 @@
+"""Check the indexed h1/h2/h3 against the original board-scanning versions and time them.
+
+Run from the repository root:  python -m benchmarks.heuristics
+"""
+import glob
+import time
+from functools import partial
+
+from rush_hour import RushHourPuzzle
+from Astar import ExitIndex, h1, h2, h3
+from distance_table import enumerate_component
+
+
+# Original implementations, scanning state.vehicles and state.board
+def ref_h1(state):
+    red = next(v for v in state.vehicles if v["id"] == "X")
+    return state.board_width - (red["col"] + red["length"])
+
+
+def ref_blocking(state):
+    red = next(v for v in state.vehicles if v["id"] == "X")
+    y = red["row"]
+    blocking_ids = set()
+    for x in range(red["col"] + red["length"], state.board_width):
+        cell = state.board[y][x]
+        if cell != " " and cell != "#":
+            blocking_ids.add(cell)
+    return blocking_ids
+
+
+def ref_h2(state):
+    return ref_h1(state) + len(ref_blocking(state))
+
+
+def ref_can_move(state, v):
+    r, c, length = v["row"], v["col"], v["length"]
+    if v["orientation"] == "H":
+        return (c - 1 >= 0 and state.board[r][c - 1] == " ") or \
+            (c + length < state.board_width and state.board[r][c + length] == " ")
+    return (r - 1 >= 0 and state.board[r - 1][c] == " ") or \
+        (r + length < state.board_height and state.board[r + length][c] == " ")
+
+
+def ref_h3(state):
+    blocking_ids = ref_blocking(state)
+    penalty = sum(1 for bid in blocking_ids
+                  if not ref_can_move(state, next(v for v in state.vehicles if v["id"] == bid)))
+    return ref_h1(state) + len(blocking_ids) + penalty
+
+
+def fresh(state):
+    """Copy without the lazily built board/vehicles, so every reference call pays for them."""
+    return RushHourPuzzle.fromLayout(state.layout, state.positions, state.occupied)
+
+
+def rate(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(*item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'puzzle':<20}{'h':>3}{'edges':>9}{'scan/s':>12}{'indexed/s':>12}{'incremental/s':>15}")
+    for csv_file in sorted(glob.glob("examples/*.csv")):
+        states = list(enumerate_component(RushHourPuzzle(csv_file), RushHourPuzzle.successorFunction).values())
+        edges = [(parent, child) for parent in states[:5000] for _, child in parent.successorFunction()]
+        for ref, h in ((ref_h1, h1), (ref_h2, h2), (ref_h3, h3)):
+            values = {s.positions: ref(s) for s in states}
+            # Timed whether or not h exposes it as fromParent (h3 does not: it is slower than indexed)
+            update = partial(ExitIndex.of(states[0].layout).update, level=h.level)
+            for parent, child in edges:
+                assert h(child) == values[child.positions], (csv_file, h)
+                assert update(parent, values[parent.positions], child) == values[child.positions], (csv_file, h)
+
+            scan = rate(lambda c: ref(fresh(c)), [(c,) for _, c in edges])
+            indexed = rate(h, [(c,) for _, c in edges])
+            incremental = rate(update, [(p, values[p.positions], c) for p, c in edges])
+            print(f"{csv_file:<20}{h.__name__:>3}{len(edges):>9}{scan:>12.0f}{indexed:>12.0f}{incremental:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Peak memory and node counts of A* (dict/set or visited.py int-hash stores), frontier-capped A* and IDA*
+on every example.
+
+Run from the repository root:  python -m benchmarks.memory [max_open] [glob]
+
+IDA* re-searches the tree once per f bound, so on the 100-move examples it
+takes minutes; pass a glob such as "examples/2-a.csv" to limit the run.
+"""
+import glob
+import sys
+import time
+import tracemalloc
+
+from rush_hour import RushHourPuzzle
+from Astar import astar, h3
+from IDAstar import idastar
+from search_stats import SearchStats
+from visited import IntHashMap, IntHashStore
+
+
+def measure(solve):
+    stats = SearchStats()
+    tracemalloc.start()
+    start = time.perf_counter()
+    node = solve(stats)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(node.getSolution()) if node else None, stats, peak, duration
+
+
+def main(max_open=500, pattern="examples/*.csv"):
+    successorFn, isGoal = RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal
+    solvers = {
+        "astar": lambda p, st: astar(p, h3, successorFn, isGoal, stats=st),
+        "astar/hash": lambda p, st: astar(p, h3, successorFn, isGoal, closed=IntHashStore(), g_costs=IntHashMap(),
+                                          stats=st),
+        f"astar<={max_open}": lambda p, st: astar(p, h3, successorFn, isGoal, max_open=max_open, stats=st),
+        "idastar": lambda p, st: idastar(p, h3, successorFn, isGoal, stats=st),
+    }
+    print(f"{'puzzle':<20}{'solver':<14}{'moves':>7}{'expanded':>10}{'generated':>11}{'peak KiB':>10}{'time (s)':>10}")
+    for csv_file in sorted(glob.glob(pattern)):
+        puzzle = RushHourPuzzle(csv_file)
+        for name, solve in solvers.items():
+            moves, stats, peak, duration = measure(lambda st: solve(puzzle, st))
+            print(f"{csv_file:<20}{name:<14}{str(moves):>7}{stats.expanded:>10}{stats.generated:>11}"
+                  f"{peak / 1024:>10.0f}{duration:>10.2f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 500, *args[1:])
@@ -0,0 +1,45 @@
+"""Scaling of parallel_bfs from 1 to N worker processes on a generated 8x8 puzzle.
+
+Run from the repository root:  python -m benchmarks.parallel [max_workers] [seed] [vehicles]
+
+The puzzle is generator.random_layout on an 8x8 board; the defaults
+give about 200k reachable states at depth 10. Speedup is relative to one
+worker; plain bfs is shown for the single-process baseline.
+"""
+import os
+import random
+import sys
+import time
+
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from ParallelBFS import parallel_bfs
+from search_stats import SearchStats
+from generator import random_layout
+
+
+def main(max_workers=None, seed=2, vehicles=14):
+    max_workers = max_workers or os.cpu_count()
+    puzzle = random_layout(random.Random(seed), 8, 8, vehicles)
+    puzzle.printBoard()
+
+    start = time.perf_counter()
+    node = bfs(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal)
+    print(f"\nbfs: {len(node.getSolution()) if node else None} moves in {time.perf_counter() - start:.2f}s")
+
+    print(f"\n{'workers':>7}{'moves':>7}{'states':>10}{'time (s)':>10}{'speedup':>9}{'efficiency':>12}"
+          f"{'shard min/max':>16}{'busy max (s)':>14}")
+    single = None
+    for workers in range(1, max_workers + 1):
+        stats = SearchStats()
+        node = parallel_bfs(puzzle, workers, stats)
+        single = single or stats.elapsed
+        shards = [w["states"] for w in stats.workers]
+        speedup = single / stats.elapsed
+        print(f"{workers:>7}{str(len(node.getSolution()) if node else None):>7}{stats.peak_closed:>10}"
+              f"{stats.elapsed:>10.2f}{speedup:>9.2f}{speedup / workers:>12.2f}"
+              f"{f'{min(shards)}/{max(shards)}':>16}{max(w['busy'] for w in stats.workers):>14.2f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,41 @@
+"""A* node expansions with h1/h3 vs. a pattern database built for each example.
+
+Run from the repository root:  python -m benchmarks.pattern_db
+"""
+import glob
+import time
+
+from rush_hour import RushHourPuzzle
+from Astar import astar, h1, h3
+from pattern_db import PatternDatabase
+
+
+def run(puzzle, heuristic):
+    expansions = 0
+
+    def successors(state):
+        nonlocal expansions
+        expansions += 1
+        return state.successorFunction()
+
+    start = time.perf_counter()
+    node = astar(puzzle, heuristic, successors, lambda s: s.isGoal())
+    return len(node.getSolution()) if node else None, expansions, time.perf_counter() - start
+
+
+def main():
+    print(f"{'puzzle':<20}{'moves':>7}{'h1 exp':>9}{'h3 exp':>9}{'pdb exp':>9}{'build (s)':>11}{'pdb (s)':>9}")
+    for csv_file in sorted(glob.glob("examples/*.csv")):
+        puzzle = RushHourPuzzle(csv_file)
+        start = time.perf_counter()
+        pdb = PatternDatabase.build(puzzle)
+        build = time.perf_counter() - start
+        moves, h1_exp, _ = run(puzzle, h1)
+        _, h3_exp, _ = run(puzzle, h3)
+        pdb_moves, pdb_exp, pdb_time = run(puzzle, pdb)
+        assert moves == pdb_moves, f"{csv_file}: {moves} != {pdb_moves}"
+        print(f"{csv_file:<20}{str(moves):>7}{h1_exp:>9}{h3_exp:>9}{pdb_exp:>9}{build:>11.2f}{pdb_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
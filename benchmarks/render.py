@@ -0,0 +1,92 @@
+"""Frame cost of the visualizer: full redraw every frame vs. the render cache with dirty rects.
+
+Run from the repository root:  python -m benchmarks.render [puzzle.csv]
+
+Uses SDL's dummy video driver, so no window opens. "playback" frames step
+through a BFS solution (one vehicle moves per frame); "idle" frames redraw the
+same state, as the UI does between steps and before a solve.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from loader import load_atlas
+from ui import BTN_H, CELL, EXIT_COLOR, MARGIN, PADDING, SPRITE_NAMES, BoardRenderer, RenderCache
+
+
+def draw_board_uncached(screen, state, sprites):
+    """Reference implementation: the whole road, lanes and every rotated/scaled sprite each frame."""
+    screen.fill((50, 50, 50))
+    for r in range(state.board_height + 1):
+        y = MARGIN + r * CELL
+        for x in range(MARGIN, MARGIN + state.board_width * CELL, 40):
+            pygame.draw.line(screen, (255, 255, 255), (x, y), (x + 20, y), 2)
+    for c in range(state.board_width + 1):
+        x = MARGIN + c * CELL
+        for y in range(MARGIN, MARGIN + state.board_height * CELL, 40):
+            pygame.draw.line(screen, (255, 255, 255), (x, y), (x, y + 20), 2)
+    exit_row = next(v for v in state.vehicles if v["id"] == "X")["row"]
+    pygame.draw.rect(screen, EXIT_COLOR, (MARGIN + state.board_width * CELL - PADDING // 2,
+                                          MARGIN + exit_row * CELL + PADDING, 12, CELL - 2 * PADDING),
+                     border_radius=6)
+    for (r, c) in state.walls:
+        rect = pygame.Rect(MARGIN + c * CELL, MARGIN + r * CELL, CELL, CELL)
+        pygame.draw.rect(screen, (80, 80, 80), rect, border_radius=10)
+        pygame.draw.rect(screen, (0, 0, 0), rect, 1, border_radius=10)
+    for v in state.vehicles:
+        name = "figo2" if v["id"] == "X" else ("truck2" if v["length"] == 3 else "mustang3")
+        sprite = sprites[name]
+        if v["orientation"] == "H":
+            w, h = v["length"] * CELL, CELL
+            sprite = pygame.transform.rotate(sprite, -90)
+        else:
+            w, h = CELL, v["length"] * CELL
+        screen.blit(pygame.transform.scale(sprite, (w, h)), (MARGIN + v["col"] * CELL, MARGIN + v["row"] * CELL))
+
+
+def per_frame(frames, draw):
+    start = time.perf_counter()
+    for state in frames:
+        draw(state)
+    return (time.perf_counter() - start) / len(frames) * 1000
+
+
+def main(csv_file="examples/2-c.csv"):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    sprites = load_atlas("assets/cars.atlas", "assets/cars.png", SPRITE_NAMES)
+    puzzle = RushHourPuzzle(csv_file)
+    size = (MARGIN * 2 + puzzle.board_width * CELL, MARGIN * 2 + puzzle.board_height * CELL + BTN_H)
+    screen = pygame.display.set_mode(size)
+    path = bfs(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal).getPath()
+    idle = [path[0]] * len(path)
+
+    def full(state):
+        draw_board_uncached(screen, state, sprites)
+        pygame.display.flip()
+
+    start = time.perf_counter()
+    renderer = BoardRenderer(RenderCache(sprites, puzzle, size))
+    build = (time.perf_counter() - start) * 1000
+
+    def cached(state):
+        dirty = renderer.draw(screen, state)
+        if dirty:
+            pygame.display.update(dirty)
+
+    print(f"{csv_file}: {len(path)} frames, render cache built in {build:.1f} ms")
+    print(f"{'frames':<10}{'full redraw (ms)':>18}{'cached (ms)':>13}")
+    for name, frames in (("playback", path), ("idle", idle)):
+        renderer.invalidate()
+        renderer.draw(screen, frames[0])
+        print(f"{name:<10}{per_frame(frames, full):>18.3f}{per_frame(frames, cached):>13.3f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
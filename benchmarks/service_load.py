@@ -0,0 +1,147 @@
+"""Load test of service.py on localhost.
+
+Run from the repository root:
+
+    python -m benchmarks.service_load --requests 500 --concurrency 16
+    python -m benchmarks.service_load --url http://127.0.0.1:8765 --duration 30 --no-cache
+
+Unless --url is given, a service is started on a free port with --workers
+processes. Each of --concurrency clients keeps one keep-alive connection and
+posts the puzzles (examples/*.csv by default) round-robin until --requests
+have been sent or --duration seconds have passed. Client-side throughput and
+latency percentiles are printed next to the server's /metrics. With
+--no-cache every request is solved; otherwise repeats are answered from the
+service's cache.
+"""
+import argparse
+import asyncio
+import json
+import signal
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from batch import collect_files
+from service import percentile
+
+
+async def request(reader, writer, host, method, path, body=b"", content_type="text/csv"):
+    """One HTTP/1.1 keep-alive exchange; returns (status, decoded JSON body)."""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, path, bodies, offset, deadline, budget, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            start = time.perf_counter()
+            status, payload = await request(reader, writer, host, "POST", path, bodies[i % len(bodies)])
+            results.append((time.perf_counter() - start, status, payload.get("status"), payload.get("cached")))
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, bodies, query, concurrency, requests, duration):
+    results = []
+    budget = [requests or float("inf")]
+    deadline = time.perf_counter() + (duration or float("inf"))
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, f"/solve?{query}", bodies, k, deadline, budget, results)
+                           for k in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await request(reader, writer, host, "GET", "/metrics")
+    writer.close()
+    return results, elapsed, metrics
+
+
+def start_service(workers):
+    """Launch service.py on a free port; returns (process, port)."""
+    process = subprocess.Popen([sys.executable, "service.py", "--port", "0", "--workers", str(workers)],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving on"):
+        process.kill()
+        raise RuntimeError(f"service did not start: {line!r}")
+    return process, int(line.split()[2].rsplit(":", 1)[1])
+
+
+def stop_service(process, grace=30):
+    """SIGTERM the started service and wait for it to shut its worker pool down (kill it past grace seconds)."""
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the solver service.")
+    parser.add_argument("--url", help="running service (default: start one)")
+    parser.add_argument("--workers", type=int, default=2, help="workers of the started service")
+    parser.add_argument("--puzzles", nargs="*", default=["examples/"], help="puzzle directories or glob patterns")
+    parser.add_argument("--algo", default="astar")
+    parser.add_argument("--heuristic", default="h3")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="total requests (0 for no limit)")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the service's solution cache")
+    args = parser.parse_args(argv)
+
+    files = [f for f in collect_files(args.puzzles) if f.endswith(".csv")]
+    bodies = []
+    for path in files:
+        with open(path, "rb") as f:
+            bodies.append(f.read())
+    query = f"algo={args.algo}&heuristic={args.heuristic}&solution=0" + ("&cache=0" if args.no_cache else "")
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        process, port = start_service(args.workers)
+        host = "127.0.0.1"
+    try:
+        results, elapsed, metrics = asyncio.run(run_load(host, port, bodies, query, args.concurrency,
+                                                         args.requests, args.duration))
+    finally:
+        if process is not None:
+            stop_service(process)
+
+    latencies = sorted(seconds for seconds, *_ in results)
+    statuses = {}
+    for _, http_status, status, _ in results:
+        key = status if http_status == 200 else f"http {http_status}"
+        statuses[key] = statuses.get(key, 0) + 1
+    cached = sum(1 for *_, hit in results if hit)
+    print(f"{len(results)} requests over {len(bodies)} puzzles, {args.concurrency} connections, "
+          f"{elapsed:.2f}s: {len(results) / elapsed:.1f} req/s; {cached} answered from cache; {statuses}")
+    print("client latency (ms): " + "  ".join(f"p{q} {percentile(latencies, q) * 1000:.1f}"
+                                              for q in (50, 90, 95, 99)) + f"  max {latencies[-1] * 1000:.1f}")
+    server = metrics["latency"]
+    print(f"server: {metrics['requests']} requests, {metrics['throughput']['overall']:.1f} req/s since start, "
+          f"latency (ms) p50 {server['p50'] * 1000:.1f} p99 {server['p99'] * 1000:.1f}; statuses {metrics['statuses']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Cold-start cost of the headless solver modules and of the UI up to its first frame.
+
+Run from the repository root:  python -m benchmarks.startup [runs]
+
+Every measurement is a fresh interpreter (median of `runs`). Headless modules
+are imported with pygame blocked (sys.modules["pygame"] = None makes importing
+it fail, as if it were not installed), so a module that still pulls pygame in
+shows up as an error; the numpy column shows whether it was loaded as well.
+The UI rows use SDL's dummy video driver and split the time to the first frame
+into imports, display setup, atlas loading and the first draw, loading the
+atlas eagerly (every region parsed and cut out, as load_atlas used to), from
+the cached index, or parsing only the UI's three sprites.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEADLESS = ["rush_hour", "solvers", "batch", "binary_corpus", "generator", "background_solver", "service"]
+
+IMPORT = """
+import sys, time
+sys.modules["pygame"] = None
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "numpy" in sys.modules)
+"""
+
+ATLAS = {
+    "eager": "sprites = Atlas(parse_atlas(ATLAS), IMAGE)\nfor name in list(sprites.keys()): sprites[name]",
+    "index": "sprites = load_atlas(ATLAS, IMAGE)",
+    "names": "sprites = load_atlas(ATLAS, IMAGE, ui.SPRITE_NAMES)",
+}
+
+UI = """
+import time
+t0 = time.perf_counter()
+import pygame
+import ui
+from loader import Atlas, load_atlas, parse_atlas
+from rush_hour import RushHourPuzzle
+t1 = time.perf_counter()
+pygame.init()
+puzzle = RushHourPuzzle("examples/2-c.csv")
+size = (ui.MARGIN * 2 + puzzle.board_width * ui.CELL, ui.MARGIN * 2 + puzzle.board_height * ui.CELL + ui.BTN_H)
+screen = pygame.display.set_mode(size)
+t2 = time.perf_counter()
+ATLAS, IMAGE = "assets/cars.atlas", "assets/cars.png"
+{atlas}
+t3 = time.perf_counter()
+ui.BoardRenderer(ui.RenderCache(sprites, puzzle, size)).draw(screen, puzzle)
+pygame.display.flip()
+t4 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2, t4 - t3)
+"""
+
+
+def run(code, env=None):
+    """(wall seconds of a fresh interpreter running code, its stdout words)."""
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    if done.returncode:
+        raise RuntimeError(done.stderr.strip().splitlines()[-1])
+    return wall, done.stdout.split()
+
+
+def main(runs=5):
+    base = statistics.median(run("pass")[0] for _ in range(runs))
+    print(f"interpreter alone: {base * 1000:.1f} ms\n")
+
+    print(f"{'headless module':<20}{'import (ms)':>12}{'process (ms)':>14}  numpy")
+    for module in HEADLESS:
+        try:
+            samples = [run(IMPORT.format(module=module)) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{module:<20}  fails without pygame: {e}")
+            continue
+        imported = statistics.median(float(out[0]) for _, out in samples)
+        wall = statistics.median(wall for wall, _ in samples)
+        print(f"{module:<20}{imported * 1000:>12.1f}{wall * 1000:>14.1f}  {samples[0][1][1]}")
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    print(f"\n{'UI, atlas':<20}{'imports':>9}{'display':>9}{'atlas':>9}{'1st draw':>10}{'process':>9}  (ms)")
+    for name, atlas in ATLAS.items():
+        samples = [run(UI.format(atlas=atlas), env) for _ in range(runs)]
+        steps = [statistics.median(float(out[k]) for _, out in samples) * 1000 for k in range(4)]
+        wall = statistics.median(wall for wall, _ in samples) * 1000
+        print(f"{name:<20}{steps[0]:>9.1f}{steps[1]:>9.1f}{steps[2]:>9.2f}{steps[3]:>10.1f}{wall:>9.1f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
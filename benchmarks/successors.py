@@ -0,0 +1,80 @@
+"""Compare packed-state successor generation against the old deepcopy path.
+
+Run from the repository root:  python -m benchmarks.successors
+"""
+import glob
+import time
+from copy import deepcopy
+
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+
+
+class DeepcopyPuzzle:
+    """Reference implementation: plain vehicle dicts and a 2D board, deepcopied for every move."""
+
+    def __init__(self, csv_file):
+        source = RushHourPuzzle(csv_file)
+        self.board_height = source.board_height
+        self.board_width = source.board_width
+        self.walls = list(source.walls)
+        self.vehicles = [dict(v) for v in source.vehicles]
+        self.setBoard()
+
+    def setBoard(self):
+        self.board = [[" " for _ in range(self.board_width)] for _ in range(self.board_height)]
+        for r, c in self.walls:
+            self.board[r][c] = "#"
+        for v in self.vehicles:
+            for i in range(v["length"]):
+                r_pos = v["row"] + i if v["orientation"] == "V" else v["row"]
+                c_pos = v["col"] + i if v["orientation"] == "H" else v["col"]
+                self.board[r_pos][c_pos] = v["id"]
+
+    def isGoal(self):
+        x = next(v for v in self.vehicles if v["id"] == "X")
+        return x["col"] == self.board_width - x["length"]
+
+    def successorFunction(self):
+        successors = []
+        for v in self.vehicles:
+            r, c, length = v["row"], v["col"], v["length"]
+            if v["orientation"] == "H":
+                moves = [("right", "col", 1, c + length < self.board_width and self.board[r][c + length] == " "),
+                         ("left", "col", -1, c - 1 >= 0 and self.board[r][c - 1] == " ")]
+            else:
+                moves = [("down", "row", 1, r + length < self.board_height and self.board[r + length][c] == " "),
+                         ("up", "row", -1, r - 1 >= 0 and self.board[r - 1][c] == " ")]
+            for name, field, delta, legal in moves:
+                if not legal:
+                    continue
+                new_puzzle = deepcopy(self)
+                for nv in new_puzzle.vehicles:
+                    if nv["id"] == v["id"]:
+                        nv[field] += delta
+                        break
+                new_puzzle.setBoard()
+                successors.append((f"Move {v['id']} {name}", new_puzzle))
+        return successors
+
+    def getStateKey(self):
+        return tuple(tuple(row) for row in self.board)
+
+
+def time_bfs(puzzle):
+    start = time.perf_counter()
+    node = bfs(puzzle, lambda s: s.successorFunction(), lambda s: s.isGoal())
+    return time.perf_counter() - start, len(node.getSolution()) if node else None
+
+
+def main():
+    print(f"{'puzzle':<20}{'moves':>7}{'deepcopy (s)':>15}{'packed (s)':>13}{'speedup':>10}")
+    for csv_file in sorted(glob.glob("examples/*.csv")):
+        old_time, old_moves = time_bfs(DeepcopyPuzzle(csv_file))
+        new_time, new_moves = time_bfs(RushHourPuzzle(csv_file))
+        assert old_moves == new_moves, f"{csv_file}: {old_moves} != {new_moves}"
+        print(f"{csv_file:<20}{str(new_moves):>7}{old_time:>15.2f}{new_time:>13.2f}{old_time / new_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Repeatable solver benchmarks with JSON results and regression checks against a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.suite run --out results.json
+    python -m benchmarks.suite run --solvers bfs astar-h3 --repeats 9 --baseline baseline.json
+    python -m benchmarks.suite compare baseline.json results.json
+
+Every (puzzle, solver) pair runs in a fresh worker process: one warm-up run,
+then --repeats timed runs. Node counts come from SearchStats (they are
+deterministic) and peak RSS is the worker's high-water mark. The puzzles are
+examples/*.csv plus a seeded corpus of hard instances (see benchmarks/corpus.py);
+--puzzles also accepts .rhc corpora (binary_corpus.py), one entry per record.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import collect_files
+from binary_corpus import expand_sources, load_source, source_name
+from search_stats import SearchStats
+from solvers import get_solver, parse_solver_label, solver_labels
+from benchmarks.corpus import DEFAULT_DIR, hard_corpus
+
+# A slowdown is only a regression past this fraction and these absolute floors (timer / allocator noise)
+THRESHOLD = 0.10
+MIN_TIME = 0.005
+MIN_RSS_KIB = 1024
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def bench_one(source, label, repeats, warmup):
+    """Run one solver on one puzzle (CSV path or (corpus, index) source) inside a worker; returns the result record."""
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    puzzle = load_source(source)
+    solve = get_solver(*parse_solver_label(label))
+    times = []
+    for run in range(warmup + repeats):
+        stats = SearchStats()
+        gc.collect()
+        start = time.perf_counter()
+        node = solve(puzzle, stats)
+        duration = time.perf_counter() - start
+        if run >= warmup:
+            times.append(duration)
+    return {
+        "puzzle": source_name(source),
+        "solver": label,
+        "moves": len(node.getSolution()) if node else None,
+        "expanded": stats.expanded,
+        "generated": stats.generated,
+        "peak_open": stats.peak_open,
+        "peak_closed": stats.peak_closed,
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+        "times": times,
+        "base_rss_kib": base_rss,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def environment():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run_suite(puzzles, labels, repeats=5, warmup=1, out=sys.stdout):
+    """Benchmark every label on every puzzle; returns {"environment", "repeats", "results"}."""
+    results = []
+    print(f"{'puzzle':<30}{'solver':<15}{'moves':>6}{'expanded':>10}{'median (s)':>12}{'p95 (s)':>9}"
+          f"{'peak RSS MiB':>14}", file=out)
+    for source in puzzles:
+        for label in labels:
+            # A fresh process per pair so the RSS high-water mark is not shared between runs
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                record = pool.submit(bench_one, source, label, repeats, warmup).result()
+            results.append(record)
+            print(f"{record['puzzle']:<30}{label:<15}{str(record['moves']):>6}{record['expanded']:>10}"
+                  f"{record['median']:>12.4f}{record['p95']:>9.4f}{record['peak_rss_kib'] / 1024:>14.1f}",
+                  file=out)
+    return {"environment": environment(), "repeats": repeats, "warmup": warmup, "results": results}
+
+
+def compare(baseline, current, threshold=THRESHOLD, out=sys.stdout):
+    """Print per-pair changes against baseline and return the list of regression messages."""
+    previous = {(r["puzzle"], r["solver"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'puzzle':<30}{'solver':<15}{'median':>10}{'expanded':>10}{'peak RSS':>10}", file=out)
+    for record in current["results"]:
+        key = (record["puzzle"], record["solver"])
+        old = previous.get(key)
+        if old is None:
+            print(f"{key[0]:<30}{key[1]:<15}{'(new)':>10}", file=out)
+            continue
+        problems = []
+        if record["moves"] != old["moves"]:
+            problems.append(f"moves {old['moves']} -> {record['moves']}")
+        if (record["median"] > old["median"] * (1 + threshold)
+                and record["median"] - old["median"] > MIN_TIME):
+            problems.append(f"median {old['median']:.4f}s -> {record['median']:.4f}s")
+        if record["expanded"] > old["expanded"]:
+            problems.append(f"expanded {old['expanded']} -> {record['expanded']}")
+        if (record["peak_rss_kib"] > old["peak_rss_kib"] * (1 + threshold)
+                and record["peak_rss_kib"] - old["peak_rss_kib"] > MIN_RSS_KIB):
+            problems.append(f"peak RSS {old['peak_rss_kib']} -> {record['peak_rss_kib']} KiB")
+
+        def ratio(name):
+            return f"{record[name] / old[name]:.2f}x" if old[name] else "-"
+        flag = "  REGRESSION: " + "; ".join(problems) if problems else ""
+        print(f"{key[0]:<30}{key[1]:<15}{ratio('median'):>10}{ratio('expanded'):>10}"
+              f"{ratio('peak_rss_kib'):>10}{flag}", file=out)
+        regressions.extend(f"{key[0]} {key[1]}: {problem}" for problem in problems)
+    return regressions
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Rush Hour solvers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and write JSON results")
+    run.add_argument("--puzzles", nargs="*", default=["examples/*.csv"], help="glob patterns or .rhc corpora")
+    run.add_argument("--corpus", type=int, default=5, help="generated hard puzzles to add (0 for none)")
+    run.add_argument("--corpus-dir", default=DEFAULT_DIR)
+    run.add_argument("--solvers", nargs="*", default=solver_labels(), choices=solver_labels())
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--out", default="bench_results.json")
+    run.add_argument("--baseline", help="compare against this results file after the run")
+    run.add_argument("--threshold", type=float, default=THRESHOLD)
+
+    check = commands.add_parser("compare", help="flag regressions of results against a baseline")
+    check.add_argument("baseline")
+    check.add_argument("results")
+    check.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        puzzles = expand_sources(collect_files(args.puzzles))
+        if args.corpus:
+            puzzles += hard_corpus(args.corpus, args.corpus_dir)
+        current = run_suite(puzzles, args.solvers, args.repeats, args.warmup)
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Wrote {len(current['results'])} results to {args.out}")
+        if not args.baseline:
+            return 0
+        baseline = load(args.baseline)
+    else:
+        baseline, current = load(args.baseline), load(args.results)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Report bytes per visited state for each visited-store backend.
+
+Run from the repository root:  python -m benchmarks.visited
+"""
+import glob
+import time
+
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from visited import BACKENDS
+
+
+def main():
+    print(f"{'puzzle':<20}{'backend':<9}{'states':>9}{'bytes/state':>13}{'time (s)':>10}")
+    for csv_file in sorted(glob.glob("examples/*.csv")):
+        puzzle = RushHourPuzzle(csv_file)
+        for name, store_cls in BACKENDS.items():
+            store = store_cls()
+            start = time.perf_counter()
+            bfs(puzzle, lambda s: s.successorFunction(), lambda s: s.isGoal(), visited=store)
+            duration = time.perf_counter() - start
+            per_state = store.nbytes() / max(len(store), 1)
+            print(f"{csv_file:<20}{name:<9}{len(store):>9}{per_state:>13.1f}{duration:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
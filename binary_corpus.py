@@ -0,0 +1,207 @@
+"""Binary puzzle corpus: many puzzles in one file of fixed-width records, read through mmap.
+
+    python binary_corpus.py pack corpus.rhc examples/ "puzzles/**/*.csv"
+    python binary_corpus.py info corpus.rhc
+
+File layout (little-endian):
+    header   magic "RHC1", record size, vehicle slots, wall slots, count, names offset
+    records  count x record size bytes: height, width, vehicle count, wall count,
+             then per vehicle slot (id, row, col, length * 2 + vertical),
+             then per wall slot (row, col); unused slots are zero
+    names    (count + 1) u32 offsets into a UTF-8 blob of puzzle names (the source CSV paths)
+
+Every field is one byte, so vehicle IDs are single Latin-1 characters and
+boards, coordinates and walls stay within 0-255; pack rejects other puzzles.
+Records are validated when packed (setBoard drops vehicles it cannot place),
+so reading one is a struct unpack plus RushHourPuzzle.fromLayout; puzzles with
+the same vehicles and walls share one Layout.
+"""
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+from rush_hour import Layout, RushHourPuzzle
+
+MAGIC = b"RHC1"
+HEADER = struct.Struct("<4sHHHIQ")
+SUFFIX = ".rhc"
+
+
+def _record(name, puzzle):
+    """(height, width, vehicle tuples, wall tuples) of a validated puzzle.
+
+    Every field is stored in one byte; raises ValueError naming the puzzle when one does not fit.
+    """
+    for v in puzzle.vehicles:
+        if len(v["id"]) != 1 or ord(v["id"]) > 255:
+            raise ValueError(f"{name}: vehicle ID {v['id']!r} is not a single Latin-1 character")
+    vehicles = [(ord(v["id"]), v["row"], v["col"], v["length"] * 2 + (v["orientation"] == "V"))
+                for v in puzzle.vehicles]
+    walls = [(r, c) for r, c in puzzle.walls]
+    fields = [("board size", (puzzle.board_height, puzzle.board_width)),
+              ("vehicle count", (len(vehicles),)), ("wall count", (len(walls),))]
+    fields += [(f"vehicle {v['id']}", values[1:]) for v, values in zip(puzzle.vehicles, vehicles)]
+    fields += [(f"wall {list(wall)}", wall) for wall in walls]
+    for label, values in fields:
+        if not all(0 <= value <= 255 for value in values):
+            raise ValueError(f"{name}: {label} does not fit in the corpus format (one byte per field)")
+    return puzzle.board_height, puzzle.board_width, vehicles, walls
+
+
+def pack(puzzles, path):
+    """Write (name, RushHourPuzzle) pairs to path; returns the number of records.
+    Every puzzle is checked before the file is opened; raises ValueError naming the first one
+    the format cannot hold (multi-character vehicle IDs, walls outside 0-255, boards over 255).
+    """
+    records, names = [], []
+    for name, puzzle in puzzles:
+        records.append(_record(name, puzzle))
+        names.append(name.encode())
+    vehicle_slots = max((len(r[2]) for r in records), default=0)
+    wall_slots = max((len(r[3]) for r in records), default=0)
+    record_size = 4 + 4 * vehicle_slots + 2 * wall_slots
+    names_offset = HEADER.size + record_size * len(records)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, record_size, vehicle_slots, wall_slots, len(records), names_offset))
+        for height, width, vehicles, walls in records:
+            data = bytearray(record_size)
+            data[0:4] = bytes((height, width, len(vehicles), len(walls)))
+            for i, vehicle in enumerate(vehicles):
+                data[4 + 4 * i:8 + 4 * i] = bytes(vehicle)
+            base = 4 + 4 * vehicle_slots
+            for i, wall in enumerate(walls):
+                data[base + 2 * i:base + 2 * i + 2] = bytes(wall)
+            f.write(data)
+        offsets = array("I", [0])
+        for name in names:
+            offsets.append(offsets[-1] + len(name))
+        offsets.tofile(f)
+        f.write(b"".join(names))
+    return len(records)
+
+
+class BinaryCorpus:
+    """Random and streaming access to a packed corpus; nothing is read until a record is requested."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.record_size, self.vehicle_slots, self.wall_slots, self.count, self.names_offset = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a puzzle corpus")
+        self._names_blob = self.names_offset + 4 * (self.count + 1)
+        self._layouts = {}
+
+    def __len__(self):
+        return self.count
+
+    def name(self, i):
+        start, end = struct.unpack_from("<II", self._map, self.names_offset + 4 * i)
+        return self._map[self._names_blob + start:self._names_blob + end].decode()
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        offset = HEADER.size + i * self.record_size
+        height, width, n_vehicles, n_walls = self._map[offset:offset + 4]
+        vehicles = [self._map[k:k + 4] for k in range(offset + 4, offset + 4 + 4 * n_vehicles, 4)]
+        base = offset + 4 + 4 * self.vehicle_slots
+        walls = self._map[base:base + 2 * n_walls]
+
+        # Everything but each vehicle's moving coordinate identifies the layout
+        static = bytearray((height, width)) + walls
+        for vid, row, col, meta in vehicles:
+            static += bytes((vid, meta, col if meta & 1 else row))
+        static = bytes(static)
+        layout = self._layouts.get(static)
+        if layout is None:
+            layout = Layout(height, width, [(walls[k], walls[k + 1]) for k in range(0, len(walls), 2)],
+                            [{"id": chr(vid), "row": row, "col": col,
+                              "orientation": "V" if meta & 1 else "H", "length": meta >> 1}
+                             for vid, row, col, meta in vehicles])
+            self._layouts[static] = layout
+        positions = 0
+        for (_, row, col, meta), shift in zip(vehicles, layout.shifts):
+            positions |= (row if meta & 1 else col) << shift
+        return RushHourPuzzle.fromLayout(layout, positions)
+
+    def iterPuzzles(self, start=0, stop=None):
+        """Yield (name, puzzle) lazily; only the pages of the records read are touched."""
+        for i in range(start, self.count if stop is None else min(stop, self.count)):
+            yield self.name(i), self[i]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+_open = {}
+
+
+def open_corpus(path):
+    """BinaryCorpus for path, opened once per process."""
+    corpus = _open.get(path)
+    if corpus is None:
+        corpus = _open[path] = BinaryCorpus(path)
+    return corpus
+
+
+def expand_sources(files):
+    """Replace each .rhc file in a file list by one (corpus path, index) source per record."""
+    sources = []
+    for path in files:
+        if path.endswith(SUFFIX):
+            sources.extend((path, i) for i in range(len(open_corpus(path))))
+        else:
+            sources.append(path)
+    return sources
+
+
+def load_source(source):
+    """RushHourPuzzle for a CSV path or a (corpus path, index) source."""
+    if isinstance(source, tuple):
+        return open_corpus(source[0])[source[1]]
+    return RushHourPuzzle(csv_file=source)
+
+
+def source_name(source):
+    if isinstance(source, tuple):
+        return f"{source[0]}:{open_corpus(source[0]).name(source[1])}"
+    return source
+
+
+def main(argv):
+    if len(argv) < 2 or argv[0] not in ("pack", "info"):
+        print("usage: python binary_corpus.py pack <corpus.rhc> <csv dirs or globs>...\n"
+              "       python binary_corpus.py info <corpus.rhc>")
+        return 2
+    command, path = argv[0], argv[1]
+    start = time.perf_counter()
+    if command == "pack":
+        from batch import collect_files
+        files = [f for f in collect_files(argv[2:]) if not f.endswith(SUFFIX)]
+        try:
+            count = pack(((f, RushHourPuzzle(csv_file=f)) for f in files), path)
+        except ValueError as e:
+            print(f"Cannot pack: {e}")
+            return 1
+        print(f"Packed {count} puzzles into {path} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    corpus = BinaryCorpus(path)
+    sizes = {}
+    for _, puzzle in corpus.iterPuzzles():
+        key = f"{puzzle.board_height}x{puzzle.board_width}"
+        sizes[key] = sizes.get(key, 0) + 1
+    print(f"{path}: {len(corpus)} puzzles, {corpus.record_size} bytes/record, "
+          f"read in {time.perf_counter() - start:.3f}s; boards {sizes}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
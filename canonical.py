@@ -0,0 +1,100 @@
+"""Canonical forms of states and puzzles up to vehicle relabeling and the exit-preserving mirror.
+
+A vehicle is described by (not X, orientation, line, length) plus its position;
+letters play no part, so puzzles that only rename vehicles get the same form.
+Vehicles in one lane never pass each other, so sorting these descriptions gives
+an order of interchangeable vehicles that no move can change.
+
+Mirroring rows (r -> height - 1 - r) maps goal states to goal states when X
+sits in the middle row of an odd-height board. A puzzle and its mirror then
+share one canonical form, and in a layout equal to its own mirror each state
+and its mirror image are the same distance from the goal, so a search needs to
+visit only one of them.
+"""
+from rush_hour import RushHourPuzzle
+
+MIRRORED_DIRECTION = {"up": "down", "down": "up", "left": "left", "right": "right"}
+
+
+def mirror_preserves_exit(layout):
+    """True if the top-bottom mirror keeps X (horizontal) in its row."""
+    return layout.goal_pos is not None and 2 * layout.lines[layout.x_index] == layout.board_height - 1
+
+
+def mirror_vehicle(v, height):
+    """Vehicle dict v reflected top to bottom on a board of the given height."""
+    row = height - 1 - v["row"] if v["orientation"] == "H" else height - v["length"] - v["row"]
+    return dict(v, row=row)
+
+
+def mirror_puzzle(puzzle):
+    """New RushHourPuzzle reflected top to bottom (same vehicle IDs)."""
+    mirrored = RushHourPuzzle()
+    mirrored.board_height, mirrored.board_width = puzzle.board_height, puzzle.board_width
+    mirrored.walls = [(puzzle.board_height - 1 - r, c) for r, c in puzzle.walls]
+    mirrored.vehicles = [mirror_vehicle(v, puzzle.board_height) for v in puzzle.vehicles]
+    mirrored.setBoard()
+    return mirrored
+
+
+class Canonicalizer:
+    """Maps the states of one layout to keys shared by every equivalent state (built once per layout).
+
+    - signature: canonical description of the layout (equal for relabeled and,
+      where allowed, mirrored layouts)
+    - symmetric: the layout is its own mirror, so key() also merges mirror images
+    - mirrored: the signature describes the mirror image of this layout
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        height = layout.board_height
+        x = layout.x_index
+        self.skeleton = tuple((i != x, o, line, length) for i, (o, line, length)
+                              in enumerate(zip(layout.orientations, layout.lines, layout.lengths)))
+        walls = sorted((r, c) for r, c in layout.walls if 0 <= r < height and 0 <= c < layout.board_width)
+        description = (height, layout.board_width, tuple(walls), tuple(sorted(self.skeleton)))
+
+        self.symmetric = self.mirrored = False
+        if mirror_preserves_exit(layout):
+            self.mirror_skeleton = tuple((not_x, o, height - 1 - line if o == "H" else line, length)
+                                         for not_x, o, line, length in self.skeleton)
+            mirrored = (height, layout.board_width, tuple(sorted((height - 1 - r, c) for r, c in walls)),
+                        tuple(sorted(self.mirror_skeleton)))
+            self.symmetric = mirrored == description
+            self.mirrored = mirrored < description
+            description = min(description, mirrored)
+        self.signature = description
+
+    @staticmethod
+    def of(layout):
+        canonicalizer = getattr(layout, "canonicalizer", None)
+        if canonicalizer is None:
+            canonicalizer = layout.canonicalizer = Canonicalizer(layout)
+        return canonicalizer
+
+    def _pack(self, entries):
+        bits = self.layout.bits
+        key = 0
+        for entry in sorted(entries):
+            key = (key << bits) | entry[-1]
+        return key
+
+    def key(self, positions):
+        """Canonical key of the state with these packed positions (comparable across layouts with one signature)."""
+        layout = self.layout
+        pos = [(positions >> shift) & layout.pos_mask for shift in layout.shifts]
+        if not (self.symmetric or self.mirrored):
+            return self._pack([s + (p,) for s, p in zip(self.skeleton, pos)])
+        height = layout.board_height
+        image = self._pack([s + (p if s[1] == "H" else height - s[3] - p,)
+                            for s, p in zip(self.mirror_skeleton, pos)])
+        if self.mirrored:
+            return image
+        return min(image, self._pack([s + (p,) for s, p in zip(self.skeleton, pos)]))
+
+
+def canonical_form(puzzle):
+    """(layout signature, state key) shared by every relabeled or mirrored copy of puzzle."""
+    canonicalizer = Canonicalizer.of(puzzle.layout)
+    return canonicalizer.signature, canonicalizer.key(puzzle.positions)
@@ -0,0 +1,159 @@
+"""Precomputed distance-to-goal tables for one board layout.
+
+Build once per layout, then every query with the same vehicles and walls is a
+table lookup plus greedy descent:
+
+    python distance_table.py build examples/2-a.csv tables/2-a.table
+    python distance_table.py solve examples/2-a.csv tables/2-a.table
+"""
+import json
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from rush_hour import Layout, RushHourPuzzle
+from node import Node
+
+UNSOLVABLE = -1
+
+
+def enumerate_component(s, successorFn):
+    """All states reachable from s, as a dict key -> state."""
+    states = {s.getStateKey(): s}
+    queue = deque([s])
+    while queue:
+        state = queue.popleft()
+        for _, successor in successorFn(state):
+            key = successor.getStateKey()
+            if key not in states:
+                states[key] = successor
+                queue.append(successor)
+    return states
+
+
+def retrograde_distances(states, successorFn, isGoal):
+    """Multi-source BFS from every goal state; moves are reversible, so successors are predecessors."""
+    distances = {}
+    queue = deque()
+    for key, state in states.items():
+        if isGoal(state):
+            distances[key] = 0
+            queue.append(state)
+    while queue:
+        state = queue.popleft()
+        d = distances[state.getStateKey()] + 1
+        for _, predecessor in successorFn(state):
+            key = predecessor.getStateKey()
+            if key not in distances:
+                distances[key] = d
+                queue.append(predecessor)
+    return {key: distances.get(key, UNSOLVABLE) for key in states}
+
+
+class DistanceTable:
+    """Sorted state keys with their exact distance to the nearest goal (UNSOLVABLE if none)."""
+
+    def __init__(self, layout, keys=None, distances=None):
+        self.layout = layout
+        self.keys = keys if keys is not None else array("Q")
+        self.distances = distances if distances is not None else array("i")
+
+    @classmethod
+    def build(cls, puzzle, successorFn=RushHourPuzzle.successorFunction, isGoal=RushHourPuzzle.isGoal):
+        table = cls(puzzle.layout)
+        table.extend(puzzle, successorFn, isGoal)
+        return table
+
+    def extend(self, puzzle, successorFn=RushHourPuzzle.successorFunction, isGoal=RushHourPuzzle.isGoal):
+        """Add the connected component of puzzle to the table (no-op if already present)."""
+        self._check_layout(puzzle)
+        if self.distance(puzzle) is not None:
+            return
+        component = retrograde_distances(enumerate_component(puzzle, successorFn), successorFn, isGoal)
+        merged = dict(zip(self.keys, self.distances))
+        merged.update(component)
+        keys = sorted(merged)
+        self.keys = array("Q", keys)
+        self.distances = array("i", (merged[key] for key in keys))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _check_layout(self, puzzle):
+        if puzzle.layout.signature != self.layout.signature:
+            raise ValueError("puzzle layout does not match the distance table")
+
+    def distance(self, state):
+        """Distance to goal, UNSOLVABLE, or None when the state is not in the table."""
+        key = state.getStateKey()
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.distances[i]
+        return None
+
+    def solve(self, puzzle, successorFn=RushHourPuzzle.successorFunction):
+        """Greedy descent along strictly decreasing distances; returns goal Node or False."""
+        self._check_layout(puzzle)
+        d = self.distance(puzzle)
+        if d is None:
+            raise KeyError("puzzle state is not in the distance table; extend() it first")
+        if d == UNSOLVABLE:
+            return False
+        node = Node(state=puzzle)
+        while d > 0:
+            action, successor = next((a, succ) for a, succ in successorFn(node.state)
+                                     if self.distance(succ) == d - 1)
+            node = Node(successor, node, action, node.g + 1)
+            d -= 1
+        return node
+
+    def save(self, path):
+        """Write a JSON header line (layout and entry count) followed by the raw key and distance arrays."""
+        header = dict(self.layout.toDict(), count=len(self.keys))
+        with open(path, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            self.keys.tofile(f)
+            self.distances.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            keys = array("Q")
+            keys.fromfile(f, header["count"])
+            distances = array("i")
+            distances.fromfile(f, header["count"])
+        return cls(Layout.fromDict(header), keys, distances)
+
+
+def main(argv):
+    if len(argv) != 3 or argv[0] not in ("build", "solve"):
+        print("usage: python distance_table.py build|solve <puzzle.csv> <table file>")
+        return 2
+    command, csv_file, table_file = argv
+    puzzle = RushHourPuzzle(csv_file=csv_file)
+
+    start = time.perf_counter()
+    if command == "build":
+        table = DistanceTable.build(puzzle)
+        table.save(table_file)
+        print(f"Built table with {len(table)} states in {time.perf_counter() - start:.2f}s -> {table_file}")
+        return 0
+
+    table = DistanceTable.load(table_file)
+    if table.distance(puzzle) is None:
+        table.extend(puzzle)
+        table.save(table_file)
+    node = table.solve(puzzle)
+    duration = time.perf_counter() - start
+    if node:
+        print(f"Table solution found in {len(node.getSolution())} moves ({duration:.3f}s).")
+    else:
+        print(f"No solution. ({duration:.3f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
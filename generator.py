@@ -0,0 +1,209 @@
+"""Generate hard puzzles: random layouts, keeping the states farthest from any goal.
+
+    python generator.py hard/ --count 200 --tries 5000 --size 6x6 --vehicles 12
+    python generator.py hard8/ --count 100 --size 8x8 --vehicles 15 --walls 2 --workers 8
+
+Each try draws a random layout, enumerates the connected component of that
+position and runs a multi-source BFS from the component's goal states; moves
+are reversible, so the last layer holds the states farthest from a goal. The
+hardest tries are written as CSVs (optimal depth in the file name) with an
+index.json listing their depths.
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rush_hour import RushHourPuzzle
+
+IDS = "ABCDEFGHIJKLMNOPQRSTUVWYZ"
+
+
+def random_layout(rng, height=6, width=6, vehicles=12, walls=0):
+    """Random non-overlapping placement with a horizontal X on row (height - 1) // 2.
+
+    No other horizontal vehicle or wall is placed in X's row, so the exit row
+    only ever gets blocked by vertical vehicles.
+    """
+    exit_row = (height - 1) // 2
+    puzzle = RushHourPuzzle()
+    puzzle.board_height, puzzle.board_width = height, width
+    occupied = set()
+
+    def place(vid, r, c, orientation, length):
+        cells = [(r + i, c) if orientation == "V" else (r, c + i) for i in range(length)]
+        if any(cell in occupied for cell in cells):
+            return False
+        occupied.update(cells)
+        puzzle.vehicles.append({"id": vid, "row": r, "col": c, "orientation": orientation, "length": length})
+        return True
+
+    place("X", exit_row, rng.randrange(width - 2), "H", 2)
+    for _ in range(walls * 10):
+        if len(puzzle.walls) == walls:
+            break
+        r, c = rng.randrange(height), rng.randrange(width)
+        if r != exit_row and (r, c) not in occupied:
+            occupied.add((r, c))
+            puzzle.walls.append((r, c))
+    for _ in range(vehicles * 10):
+        if len(puzzle.vehicles) > vehicles:
+            break
+        orientation = rng.choice("HV")
+        length = 3 if rng.random() < 0.25 else 2
+        if orientation == "H":
+            r, c = rng.randrange(height), rng.randrange(width - length + 1)
+            if r == exit_row:
+                continue
+        else:
+            r, c = rng.randrange(height - length + 1), rng.randrange(width)
+        place(IDS[len(puzzle.vehicles) - 1], r, c, orientation, length)
+    puzzle.setBoard()
+    return puzzle
+
+
+def _layers_numpy(layout, seeds):
+    from LayerBFS import contains_sorted, expand_layer, move_tables
+    import numpy as np
+    tables = move_tables(layout)
+    previous = np.empty(0, np.uint64)
+    current = np.unique(np.array(seeds, np.uint64))
+    while len(current):
+        yield current
+        children, _, _ = expand_layer(current, layout, tables)
+        keys = np.unique(children)
+        previous, current = current, keys[~(contains_sorted(current, keys) | contains_sorted(previous, keys))]
+
+
+def _layers_python(layout, seeds):
+    fromLayout = RushHourPuzzle.fromLayout
+    previous, current = set(), set(seeds)
+    while current:
+        yield sorted(current)
+        layer = set()
+        for key in current:
+            for _, child in fromLayout(layout, key).successorFunction():
+                if child.positions not in current and child.positions not in previous:
+                    layer.add(child.positions)
+        previous, current = current, layer
+
+
+def bfs_layers(layout, seeds):
+    """Yield the BFS layers (sorted state keys) from seeds, keeping only the last two in memory.
+
+    Moves are reversible, so deduplicating against the current and previous layer
+    is enough. Uses the NumPy layer expansion of LayerBFS when it is available.
+    """
+    try:
+        from LayerBFS import fits_uint64
+    except ImportError:
+        return _layers_python(layout, seeds)
+    return (_layers_numpy if fits_uint64(layout) else _layers_python)(layout, seeds)
+
+
+def farthest_states(puzzle, max_states=1 << 20):
+    """(depth, sorted keys at that depth) of the states farthest from a goal in puzzle's component.
+
+    A forward BFS collects the component's goal states, then a multi-source BFS
+    from them finds the last layer. Returns (None, []) when the component has no
+    goal or more than max_states states; layouts that Reachability proves
+    unsolvable are rejected before any search.
+    """
+    layout = puzzle.layout
+    if not puzzle.reachability().solvable:
+        return None, []
+    x_shift, pos_mask, goal_pos = layout.shifts[layout.x_index], layout.pos_mask, layout.goal_pos
+    goals = []
+    total = 0
+    for layer in bfs_layers(layout, [puzzle.getStateKey()]):
+        total += len(layer)
+        if total > max_states:
+            return None, []
+        goals.extend(int(key) for key in layer if (int(key) >> x_shift) & pos_mask == goal_pos)
+    if not goals:
+        return None, []
+
+    depth = -1
+    for depth, layer in enumerate(bfs_layers(layout, goals)):
+        last = layer
+    return depth, [int(key) for key in last]
+
+
+def try_layout(seed, height, width, vehicles, walls, max_states):
+    """One generator try; returns (depth, seed, positions of the hardest state), or None if unsolvable or too big."""
+    puzzle = random_layout(random.Random(seed), height, width, vehicles, walls)
+    depth, keys = farthest_states(puzzle, max_states)
+    if not depth:
+        return None
+    return depth, seed, keys[0]
+
+
+def generate(count, height=6, width=6, vehicles=12, walls=0, tries=1000, seed=0, workers=None,
+             max_states=1 << 20):
+    """The count hardest of `tries` random layouts, as a list of (depth, RushHourPuzzle), hardest first."""
+    seeds = [seed * 1000003 + i for i in range(tries)]
+    best = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(try_layout, seeds, *([arg] * tries for arg in (height, width, vehicles, walls, max_states)),
+                           chunksize=max(1, tries // (8 * (workers or os.cpu_count()))))
+        for result in results:
+            if result is None:
+                continue
+            if len(best) < count:
+                heapq.heappush(best, result)
+            else:
+                heapq.heappushpop(best, result)
+
+    puzzles = []
+    for depth, layout_seed, positions in sorted(best, reverse=True):
+        layout = random_layout(random.Random(layout_seed), height, width, vehicles, walls).layout
+        puzzles.append((depth, RushHourPuzzle.fromLayout(layout, positions)))
+    return puzzles
+
+
+def write_puzzles(puzzles, directory, prefix="hard"):
+    """Write each puzzle as <prefix>-NNNN-d<depth>.csv plus index.json; returns the file paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths, index = [], []
+    for i, (depth, puzzle) in enumerate(puzzles):
+        path = os.path.join(directory, f"{prefix}-{i:04d}-d{depth}.csv")
+        puzzle.saveCsv(path)
+        paths.append(path)
+        index.append({"file": os.path.basename(path), "depth": depth})
+    with open(os.path.join(directory, "index.json"), "w") as f:
+        json.dump(index, f, indent=2)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate hard Rush Hour puzzles.")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--count", type=int, default=100, help="puzzles to keep")
+    parser.add_argument("--tries", type=int, default=1000, help="random layouts to evaluate")
+    parser.add_argument("--size", default="6x6", help="board height x width")
+    parser.add_argument("--vehicles", type=int, default=12, help="vehicles besides X")
+    parser.add_argument("--walls", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-states", type=int, default=1 << 20,
+                        help="skip layouts whose component exceeds this many states")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    height, width = map(int, args.size.lower().split("x"))
+    start = time.perf_counter()
+    puzzles = generate(args.count, height, width, args.vehicles, args.walls, args.tries, args.seed, args.workers,
+                       args.max_states)
+    paths = write_puzzles(puzzles, args.directory)
+    duration = time.perf_counter() - start
+    depths = [depth for depth, _ in puzzles]
+    print(f"Wrote {len(paths)} puzzles to {args.directory} in {duration:.1f}s "
+          f"({args.tries / duration:.1f} layouts/s); depths {max(depths, default=0)}..{min(depths, default=0)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
-import pygame
+"""Sprite atlas loading (libGDX .atlas text files) that leaves pygame alone until a sprite is drawn."""
+import json
+import os
 
-def load_atlas(atlas_file, image_file):
-    sprites = {}
-    atlas_image = pygame.image.load(image_file).convert_alpha()
 
+def parse_atlas(atlas_file, names=None):
+    """{name: (x, y, w, h)} of the regions in atlas_file; only those in names when given."""
+    regions = {}
     with open(atlas_file, "r") as f:
         lines = [line.strip() for line in f if line.strip()]
 
@@ -12,7 +14,7 @@ def load_atlas(atlas_file, image_file):
         line = lines[i]
 
         # Skip metadata lines
-        if ":" in line:
+        if ":" in line or (names is not None and line not in names):
             i += 1
             continue
 
@@ -35,9 +37,78 @@ def load_atlas(atlas_file, image_file):
 
         x, y = map(int, xy_line.split(":")[1].split(","))
         w, h = map(int, size_line.split(":")[1].split(","))
-        rect = pygame.Rect(x, y, w, h)
-        sprites[name] = atlas_image.subsurface(rect)
+        regions[name] = (x, y, w, h)
+        if names is not None and len(regions) == len(names):
+            break
 
         i += 1
 
-    return sprites
+    return regions
+
+
+def load_index(atlas_file):
+    """All regions of atlas_file, read from <atlas_file>.index.json when it matches the atlas's mtime and size.
+
+    The index is rebuilt (and rewritten if the directory is writable) whenever the atlas changes.
+    """
+    index_file = atlas_file + ".index.json"
+    info = os.stat(atlas_file)
+    stamp = [info.st_mtime_ns, info.st_size]
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+        if index["stamp"] == stamp:
+            return {name: tuple(region) for name, region in index["regions"].items()}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    regions = parse_atlas(atlas_file)
+    try:
+        with open(index_file, "w") as f:
+            json.dump({"stamp": stamp, "regions": regions}, f)
+    except OSError:
+        pass
+    return regions
+
+
+class Atlas:
+    """Sprites of a texture atlas, cut out on first use.
+
+    Behaves like the {name: Surface} dict load_atlas used to build: the image is
+    loaded (and pygame imported) on the first lookup, and each sprite is a
+    subsurface made the first time its name is requested.
+    """
+
+    def __init__(self, regions, image_file):
+        self.regions = regions
+        self.image_file = image_file
+        self._image = None
+        self._sprites = {}
+
+    def __getitem__(self, name):
+        sprite = self._sprites.get(name)
+        if sprite is None:
+            import pygame
+            if self._image is None:
+                self._image = pygame.image.load(self.image_file).convert_alpha()
+            sprite = self._sprites[name] = self._image.subsurface(pygame.Rect(*self.regions[name]))
+        return sprite
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def __len__(self):
+        return len(self.regions)
+
+    def keys(self):
+        return self.regions.keys()
+
+
+def load_atlas(atlas_file, image_file, names=None):
+    """Atlas of the sprites in atlas_file.
+
+    With names, only those regions are parsed from the atlas text; otherwise
+    the region table comes from the cached index (see load_index).
+    """
+    regions = parse_atlas(atlas_file, set(names)) if names is not None else load_index(atlas_file)
+    return Atlas(regions, image_file)
@@ -1,11 +1,10 @@
-import time
 from rush_hour import RushHourPuzzle
-from BFS import bfs
-from Astar import astar, h1, h2, h3
+from solution_cache import SolutionCache, cached_solve
+from solvers import get_solver, solver_label
 
 
-def run_console_example(csv_file: str = "examples/1.csv") -> None:
-    """Run BFS and A* examples on a single puzzle."""
+def run_console_example(csv_file: str = "examples/1.csv", cache: SolutionCache = None) -> None:
+    """Run BFS and A* examples on a single puzzle, reusing cached solutions when a cache is given."""
     puzzle = RushHourPuzzle(csv_file=csv_file)
     print(f"\n=== {csv_file} ===")
     print(f"Board size: {puzzle.board_height} x {puzzle.board_width}")
@@ -14,50 +13,57 @@ def run_console_example(csv_file: str = "examples/1.csv") -> None:
 
     #BFS
     print("\nSolving with BFS...")
-    start_time = time.perf_counter()
-    node_bfs = bfs(puzzle, lambda s: s.successorFunction(), lambda s: s.isGoal())
-    duration = time.perf_counter() - start_time
+    node_bfs, stats = cached_solve(cache, puzzle, solver_label("bfs"), get_solver("bfs"))
+    source = "cached" if stats["cached"] else f"{stats['time']:.2f}s"
 
     if node_bfs:
-        print(f"BFS solution found in {len(node_bfs.getSolution())} moves ({duration:.2f}s).")
+        print(f"BFS solution found in {stats['moves']} moves ({source}).")
     else:
-        print(f"BFS found no solution. ({duration:.2f}s)")
+        print(f"BFS found no solution. ({source})")
 
     # A* with multiple heuristics
-    for i, heuristic in enumerate([h1, h2, h3], start=1):
-        print(f"\nRunning A* with h{i}...")
-        start_time = time.perf_counter()
-        node_astar = astar(puzzle, heuristic ,lambda s: s.successorFunction(), lambda s: s.isGoal())
-        duration = time.perf_counter() - start_time
+    for heuristic in ["h1", "h2", "h3"]:
+        print(f"\nRunning A* with {heuristic}...")
+        node_astar, stats = cached_solve(cache, puzzle, solver_label("astar", heuristic),
+                                         get_solver("astar", heuristic))
+        source = "cached" if stats["cached"] else f"{stats['time']:.2f}s"
 
         if node_astar:
-            print(f"A* (h{i}) solution: {len(node_astar.getSolution())} moves ({duration:.2f}s).")
+            print(f"A* ({heuristic}) solution: {stats['moves']} moves ({source}).")
         else:
-            print(f"A* (h{i}) found no solution. ({duration:.2f}s)")
+            print(f"A* ({heuristic}) found no solution. ({source})")
 
 
-def compare_algos(csv_path: str) -> None:
-    """Compare BFS and A* (h3) performance on a given puzzle."""
+def compare_algos(csv_path: str, cache: SolutionCache = None) -> None:
+    """Compare BFS, bidirectional BFS and A* (h3) performance on a given puzzle.
+
+    Timings are only meaningful without a cache; cached results are marked as such.
+    """
     print(f"\n=== Comparing algorithms on {csv_path} ===")
     puzzle = RushHourPuzzle(csv_file=csv_path)
 
+    def report(name, stats):
+        if stats["cached"]:
+            print(f"{name}: moves = {stats['moves']}, cached")
+            return
+        print(f"{name}: moves = {stats['moves']}, time = {stats['time']:.2f}s, "
+              f"expanded = {stats['expanded']}, generated = {stats['generated']}, "
+              f"peak open = {stats['peak_open']}, branching = {stats['branching_factor']:.2f}")
+
     # BFS
-    t1 = time.perf_counter()
-    node_bfs = bfs(puzzle, lambda s: s.successorFunction(), lambda s: s.isGoal())
-    t2 = time.perf_counter()
-    bfs_moves = len(node_bfs.getSolution()) if node_bfs else None
-    print(f"BFS: moves = {bfs_moves}, time = {t2 - t1:.2f}s")
+    _, stats = cached_solve(cache, puzzle, solver_label("bfs"), get_solver("bfs"))
+    report("BFS", stats)
 
-    # A*
-    t3 = time.perf_counter()
-    node_astar = astar(puzzle, h3, lambda s: s.successorFunction(), lambda s: s.isGoal())
-    t4 = time.perf_counter()
-    astar_moves = len(node_astar.getSolution()) if node_astar else None
-    print(f"A*: moves = {astar_moves}, time = {t4 - t3:.2f}s")
+    # Bidirectional BFS
+    _, stats = cached_solve(cache, puzzle, solver_label("bidirectional"), get_solver("bidirectional"))
+    report("Bidirectional BFS", stats)
 
+    # A*
+    _, stats = cached_solve(cache, puzzle, solver_label("astar", "h3"), get_solver("astar", "h3"))
+    report("A*", stats)
 
 if __name__ == "__main__":
-    run_console_example("examples/1.csv")
+    run_console_example("examples/1.csv", cache=SolutionCache())
 
     examples = [
         "examples/1.csv",
@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ("state", "parent", "action", "g", "f")
+
     def __init__(self,state,parent=None,action=None,g=0):
         self.state=state
         self.parent=parent
@@ -18,10 +20,12 @@ class Node:
         return path
     
     def getSolution(self):
+        """Action strings from the root; int move codes are named by the state (moveName)."""
         actions = []
         node = self
         while node.parent is not None:
-            actions.append(node.action)
+            action = node.action
+            actions.append(node.parent.state.moveName(action) if isinstance(action, int) else action)
             node = node.parent
         actions.reverse()
         return actions
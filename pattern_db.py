@@ -0,0 +1,181 @@
+"""Pattern-database heuristic for A*.
+
+The puzzle is abstracted to X plus the vehicles most likely to block it (all
+others are removed, so every abstract move sequence is a relaxation of a real
+one). Exact abstract distances to the goal are stored one byte per abstract
+state and are therefore an admissible heuristic for every puzzle sharing the
+layout:
+
+    python pattern_db.py build examples/2-e.csv 2-e.pdb
+    python pattern_db.py solve examples/2-e.csv 2-e.pdb
+"""
+import json
+import mmap
+import sys
+import time
+from collections import deque
+
+from rush_hour import Layout, RushHourPuzzle
+from Astar import astar
+
+UNREACHABLE = 255
+MAX_DISTANCE = UNREACHABLE - 1
+
+
+def relevant_vehicles(layout):
+    """Vehicle indexes ordered by how directly they can block X: X itself, vertical
+    vehicles able to cross X's row (rightmost column first), X's row-mates, then the rest."""
+    x = layout.x_index
+    exit_row = layout.lines[x]
+
+    def rank(i):
+        if i == x:
+            return (0, 0)
+        if layout.orientations[i] == "V":
+            return (1, -layout.lines[i])
+        if layout.lines[i] == exit_row:
+            return (2, 0)
+        # Horizontal vehicles in rows close to X's row can pin the vertical blockers
+        return (3, abs(layout.lines[i] - exit_row))
+
+    return sorted(range(len(layout.ids)), key=rank)
+
+
+class PatternDatabase:
+    """Abstract distances indexed by the mixed-radix positions of a vehicle subset."""
+
+    def __init__(self, layout, subset, data, offset=0):
+        self.layout = layout
+        self.subset = subset
+        self.data = data
+        self.offset = offset
+        self.__name__ = "pdb"
+        radices = [len(layout.cell_bits[i]) - layout.lengths[i] + 1 for i in subset]
+        self.strides = []
+        stride = 1
+        for radix in radices:
+            self.strides.append(stride)
+            stride *= radix
+        self.size = stride
+        self._terms = [(layout.shifts[i], s) for i, s in zip(subset, self.strides)]
+
+    @classmethod
+    def build(cls, puzzle, max_entries=1 << 22):
+        """Pick X plus as many relevant vehicles as fit in max_entries and run a retrograde BFS."""
+        layout = puzzle.layout
+        if layout.goal_pos is None:
+            raise ValueError("pattern databases need a horizontal X vehicle")
+        subset = []
+        size = 1
+        for i in relevant_vehicles(layout):
+            radix = len(layout.cell_bits[i]) - layout.lengths[i] + 1
+            if size * radix > max_entries:
+                continue
+            subset.append(i)
+            size *= radix
+
+        abstract = Layout(layout.board_height, layout.board_width, layout.walls,
+                          [{"id": layout.ids[i], "orientation": layout.orientations[i],
+                            "length": layout.lengths[i],
+                            "row": layout.lines[i] if layout.orientations[i] == "H" else 0,
+                            "col": layout.lines[i] if layout.orientations[i] == "V" else 0}
+                           for i in subset])
+        pdb = cls(layout, subset, bytearray([UNREACHABLE]) * size)
+        pdb._retrograde(abstract)
+        return pdb
+
+    def _abstract_index(self, abstract, positions):
+        index = 0
+        for k, stride in enumerate(self.strides):
+            index += ((positions >> abstract.shifts[k]) & abstract.pos_mask) * stride
+        return index
+
+    def _retrograde(self, abstract):
+        """Multi-source BFS from every abstract goal state (X at the exit, others anywhere legal)."""
+        data = self.data
+        queue = deque()
+        n = len(abstract.ids)
+
+        def place(k, positions, occupied):
+            if k == n:
+                queue.append(RushHourPuzzle.fromLayout(abstract, positions, occupied))
+                return
+            choices = [abstract.goal_pos] if k == abstract.x_index else range(len(abstract.cell_bits[k]) - abstract.lengths[k] + 1)
+            for p in choices:
+                mask = abstract.vehicleMask(k, p)
+                if not occupied & mask:
+                    place(k + 1, positions | (p << abstract.shifts[k]), occupied | mask)
+
+        place(0, 0, abstract.wall_mask)
+        for state in queue:
+            data[self._abstract_index(abstract, state.positions)] = 0
+
+        while queue:
+            state = queue.popleft()
+            d = min(data[self._abstract_index(abstract, state.positions)] + 1, MAX_DISTANCE)
+            for _, predecessor in state.successorFunction():
+                index = self._abstract_index(abstract, predecessor.positions)
+                if data[index] == UNREACHABLE:
+                    data[index] = d
+                    queue.append(predecessor)
+
+    def __call__(self, state):
+        """Admissible estimate; UNREACHABLE abstract states mean the state itself is unsolvable."""
+        positions = state.positions
+        pos_mask = self.layout.pos_mask
+        index = self.offset
+        for shift, stride in self._terms:
+            index += ((positions >> shift) & pos_mask) * stride
+        value = self.data[index]
+        return float("inf") if value == UNREACHABLE else value
+
+    def save(self, path):
+        """Write a JSON header line (layout and subset) followed by one distance byte per abstract state."""
+        header = dict(self.layout.toDict(), subset=self.subset, size=self.size)
+        with open(path, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a saved database; pages are only read as lookups touch them."""
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            offset = f.tell()
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(Layout.fromDict(header), header["subset"], data, offset)
+
+    def matches(self, puzzle):
+        return puzzle.layout.signature == self.layout.signature
+
+
+def main(argv):
+    if len(argv) != 3 or argv[0] not in ("build", "solve"):
+        print("usage: python pattern_db.py build|solve <puzzle.csv> <pdb file>")
+        return 2
+    command, csv_file, pdb_file = argv
+    puzzle = RushHourPuzzle(csv_file=csv_file)
+
+    start = time.perf_counter()
+    if command == "build":
+        pdb = PatternDatabase.build(puzzle)
+        pdb.save(pdb_file)
+        names = ", ".join(puzzle.layout.ids[i] for i in pdb.subset)
+        print(f"Built PDB over {{{names}}} ({pdb.size} entries) in {time.perf_counter() - start:.2f}s -> {pdb_file}")
+        return 0
+
+    pdb = PatternDatabase.load(pdb_file)
+    if not pdb.matches(puzzle):
+        print("Puzzle layout does not match the pattern database.")
+        return 1
+    node = astar(puzzle, pdb, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal)
+    duration = time.perf_counter() - start
+    if node:
+        print(f"A* (pdb) solution: {len(node.getSolution())} moves ({duration:.2f}s).")
+    else:
+        print(f"A* (pdb) found no solution. ({duration:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,86 +1,341 @@
 import csv
-from copy import deepcopy
+
+# Move codes of slides over several cells add SLIDE * (cells - 1) to the one-cell code
+SLIDE = 256
+
+
+class Layout:
+    """Static part of a puzzle shared by every state: board size, walls and vehicle shapes.
+
+    Each vehicle is reduced to one moving coordinate (the column of a horizontal
+    vehicle, the row of a vertical one). A state is then the packed int of those
+    coordinates plus an occupancy bitmask with one bit per cell (bit r * width + c).
+    """
+
+    def __init__(self, board_height, board_width, walls, vehicles):
+        self.board_height = board_height
+        self.board_width = board_width
+        self.walls = walls
+        self.ids = tuple(v["id"] for v in vehicles)
+        self.orientations = tuple(v["orientation"] for v in vehicles)
+        self.lengths = tuple(v["length"] for v in vehicles)
+        # Fixed coordinate: row of a horizontal vehicle, column of a vertical one
+        self.lines = tuple(v["row"] if v["orientation"] == "H" else v["col"] for v in vehicles)
+
+        self.bits = max(board_height, board_width).bit_length()
+        self.pos_mask = (1 << self.bits) - 1
+        self.shifts = tuple(i * self.bits for i in range(len(vehicles)))
+
+        self.wall_mask = 0
+        for r, c in walls:
+            if 0 <= r < board_height and 0 <= c < board_width:
+                self.wall_mask |= 1 << (r * board_width + c)
+
+        # cell_bits[i][p] = bit of the p-th cell along vehicle i's axis
+        self.cell_bits = []
+        for orientation, line in zip(self.orientations, self.lines):
+            if orientation == "H":
+                self.cell_bits.append(tuple(1 << (line * board_width + p) for p in range(board_width)))
+            else:
+                self.cell_bits.append(tuple(1 << (p * board_width + line) for p in range(board_height)))
+        self.cell_bits = tuple(self.cell_bits)
+
+        # Identifies boards that share this layout (same vehicles and walls, any positions)
+        self.signature = (board_height, board_width, tuple(sorted(tuple(w) for w in walls)),
+                          self.ids, self.orientations, self.lengths, self.lines)
+
+        self.x_index = self.ids.index("X") if "X" in self.ids else None
+        self.goal_pos = None
+        if self.x_index is not None and self.orientations[self.x_index] == "H":
+            self.goal_pos = board_width - self.lengths[self.x_index]
+
+    def moveName(self, move):
+        """Action string for a move code: vehicle index * 2, plus 1 for a backward (left / up) move,
+        plus SLIDE * (cells - 1) for a multi-cell slide ("Move B right 3"; one cell stays "Move B right").
+        """
+        extra, move = divmod(move, SLIDE)
+        i, backward = divmod(move, 2)
+        if self.orientations[i] == "H":
+            direction = "left" if backward else "right"
+        else:
+            direction = "up" if backward else "down"
+        name = f"Move {self.ids[i]} {direction}"
+        return f"{name} {extra + 1}" if extra else name
+
+    def toDict(self):
+        """JSON-friendly description; fromDict(toDict()) rebuilds an equivalent layout."""
+        return {
+            "board_height": self.board_height,
+            "board_width": self.board_width,
+            "walls": [list(w) for w in self.walls],
+            "vehicles": [{"id": vid, "orientation": o, "length": length, "line": line}
+                         for vid, o, length, line in zip(self.ids, self.orientations, self.lengths, self.lines)],
+        }
+
+    @classmethod
+    def fromDict(cls, data):
+        vehicles = []
+        for v in data["vehicles"]:
+            # Any position works: the layout only keeps the fixed coordinate
+            row, col = (v["line"], 0) if v["orientation"] == "H" else (0, v["line"])
+            vehicles.append({"id": v["id"], "row": row, "col": col,
+                             "orientation": v["orientation"], "length": v["length"]})
+        walls = [tuple(w) for w in data["walls"]]
+        return cls(data["board_height"], data["board_width"], walls, vehicles)
+
+    def vehicleMask(self, i, pos):
+        """Occupancy bits of vehicle i when its moving coordinate is pos."""
+        bits = self.cell_bits[i]
+        mask = 0
+        for p in range(pos, pos + self.lengths[i]):
+            mask |= bits[p]
+        return mask
+
+    def position(self, positions, i):
+        return (positions >> self.shifts[i]) & self.pos_mask
+
+
+class Reachability:
+    """Static bounds on the positions each vehicle can ever take, starting from one state.
+
+    A vehicle stays inside the wall-free stretch of its lane and never passes the
+    vehicles in the same lane. Cells a vehicle covers at both ends of its range are
+    covered at every position in between, so they act as walls for everyone else;
+    ranges are narrowed until nothing changes. The bounds never exclude a reachable
+    position, so if X's range stops short of the exit the puzzle has no solution.
+    """
+
+    def __init__(self, layout, positions):
+        n = len(layout.ids)
+        start = [layout.position(positions, i) for i in range(n)]
+        ranges = [(0, len(layout.cell_bits[i]) - layout.lengths[i]) for i in range(n)]
+        lanes = {}
+        for i in sorted(range(n), key=lambda i: start[i]):
+            lanes.setdefault((layout.orientations[i], layout.lines[i]), []).append(i)
+
+        while True:
+            cores = [self._core(layout, i, lo, hi) for i, (lo, hi) in enumerate(ranges)]
+            blocked = layout.wall_mask
+            for core in cores:
+                blocked |= core
+            narrowed = []
+            for i, (lo, hi) in enumerate(ranges):
+                bits, length, others = layout.cell_bits[i], layout.lengths[i], blocked & ~cores[i]
+                low = high = start[i]
+                while low > lo and not others & bits[low - 1]:
+                    low -= 1
+                while high < hi and not others & bits[high + length]:
+                    high += 1
+                narrowed.append((low, high))
+            for lane in lanes.values():
+                for a, b in zip(lane, lane[1:]):
+                    narrowed[b] = (max(narrowed[b][0], narrowed[a][0] + layout.lengths[a]), narrowed[b][1])
+                for a, b in zip(reversed(lane[:-1]), reversed(lane[1:])):
+                    narrowed[a] = (narrowed[a][0], min(narrowed[a][1], narrowed[b][1] - layout.lengths[a]))
+            if narrowed == ranges:
+                break
+            ranges = narrowed
+
+        self.ranges = tuple(ranges)
+        self.blocked = blocked
+        self.reason = self._deadlock(layout, cores)
+        self.solvable = self.reason is None
+
+    @staticmethod
+    def _core(layout, i, lo, hi):
+        """Cells vehicle i covers at every position in lo..hi."""
+        mask = 0
+        for p in range(hi, lo + layout.lengths[i]):
+            mask |= layout.cell_bits[i][p]
+        return mask
+
+    def _deadlock(self, layout, cores):
+        """Why X can never reach the exit, or None if the bounds allow it."""
+        if layout.goal_pos is None:
+            return "no horizontal X vehicle"
+        x = layout.x_index
+        if self.ranges[x][1] == layout.goal_pos:
+            return None
+        front = self.ranges[x][1] + layout.lengths[x]
+        row = layout.lines[x]
+        cell = layout.cell_bits[x][front]
+        if layout.wall_mask & cell:
+            return f"wall at ({row}, {front}) blocks the exit row"
+        for i, core in enumerate(cores):
+            if i != x and core & cell:
+                return f"{layout.ids[i]} can never leave ({row}, {front}) in the exit row"
+        return "a vehicle ahead of X in the exit row can never leave it"
+
 
 class RushHourPuzzle:
+    __slots__ = ("board_height", "board_width", "walls", "layout", "positions", "occupied", "_vehicles", "_board")
+
     def __init__(self,csv_file=None):
         self.board_height = 0
         self.board_width = 0
-        self.vehicles = [] 
-        self.walls = []     
-        self.board = []     
+        self.walls = []
+        self.layout = None
+        self.positions = 0
+        self.occupied = 0
+        self._vehicles = []
+        self._board = []
         if csv_file:
             self.setVehicles(csv_file)
             self.setBoard()
 
+    @classmethod
+    def fromLayout(cls, layout, positions, occupied=None):
+        """Build a state that shares layout with its parent; O(1) when occupied is given."""
+        puzzle = cls.__new__(cls)
+        puzzle.board_height = layout.board_height
+        puzzle.board_width = layout.board_width
+        puzzle.walls = layout.walls
+        puzzle.layout = layout
+        puzzle.positions = positions
+        if occupied is None:
+            occupied = layout.wall_mask
+            for i in range(len(layout.ids)):
+                occupied |= layout.vehicleMask(i, layout.position(positions, i))
+        puzzle.occupied = occupied
+        puzzle._vehicles = None
+        puzzle._board = None
+        return puzzle
+
+    @property
+    def vehicles(self):
+        """Vehicle dicts ({"id", "row", "col", "orientation", "length"}), built on first access."""
+        if self._vehicles is None:
+            layout = self.layout
+            vehicles = []
+            for i, vid in enumerate(layout.ids):
+                pos = layout.position(self.positions, i)
+                if layout.orientations[i] == "H":
+                    r, c = layout.lines[i], pos
+                else:
+                    r, c = pos, layout.lines[i]
+                vehicles.append({"id": vid, "row": r, "col": c,
+                                 "orientation": layout.orientations[i], "length": layout.lengths[i]})
+            self._vehicles = vehicles
+        return self._vehicles
+
+    @vehicles.setter
+    def vehicles(self, vehicles):
+        self._vehicles = vehicles
+
+    @property
+    def board(self):
+        """2D grid of cell contents (" ", "#" or a vehicle id), built on first access."""
+        if self._board is None:
+            board = [[" " for _ in range(self.board_width)] for _ in range(self.board_height)]
+            for r, c in self.walls:
+                if 0 <= r < self.board_height and 0 <= c < self.board_width:
+                    board[r][c] = "#"
+            for v in self.vehicles:
+                for i in range(v["length"]):
+                    r_pos = v["row"] + i if v["orientation"] == "V" else v["row"]
+                    c_pos = v["col"] + i if v["orientation"] == "H" else v["col"]
+                    board[r_pos][c_pos] = v["id"]
+            self._board = board
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self._board = board
+
     def setVehicles(self, csv_file):
         """Reads the CSV and generates vehicles and walls lists; sets board dimensions."""
         with open(csv_file, newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            
-            # First row = board size
-            first_row = next(reader)
-            self.board_height, self.board_width = map(int, first_row)
-
-            # Read remaining rows
-            for row in reader:
-                row = [cell.strip() for cell in row if cell.strip()]
-                if not row:
-                    continue
-                if row[0] == "#":
-                    c,r = int(row[1]), int(row[2])
-                    self.walls.append((r, c))
-                else:
-                    vid = row[0]
-                    c,r = int(row[1]), int(row[2])
-                    orientation = row[3]
-                    length = int(row[4])
-                    vehicle = {"id": vid, "row": r, "col": c, "orientation": orientation, "length": length}
-                    self.vehicles.append(vehicle)
+            self.readCsv(csvfile)
 
-    def setBoard(self):
-        # Initialize empty board
-        self.board = [[" " for _ in range(self.board_width)] for _ in range(self.board_height)]
+    def readCsv(self, lines):
+        """Same as setVehicles for CSV text already at hand (a file object or any iterable of lines)."""
+        reader = csv.reader(lines)
+
+        # First row = board size
+        first_row = next(reader)
+        self.board_height, self.board_width = map(int, first_row)
+
+        # Read remaining rows
+        for row in reader:
+            row = [cell.strip() for cell in row if cell.strip()]
+            if not row:
+                continue
+            if len(row) < (3 if row[0] == "#" else 5):
+                raise ValueError(f"CSV row {','.join(row)!r} has too few fields")
+            if row[0] == "#":
+                c,r = int(row[1]), int(row[2])
+                self.walls.append((r, c))
+            else:
+                vid = row[0]
+                c,r = int(row[1]), int(row[2])
+                orientation = row[3]
+                length = int(row[4])
+                vehicle = {"id": vid, "row": r, "col": c, "orientation": orientation, "length": length}
+                self.vehicles.append(vehicle)
 
+    def saveCsv(self, csv_file):
+        """Write this state in the format read by setVehicles (x before y, as in the examples)."""
+        with open(csv_file, "w", newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow([self.board_height, self.board_width])
+            for r, c in self.walls:
+                writer.writerow(["#", c, r])
+            for v in self.vehicles:
+                writer.writerow([v["id"], v["col"], v["row"], v["orientation"], v["length"]])
+
+    def setBoard(self):
+        """Validates vehicle placement and (re)builds the shared layout and packed state."""
         # Place walls
+        occupied = 0
         for r, c in self.walls:
             if 0 <= r < self.board_height and 0 <= c < self.board_width:
-                self.board[r][c] = "#"
+                occupied |= 1 << (r * self.board_width + c)
 
         # Place vehicles
+        placed = []
         for v in self.vehicles:
             r, c = v["row"], v["col"]
             length = v["length"]
             orientation = v["orientation"]
+            mask = 0
             can_place = True
 
             # Check bounds and overlap
             for i in range(length):
                 r_pos = r + i if orientation == "V" else r
                 c_pos = c + i if orientation == "H" else c
-                if r_pos >= self.board_height or c_pos >= self.board_width or self.board[r_pos][c_pos] != " ":
+                if not (0 <= r_pos < self.board_height and 0 <= c_pos < self.board_width):
+                    can_place = False
+                    break
+                bit = 1 << (r_pos * self.board_width + c_pos)
+                if occupied & bit:
                     can_place = False
                     break
+                mask |= bit
 
             # Place vehicle if possible
             if can_place:
-                for i in range(length):
-                    r_pos = r + i if orientation == "V" else r
-                    c_pos = c + i if orientation == "H" else c
-                    self.board[r_pos][c_pos] = v["id"]
+                occupied |= mask
+                placed.append(v)
             else:
                 print(f"Cannot place vehicle {v['id']} at ({r},{c})!")
 
+        self.layout = Layout(self.board_height, self.board_width, self.walls, placed)
+        positions = 0
+        for i, v in enumerate(placed):
+            pos = v["col"] if v["orientation"] == "H" else v["row"]
+            positions |= pos << self.layout.shifts[i]
+        self.positions = positions
+        self.occupied = occupied
+        self._vehicles = None
+        self._board = None
+
     def isGoal(self):
-        for v in self.vehicles:
-            if v["id"] == "X":
-                if v["orientation"] != "H":
-                    return False
-                c = v["col"]
-                length = v["length"] 
-                if (c == self.board_width - length):
-                    return True
-        return False
-        
+        layout = self.layout
+        if layout.goal_pos is None:
+            return False
+        return layout.position(self.positions, layout.x_index) == layout.goal_pos
+
     def printBoard(self):
         print("\nBoard:")
         print("   " + " ".join(f"{c}" for c in range(self.board_width)))
@@ -90,55 +345,120 @@ class RushHourPuzzle:
             print(row_str)
 
     def successorFunction(self):
+        """Legal one-cell moves as (move code, child); each child is derived from this state in O(1).
+
+        Move codes are small ints (see Layout.moveName); Node.getSolution turns them into
+        action strings such as "Move A right".
+        """
         successors = []
-        for v in self.vehicles:
-            vid = v["id"]
-            r, c = v["row"], v["col"]
-            length = v["length"]
-            orientation = v["orientation"]
+        layout = self.layout
+        positions = self.positions
+        occupied = self.occupied
+        pos_mask = layout.pos_mask
+        fromLayout = RushHourPuzzle.fromLayout
+        for i, shift in enumerate(layout.shifts):
+            p = (positions >> shift) & pos_mask
+            length = layout.lengths[i]
+            bits = layout.cell_bits[i]
 
-            if orientation == "H":
-                if c + length < self.board_width and self.board[r][c + length] == " ":
-                    new_puzzle = deepcopy(self)
-                    for nv in new_puzzle.vehicles:
-                        if nv["id"] == vid:
-                            nv["col"] += 1
-                            break
-                    new_puzzle.setBoard()
-                    action = f"Move {vid} right"
-                    successors.append((action, new_puzzle))
-                if c - 1 >= 0 and self.board[r][c - 1] == " ":
-                    new_puzzle = deepcopy(self)
-                    for nv in new_puzzle.vehicles:
-                        if nv["id"] == vid:
-                            nv["col"] -= 1
-                            break
-                    new_puzzle.setBoard()
-                    action = f"Move {vid} left"
-                    successors.append((action, new_puzzle))
-
-            elif orientation == "V":
-                if r + length < self.board_height and self.board[r + length][c] == " ":
-                    new_puzzle = deepcopy(self)
-                    for nv in new_puzzle.vehicles:
-                        if nv["id"] == vid:
-                            nv["row"] += 1
-                            break
-                    new_puzzle.setBoard()
-                    action = f"Move {vid} down"
-                    successors.append((action, new_puzzle))
-                    
-                if r - 1 >= 0 and self.board[r - 1][c] == " ":
-                    new_puzzle = deepcopy(self)
-                    for nv in new_puzzle.vehicles:
-                        if nv["id"] == vid:
-                            nv["row"] -= 1
-                            break
-                    new_puzzle.setBoard()
-                    action = f"Move {vid} up"
-                    successors.append((action, new_puzzle))
+            # Forward (right / down): the cell past the front end must be free
+            if p + length < len(bits) and not occupied & bits[p + length]:
+                successors.append((2 * i, fromLayout(layout, positions + (1 << shift),
+                                                     occupied ^ bits[p] ^ bits[p + length])))
+            # Backward (left / up): the cell before the rear end must be free
+            if p - 1 >= 0 and not occupied & bits[p - 1]:
+                successors.append((2 * i + 1, fromLayout(layout, positions - (1 << shift),
+                                                         occupied ^ bits[p - 1] ^ bits[p + length - 1])))
+
+        return successors
+
+    def slideSuccessors(self):
+        """Legal slides as (move code, child): every free distance of every vehicle is one action.
+
+        Searching with these optimizes the number of slides rather than cells; the
+        one-cell moves are included with the same codes as in successorFunction.
+        """
+        successors = []
+        layout = self.layout
+        positions = self.positions
+        occupied = self.occupied
+        pos_mask = layout.pos_mask
+        fromLayout = RushHourPuzzle.fromLayout
+        for i, shift in enumerate(layout.shifts):
+            p = (positions >> shift) & pos_mask
+            length = layout.lengths[i]
+            bits = layout.cell_bits[i]
+
+            # Forward: each further free cell past the front end is one more slide
+            child, d = occupied, 1
+            while p + length + d - 1 < len(bits) and not occupied & bits[p + length + d - 1]:
+                child ^= bits[p + d - 1] ^ bits[p + length + d - 1]
+                successors.append((2 * i + SLIDE * (d - 1), fromLayout(layout, positions + (d << shift), child)))
+                d += 1
+            # Backward: each further free cell before the rear end
+            child, d = occupied, 1
+            while p - d >= 0 and not occupied & bits[p - d]:
+                child ^= bits[p - d] ^ bits[p + length - d]
+                successors.append((2 * i + 1 + SLIDE * (d - 1), fromLayout(layout, positions - (d << shift), child)))
+                d += 1
 
         return successors
-    
+
+    def moveName(self, move):
+        return self.layout.moveName(move)
+
+    def goalStates(self):
+        """Yield every goal state consistent with this state's lane invariants.
+
+        Each vehicle stays inside its Reachability range and keeps its order within
+        its lane. The result is a superset of the goal states reachable from this state.
+        """
+        layout = self.layout
+        reachability = self.reachability()
+        if not reachability.solvable:
+            return
+        n = len(layout.ids)
+        start = [layout.position(self.positions, i) for i in range(n)]
+        ranges = list(reachability.ranges)
+        x = layout.x_index
+        ranges[x] = (layout.goal_pos, layout.goal_pos)
+
+        # Place lanes in order so each vehicle's predecessor in its lane is already placed
+        order = sorted(range(n), key=lambda i: (i != x, layout.orientations[i], layout.lines[i], start[i]))
+        previous = [None] * n
+        for k in range(1, n):
+            i, j = order[k], order[k - 1]
+            if j != x and (layout.orientations[i], layout.lines[i]) == (layout.orientations[j], layout.lines[j]):
+                previous[i] = j
+        # Horizontal vehicles sharing X's row must stay behind it
+        for i in range(n):
+            if i != x and (layout.orientations[i], layout.lines[i]) == ("H", layout.lines[x]):
+                if start[i] > start[x]:
+                    return
+                ranges[i] = (ranges[i][0], min(ranges[i][1], layout.goal_pos - layout.lengths[i]))
+
+        placed = [0] * n
+
+        def place(k, positions, occupied):
+            if k == n:
+                yield RushHourPuzzle.fromLayout(layout, positions, occupied)
+                return
+            i = order[k]
+            lo, hi = ranges[i]
+            if previous[i] is not None:
+                lo = max(lo, placed[previous[i]] + layout.lengths[previous[i]])
+            for p in range(lo, hi + 1):
+                mask = layout.vehicleMask(i, p)
+                if not occupied & mask:
+                    placed[i] = p
+                    yield from place(k + 1, positions | (p << layout.shifts[i]), occupied | mask)
+
+        yield from place(0, 0, layout.wall_mask)
+
+    def reachability(self):
+        """Reachability bounds of this state; reason says why it is unsolvable when solvable is False."""
+        return Reachability(self.layout, self.positions)
+
     def getStateKey(self):
-        return tuple(tuple(row) for row in self.board)
\ No newline at end of file
+        """Canonical key of this state: the packed vehicle positions (only comparable within one layout)."""
+        return self.positions
@@ -0,0 +1,120 @@
+import time
+
+
+class SearchStats:
+    """Counters filled in by the solvers (bfs, astar, idastar, bidirectional_bfs).
+
+    Pass an instance as stats=... to a solver. Counting is always on and costs a
+    few integer increments per expansion; heuristic and successor timing is only
+    collected when profile=True, by wrapping the two functions once per search.
+    """
+
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.successor_time = 0.0
+        self.elapsed = 0.0
+        self.depth = None
+        self.aborted = False
+        # Solver-specific extras
+        self.dropped = 0
+        self.iterations = 0
+        self.peak_depth = 0
+        self.peak_table = 0
+        self.peak_disk = 0  # bytes of layer files on disk (external_bfs)
+        self.bound = None  # suboptimality bound of the solution (arastar, weighted_astar)
+        self.workers = []  # per-worker dicts from parallel_bfs
+
+    @property
+    def branching_factor(self):
+        """Mean number of successors per expansion (generated + duplicates pruned)."""
+        return (self.generated + self.duplicates) / self.expanded if self.expanded else 0.0
+
+    def effectiveBranchingFactor(self):
+        """b* such that a uniform tree of the solution depth has expanded + 1 nodes."""
+        if not self.depth or not self.expanded:
+            return 0.0
+        total = self.expanded + 1
+        # b ** depth alone reaches total at this upper bound
+        lo, hi = 1.0, max(total ** (1.0 / self.depth), 1.0)
+        for _ in range(60):
+            b = (lo + hi) / 2
+            if sum(b ** i for i in range(self.depth + 1)) > total:
+                hi = b
+            else:
+                lo = b
+        return lo
+
+    def timedSuccessors(self, successorFn):
+        """successorFn itself, or a wrapper accumulating successor_time when profiling."""
+        if not self.profile:
+            return successorFn
+
+        def timed(state):
+            start = time.perf_counter()
+            result = successorFn(state)
+            self.successor_time += time.perf_counter() - start
+            return result
+        return timed
+
+    def timedHeuristic(self, heuristic):
+        """(heuristic, fromParent or None), wrapped to accumulate heuristic_time when profiling."""
+        incremental = getattr(heuristic, "fromParent", None)
+        if not self.profile:
+            return heuristic, incremental
+
+        def timed(state):
+            start = time.perf_counter()
+            value = heuristic(state)
+            self.heuristic_time += time.perf_counter() - start
+            return value
+
+        def timed_incremental(parent, parent_h, state):
+            start = time.perf_counter()
+            value = incremental(parent, parent_h, state)
+            self.heuristic_time += time.perf_counter() - start
+            return value
+        return timed, (timed_incremental if incremental is not None else None)
+
+    def asDict(self):
+        data = {name: getattr(self, name) for name in (
+            "expanded", "generated", "duplicates", "peak_open", "peak_closed", "heuristic_calls",
+            "heuristic_time", "successor_time", "elapsed", "depth", "aborted",
+            "dropped", "iterations", "peak_depth", "peak_table", "peak_disk", "bound", "workers")}
+        data["branching_factor"] = self.branching_factor
+        return data
+
+    def __repr__(self):
+        return (f"SearchStats(expanded={self.expanded}, generated={self.generated}, "
+                f"duplicates={self.duplicates}, peak_open={self.peak_open}, "
+                f"peak_closed={self.peak_closed}, elapsed={self.elapsed:.3f}s)")
+
+
+class Progress:
+    """Calls hook(stats) every `every` expansions; a truthy return value aborts the search."""
+
+    def __init__(self, hook=None, every=1000):
+        self.hook = hook
+        self.every = every
+        # -1 never matches an expansion count, so a disabled hook costs one int compare
+        self.next = every if hook is not None else -1
+
+    def __call__(self, stats):
+        self.next += self.every
+        if self.hook(stats):
+            stats.aborted = True
+            return True
+        return False
+
+
+def instrumented(search, *args, profile=False, **kwargs):
+    """Run search(*args, stats=..., **kwargs) and return (result, SearchStats)."""
+    stats = SearchStats(profile=profile)
+    result = search(*args, stats=stats, **kwargs)
+    return result, stats
@@ -0,0 +1,339 @@
+"""Long-running solver service: a local HTTP/JSON API over a process pool with warm caches.
+
+    python service.py --port 8765 --workers 4
+    curl --data-binary @examples/2-a.csv "http://127.0.0.1:8765/solve?algo=astar&heuristic=h3"
+    curl -d '{"puzzle": {"board_height": 6, ...}, "algo": "bfs", "timeout": 5}' http://127.0.0.1:8765/solve
+    curl http://127.0.0.1:8765/metrics
+
+POST /solve takes a puzzle CSV as the body (query parameters choose the solver)
+or a JSON object: {"csv": text} or {"puzzle": {"board_height", "board_width",
+"walls", "vehicles"}}, plus optional "algo", "heuristic", "moves", "timeout"
+(seconds), "solution" (include the move list, default true) and "cache"
+(default true). A JSON list of such objects is solved as one batch.
+
+Answers are kept in a SolutionCache, identical requests in flight share one
+solve, and every worker keeps the Layout (with the heuristic indexes attached to
+it) of each layout it has solved. GET /metrics reports throughput and latency
+percentiles.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import signal
+import sys
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from batch import SolveTimeout, _init_worker
+from rush_hour import RushHourPuzzle
+from search_stats import SearchStats
+from solution_cache import SolutionCache
+from solvers import ALGORITHMS, HEURISTICS, MOVES, get_solver, solver_label
+
+MAX_BODY = 1 << 20
+MAX_LAYOUTS = 1024  # warm layouts kept per worker
+GRACE = 1.0  # seconds the server waits past a timeout for the worker to report it
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+_layouts = OrderedDict()  # per worker: layout signature -> Layout, least recently used first
+
+
+def parse_puzzle(data):
+    """RushHourPuzzle from CSV text or a dict with board_height, board_width, walls and vehicles."""
+    puzzle = RushHourPuzzle()
+    if isinstance(data, str):
+        if not data.strip():
+            raise ValueError("empty puzzle")
+        puzzle.readCsv(io.StringIO(data))
+    else:
+        puzzle.board_height, puzzle.board_width = int(data["board_height"]), int(data["board_width"])
+        puzzle.walls = [(int(r), int(c)) for r, c in data.get("walls", [])]
+        puzzle.vehicles = [{"id": str(v["id"]), "row": int(v["row"]), "col": int(v["col"]),
+                            "orientation": v["orientation"], "length": int(v["length"])}
+                           for v in data["vehicles"]]
+    puzzle.setBoard()
+    return puzzle
+
+
+def describe(puzzle):
+    """The dict form read by parse_puzzle."""
+    return {"board_height": puzzle.board_height, "board_width": puzzle.board_width,
+            "walls": [list(w) for w in puzzle.walls], "vehicles": puzzle.vehicles}
+
+
+def _warm_layout(puzzle):
+    """puzzle on this worker's cached Layout for its layout, caching it on first sight."""
+    signature = puzzle.layout.signature
+    layout = _layouts.get(signature)
+    if layout is None:
+        _layouts[signature] = puzzle.layout
+        if len(_layouts) > MAX_LAYOUTS:
+            _layouts.popitem(last=False)
+        return puzzle, False
+    _layouts.move_to_end(signature)
+    return RushHourPuzzle.fromLayout(layout, puzzle.positions, puzzle.occupied), True
+
+
+def _solve(description, algo, heuristic, moves, time_limit):
+    """Solve one described puzzle inside a worker; always returns a result dict, never raises."""
+    puzzle, warm = _warm_layout(parse_puzzle(description))
+    stats = SearchStats()
+    result = {"warm_layout": warm, "solution": None}
+    start = time.perf_counter()
+    if time_limit:
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        node = get_solver(algo, heuristic, moves)(puzzle, stats)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        if node:
+            result.update(status="solved", solution=node.getSolution())
+        else:
+            result["status"] = "unsolvable"
+    except SolveTimeout:
+        result["status"] = "timeout"
+    except MemoryError:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        result["status"] = "memory"
+    except Exception as e:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["solve_time"] = round(time.perf_counter() - start, 6)
+    result["stats"] = stats.asDict()
+    return result
+
+
+def _ping():
+    return os.getpid()
+
+
+def _flag(value):
+    if isinstance(value, str):
+        return value.lower() not in ("0", "false", "no", "")
+    return bool(value)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0..100) of sorted values; None when empty."""
+    if not values:
+        return None
+    return values[max(-(-len(values) * q // 100) - 1, 0)]
+
+
+class SolverService:
+    """Request handling and metrics of the service; one instance per server."""
+
+    def __init__(self, workers=None, cache_path=":memory:", timeout=30.0, memory_limit_mb=None):
+        self.workers = workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(memory_limit_mb,))
+        self.cache = SolutionCache(cache_path) if cache_path else None
+        self.timeout = timeout
+        self.inflight = {}  # (layout signature, positions, solver label) -> running solve task
+        self.started = time.monotonic()
+        self.latencies = deque(maxlen=10000)  # (finished at, seconds) of recent requests
+        self.counts = Counter()
+
+    async def warmUp(self):
+        """Start every worker process now rather than on the first requests."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ping) for _ in range(self.workers)))
+
+    async def solve(self, request):
+        """Answer one /solve request dict; raises ValueError, KeyError or TypeError for a bad request."""
+        started = time.perf_counter()
+        algo = request.get("algo", "bfs")
+        heuristic = request.get("heuristic", "hs" if request.get("moves") == "slides" else "h3")
+        moves = request.get("moves", "cells")
+        if algo not in ALGORITHMS or heuristic not in HEURISTICS or moves not in MOVES:
+            raise ValueError(f"unknown solver {algo!r} / {heuristic!r} / {moves!r}")
+        timeout = float(request.get("timeout", self.timeout))
+        puzzle = parse_puzzle(request["csv"] if "csv" in request else request["puzzle"])
+        label = solver_label(algo, heuristic, moves)
+        use_cache = self.cache is not None and _flag(request.get("cache", True))
+
+        hit = self.cache.get(puzzle, label) if use_cache else None
+        if hit is not None:
+            actions, stats = hit
+            result = {"status": "solved" if actions is not None else "unsolvable", "solution": actions,
+                      "stats": stats, "cached": True}
+        else:
+            key = (puzzle.layout.signature, puzzle.positions, label)
+            task = self.inflight.get(key)
+            coalesced = task is not None
+            if task is None:
+                task = self.inflight[key] = asyncio.ensure_future(self._run(puzzle, algo, heuristic, moves, timeout))
+                task.add_done_callback(lambda _: self.inflight.pop(key, None))
+            result = dict(await asyncio.shield(task), cached=False, coalesced=coalesced)
+            if use_cache and not coalesced and result["status"] in ("solved", "unsolvable"):
+                self.cache.put(puzzle, label, result["solution"], result["stats"])
+
+        latency = time.perf_counter() - started
+        self.counts[result["status"]] += 1
+        self.counts["cached"] += result["cached"]
+        self.latencies.append((time.monotonic(), latency))
+        result.update(solver=label, moves=len(result["solution"]) if result["solution"] is not None else None,
+                      latency=round(latency, 6))
+        if not _flag(request.get("solution", True)):
+            del result["solution"]
+        return result
+
+    async def _run(self, puzzle, algo, heuristic, moves, timeout):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, _solve, describe(puzzle), algo, heuristic, moves, timeout)
+        try:
+            return await asyncio.wait_for(future, timeout + GRACE if timeout else None)
+        except asyncio.TimeoutError:
+            # The worker's own timer should have fired; it finishes in the background
+            return {"status": "timeout", "solution": None, "stats": None}
+
+    def metrics(self):
+        now = time.monotonic()
+        uptime = now - self.started
+        latencies = sorted(seconds for _, seconds in self.latencies)
+        recent = sum(1 for finished, _ in self.latencies if now - finished <= 60)
+        total = sum(count for status, count in self.counts.items() if status != "cached")
+        return {
+            "uptime": round(uptime, 3),
+            "workers": self.workers,
+            "requests": total,
+            "in_flight": len(self.inflight),
+            "statuses": dict(self.counts),
+            "throughput": {"overall": total / uptime if uptime else 0.0,
+                           "last_60s": recent / min(60.0, uptime) if uptime else 0.0},
+            "latency": dict({f"p{q}": percentile(latencies, q) for q in (50, 90, 95, 99)},
+                            max=latencies[-1] if latencies else None, window=len(latencies)),
+            "cache_entries": len(self.cache) if self.cache is not None else None,
+        }
+
+    async def route(self, method, target, headers, body):
+        """(HTTP status, JSON payload) for one request."""
+        url = urlsplit(target)
+        if url.path == "/metrics":
+            return 200, self.metrics()
+        if url.path == "/health":
+            return 200, {"status": "ok"}
+        if url.path != "/solve":
+            return 404, {"error": f"no such endpoint {url.path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        query = dict(parse_qsl(url.query))
+        try:
+            text = body.decode()
+            if headers.get("content-type", "").startswith("application/json") or text.lstrip()[:1] in ("{", "["):
+                data = json.loads(text)
+            else:
+                data = {"csv": text}
+            if isinstance(data, list):
+                results = await asyncio.gather(*(self._solveItem(query, item) for item in data),
+                                               return_exceptions=True)
+                return 200, [r if isinstance(r, dict) else {"status": "error", "error": f"{type(r).__name__}: {r}"}
+                             for r in results]
+            return 200, await self.solve(query | data)
+        except (ValueError, KeyError, TypeError) as e:
+            self.counts["bad_request"] += 1
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+
+    async def _solveItem(self, query, item):
+        """One batch entry; a bad item fails only its own slot of the batch."""
+        if not isinstance(item, dict):
+            raise TypeError(f"batch items must be objects, not {type(item).__name__}")
+        return await self.solve(query | item)
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": f"body over {MAX_BODY} bytes"}
+                    headers["connection"] = "close"
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.route(method, target, headers, body)
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # client went away or sent something that is not HTTP
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        if self.cache is not None:
+            self.cache.close()
+
+
+async def serve(host="127.0.0.1", port=8765, ready=None, **options):
+    """Run the service until cancelled or sent SIGTERM/SIGINT; ready(port) is called once it accepts connections.
+
+    Either signal cancels serve_forever, so close() shuts the worker pool down
+    instead of leaving its processes orphaned.
+    """
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, task.cancel)
+    service = SolverService(**options)
+    try:
+        await service.warmUp()
+        server = await asyncio.start_server(service.handle, host, port)
+        port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready(port)
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        service.close()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(signum)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Rush Hour solvers over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="default seconds per solve")
+    parser.add_argument("--memory-limit", type=int, default=None, help="MiB of address space per worker")
+    parser.add_argument("--cache", default=":memory:",
+                        help="SolutionCache path (default: in memory); an empty string disables it")
+    args = parser.parse_args(argv)
+
+    def ready(port):
+        print(f"Serving on http://{args.host}:{port} with {args.workers} workers", flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, ready, workers=args.workers, cache_path=args.cache,
+                          timeout=args.timeout, memory_limit_mb=args.memory_limit))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from canonical import MIRRORED_DIRECTION, mirror_preserves_exit, mirror_puzzle
+from node import Node
+from search_stats import SearchStats
+
+DEFAULT_PATH = os.environ.get("RUSHHOUR_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "rushhour", "solutions.sqlite"))
+
+
+def canonical_vehicles(puzzle):
+    """Vehicles in canonical order: X first, then by (row, col); a vehicle's index is its normalized ID."""
+    return sorted(puzzle.vehicles, key=lambda v: (v["id"] != "X", v["row"], v["col"]))
+
+
+def _description(puzzle):
+    return json.dumps({
+        "size": [puzzle.board_height, puzzle.board_width],
+        "walls": sorted([r, c] for r, c in puzzle.walls),
+        "vehicles": [[v["id"] == "X", v["row"], v["col"], v["orientation"], v["length"]]
+                     for v in canonical_vehicles(puzzle)],
+    }, sort_keys=True)
+
+
+def canonical_frame(puzzle):
+    """(puzzle or its top-bottom mirror, mirrored): the mirror is used when it keeps X's row
+    (see canonical.py) and describes smaller, so a puzzle and its mirror share cache entries."""
+    if mirror_preserves_exit(puzzle.layout):
+        mirrored = mirror_puzzle(puzzle)
+        if _description(mirrored) < _description(puzzle):
+            return mirrored, True
+    return puzzle, False
+
+
+def canonical_key(puzzle):
+    """Hash of board size, walls and vehicle placements, independent of the letters used for vehicles
+    and, where the exit row allows it, of a top-bottom mirror."""
+    frame, _ = canonical_frame(puzzle)
+    return hashlib.sha1(_description(frame).encode()).hexdigest()
+
+
+def replay(puzzle, actions):
+    """Rebuild the goal Node for a move list (one-cell moves or slides) by applying each action to the start state."""
+    node = Node(state=puzzle)
+    for action in actions:
+        move, successor = next((m, succ) for m, succ in node.state.slideSuccessors()
+                               if node.state.moveName(m) == action)
+        node = Node(successor, node, move, node.g + 1)
+    return node
+
+
+class SolutionCache:
+    """sqlite-backed cache of solutions and search stats with LRU eviction past max_entries."""
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=10000):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            " key TEXT PRIMARY KEY, moves TEXT, stats TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def _key(self, puzzle, algo):
+        return f"{canonical_key(puzzle)}:{algo}"
+
+    def get(self, puzzle, algo):
+        """Return (actions or None if unsolvable, stats) or None on a miss."""
+        key = self._key(puzzle, algo)
+        row = self.db.execute("SELECT moves, stats FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        moves, stats = row
+        if moves is None:
+            return None, json.loads(stats)
+        # Stored moves use canonical vehicle indexes (and frame); map them back to this puzzle's IDs
+        frame, mirrored = canonical_frame(puzzle)
+        vehicles = canonical_vehicles(frame)
+        actions = [" ".join(["Move", vehicles[index]["id"], MIRRORED_DIRECTION[direction] if mirrored else direction,
+                             *rest]) for index, direction, *rest in json.loads(moves)]
+        return actions, json.loads(stats)
+
+    def put(self, puzzle, algo, actions, stats):
+        """Store a move list (None for "no solution") and evict least recently used entries."""
+        moves = None
+        if actions is not None:
+            frame, mirrored = canonical_frame(puzzle)
+            index = {v["id"]: i for i, v in enumerate(canonical_vehicles(frame))}
+            moves = json.dumps([[index[vid], MIRRORED_DIRECTION[direction] if mirrored else direction, *rest]
+                                for _, vid, direction, *rest in (a.split() for a in actions)])
+        self.db.execute(
+            "INSERT OR REPLACE INTO solutions (key, moves, stats, last_used) VALUES (?, ?, ?, ?)",
+            (self._key(puzzle, algo), moves, json.dumps(stats), time.time()),
+        )
+        self.db.execute(
+            "DELETE FROM solutions WHERE key IN"
+            " (SELECT key FROM solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.db.commit()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def cached_solve(cache, puzzle, label, solve):
+    """
+    Solve puzzle through the cache.
+    - cache: SolutionCache or None to always solve
+    - label: solvers.solver_label of the configuration, so entries are shared with the UI and the service
+    - solve(puzzle, stats) -> goal Node or falsy, filling in a SearchStats; called on a miss
+    Entries store SearchStats.asDict(), like the UI and the service.
+    Returns (goal Node or False, stats dict plus "moves", "time" and "cached").
+    """
+    if cache is not None:
+        hit = cache.get(puzzle, label)
+        if hit is not None:
+            actions, stats = hit
+            node = replay(puzzle, actions) if actions is not None else False
+            return node, dict(stats, moves=len(actions) if actions is not None else None,
+                              time=stats.get("elapsed"), cached=True)
+
+    search = SearchStats()
+    node = solve(puzzle, search)
+    actions = node.getSolution() if node else None
+    stats = search.asDict()
+    if cache is not None:
+        cache.put(puzzle, label, actions, stats)
+    return node, dict(stats, moves=len(actions) if node else None, time=stats["elapsed"], cached=False)
@@ -0,0 +1,107 @@
+"""Named solver configurations shared by the command-line tools."""
+from rush_hour import RushHourPuzzle
+from BFS import bfs
+from BiBFS import bidirectional_bfs
+from Astar import astar, h1, h2, h3, hs
+from ARAstar import arastar, weighted_astar
+
+HEURISTICS = {"h1": h1, "h2": h2, "h3": h3, "hs": hs}
+
+ALGORITHMS = ("bfs", "bidirectional", "layer", "external", "astar", "wastar", "arastar")
+
+# Weighted A* ("wastar") orders by g + WEIGHT * h; ARA* ("arastar") starts at
+# ANYTIME_WEIGHT and improves its solution for up to ANYTIME_BUDGET seconds
+WEIGHT = 2.0
+ANYTIME_WEIGHT = 5.0
+ANYTIME_BUDGET = 2.0
+
+# Working-memory budget in bytes of the disk-backed BFS ("external"), which keeps its layers in files
+EXTERNAL_MEMORY = 256 << 20
+
+# "cells": one-cell moves, solutions are shortest in cells;
+# "slides": multi-cell slides are one action each, solutions are shortest in slides
+# (for A*, only with the slide-admissible heuristic hs)
+MOVES = ("cells", "slides")
+
+# Algorithms that take a heuristic (and carry it in their label)
+HEURISTIC_ALGORITHMS = ("astar", "wastar", "arastar")
+
+
+def get_solver(algo, heuristic="h3", moves="cells"):
+    """Return solve(puzzle, stats=None, progress=None, on_solution=None) -> goal Node or falsy for an
+    algorithm name (and heuristic for the A* variants, and move model, see MOVES); stats and progress
+    are passed on as in the solvers themselves, on_solution only to arastar. Starts that
+    RushHourPuzzle.reachability proves unsolvable return False without searching.
+    """
+    search = _get_search(algo, heuristic, moves)
+    anytime = algo == "arastar"
+
+    def solve(puzzle, stats=None, progress=None, on_solution=None):
+        if not puzzle.reachability().solvable:
+            return False
+        if anytime:
+            return search(puzzle, stats, progress, on_solution)
+        return search(puzzle, stats, progress)
+    return solve
+
+
+def _get_search(algo, heuristic, moves):
+    if moves not in MOVES:
+        raise ValueError(f"unknown move model {moves!r}; expected one of {', '.join(MOVES)}")
+    successorFn = RushHourPuzzle.slideSuccessors if moves == "slides" else RushHourPuzzle.successorFunction
+    isGoal = RushHourPuzzle.isGoal
+    if algo == "bfs":
+        return lambda puzzle, stats=None, progress=None: bfs(puzzle, successorFn, isGoal,
+                                                             stats=stats, progress=progress)
+    if algo == "bidirectional":
+        return lambda puzzle, stats=None, progress=None: bidirectional_bfs(puzzle, successorFn, isGoal,
+                                                                           stats=stats, progress=progress)
+    if algo in ("layer", "external"):
+        if moves == "slides":
+            raise ValueError(f"the {algo} search only expands one-cell moves")
+        # Imported here so the other solvers do not need numpy
+        if algo == "external":
+            from ExternalBFS import external_bfs
+            return lambda puzzle, stats=None, progress=None: external_bfs(puzzle, EXTERNAL_MEMORY,
+                                                                          stats=stats, progress=progress)
+        from LayerBFS import layer_bfs
+        return lambda puzzle, stats=None, progress=None: layer_bfs(puzzle, stats=stats, progress=progress)
+    if algo == "astar":
+        h = HEURISTICS[heuristic]
+        return lambda puzzle, stats=None, progress=None: astar(puzzle, h, successorFn, isGoal,
+                                                               stats=stats, progress=progress)
+    if algo == "wastar":
+        h = HEURISTICS[heuristic]
+        return lambda puzzle, stats=None, progress=None: weighted_astar(puzzle, h, successorFn, isGoal, WEIGHT,
+                                                                        stats=stats, progress=progress)
+    if algo == "arastar":
+        h = HEURISTICS[heuristic]
+        return lambda puzzle, stats=None, progress=None, on_solution=None: arastar(
+            puzzle, h, successorFn, isGoal, ANYTIME_WEIGHT, time_limit=ANYTIME_BUDGET, on_solution=on_solution,
+            stats=stats, progress=progress)
+    raise ValueError(f"unknown algorithm {algo!r}; expected one of {', '.join(ALGORITHMS)}")
+
+
+def solver_label(algo, heuristic="h3", moves="cells"):
+    """Cache/report label for a solver configuration, e.g. "bfs", "astar-h3" or "astar-hs-slides"."""
+    label = f"{algo}-{heuristic}" if algo in HEURISTIC_ALGORITHMS else algo
+    return f"{label}-slides" if moves == "slides" else label
+
+
+def solver_labels():
+    """Every configuration label: each algorithm, A* once per heuristic, and BFS and A* (hs) over slides.
+
+    ARA* is left out: how far it improves within its time budget depends on the machine.
+    """
+    labels = [solver_label(algo, h) for algo in ALGORITHMS if algo != "arastar"
+              for h in (sorted(HEURISTICS) if algo == "astar" else ["h3"])]
+    return labels + [solver_label("bfs", moves="slides"), solver_label("astar", "hs", "slides")]
+
+
+def parse_solver_label(label):
+    """Inverse of solver_label: "astar-h1" -> ("astar", "h1", "cells"), "bfs-slides" -> ("bfs", "h3", "slides")."""
+    parts = label.split("-")
+    moves = parts.pop() if parts[-1] in MOVES else "cells"
+    algo = parts[0]
+    heuristic = parts[1] if len(parts) > 1 else "h3"
+    return algo, heuristic, moves
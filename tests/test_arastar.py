@@ -0,0 +1,16 @@
+import pytest
+
+from ARAstar import arastar
+from Astar import h3
+from rush_hour import RushHourPuzzle
+
+
+@pytest.mark.parametrize("name", ["1", "2-a", "2-b", "2-c", "2-e", "e-f"])
+def test_on_solution_only_reports_improvements(name):
+    calls = []
+    node = arastar(RushHourPuzzle(f"examples/{name}.csv"), h3, RushHourPuzzle.successorFunction,
+                   RushHourPuzzle.isGoal, weight=5.0, on_solution=lambda n, bound: calls.append((n.g, bound)))
+    assert calls and calls[-1] == (node.g, 1.0)
+    for (g, bound), (next_g, next_bound) in zip(calls, calls[1:]):
+        assert next_g <= g and next_bound <= bound
+        assert next_g < g or next_bound < bound
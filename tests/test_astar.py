@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from Astar import astar, h3
+from rush_hour import RushHourPuzzle
+from search_stats import SearchStats
+from visited import IntHashMap, IntHashStore
+
+
+def solve(name, **kwargs):
+    stats = SearchStats()
+    node = astar(RushHourPuzzle(f"examples/{name}.csv"), h3, RushHourPuzzle.successorFunction,
+                 RushHourPuzzle.isGoal, stats=stats, **kwargs)
+    return node, stats
+
+
+@pytest.mark.parametrize("name, max_open, moves", [("1", 20, 11), ("2-b", 50, 103), ("2-c", 50, 110),
+                                                   ("2-a", 500, 27)])
+def test_capped_open_list_stays_optimal(name, max_open, moves):
+    node, stats = solve(name, max_open=max_open)
+    assert node is not None and node.g == moves
+    assert stats.dropped > 0 or name == "1"
+
+
+def test_capped_open_list_with_compact_stores():
+    node, stats = solve("2-b", max_open=50, closed=IntHashStore(), g_costs=IntHashMap())
+    plain, plain_stats = solve("2-b", max_open=50)
+    assert node.g == plain.g == 103
+    assert stats.expanded == plain_stats.expanded
+
+
+def test_int_hash_store_discard_matches_set():
+    rng = random.Random(3)
+    store, reference = IntHashStore(capacity=4), set()
+    for _ in range(20000):
+        key = rng.randrange(300)
+        if rng.random() < 0.5:
+            store.add(key)
+            reference.add(key)
+        else:
+            store.discard(key)
+            reference.discard(key)
+        assert (key in store) == (key in reference)
+    assert len(store) == len(reference) and sorted(store) == sorted(reference)
@@ -0,0 +1,61 @@
+import random
+
+from BFS import bfs
+from BiBFS import bidirectional_bfs
+from generator import random_layout
+from rush_hour import RushHourPuzzle
+from search_stats import SearchStats
+
+
+def solvable_layouts(seed, count):
+    rng = random.Random(seed)
+    found = []
+    while len(found) < count:
+        puzzle = random_layout(rng, 6, 6, rng.randrange(8, 14))
+        if puzzle.reachability().solvable:
+            found.append(puzzle)
+    return found
+
+
+def run(search, puzzle):
+    stats = SearchStats()
+    node = search(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal, stats=stats)
+    return (node.g if node else None), stats
+
+
+def test_matches_bfs_and_expands_fewer_nodes():
+    fewer = 0
+    for puzzle in solvable_layouts(7, 40):
+        bfs_moves, bfs_stats = run(bfs, puzzle)
+        moves, stats = run(bidirectional_bfs, puzzle)
+        assert moves == bfs_moves
+        assert stats.expanded <= bfs_stats.expanded
+        fewer += stats.expanded < bfs_stats.expanded
+    assert fewer > 0
+
+
+def test_solution_replays_to_a_goal():
+    puzzle = RushHourPuzzle("examples/1.csv")
+    node = bidirectional_bfs(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal)
+    path = node.getPath()
+    assert path[-1].isGoal() and len(path) == 12
+    for state, child in zip(path, path[1:]):
+        assert any(succ.positions == child.positions for _, succ in state.successorFunction())
+
+
+def test_goal_start_sets_elapsed():
+    puzzle = next(RushHourPuzzle("examples/1.csv").goalStates())
+    stats = SearchStats()
+    stats.elapsed = None
+    assert bidirectional_bfs(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal, stats=stats).g == 0
+    assert stats.elapsed is not None
+
+
+def test_too_many_goals_falls_back_to_one_sided():
+    puzzle = RushHourPuzzle("examples/2-b.csv")
+    bfs_moves, bfs_stats = run(bfs, puzzle)
+    stats = SearchStats()
+    node = bidirectional_bfs(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal,
+                             max_seeds=10, stats=stats)
+    assert node.g == bfs_moves == 103
+    assert stats.expanded == bfs_stats.expanded
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import warnings
+
+import pytest
+
+from service import SolverService
+
+with open("examples/1.csv") as f:
+    EXAMPLE = f.read()
+
+
+async def request(port, body, content_type="text/csv"):
+    """(status, JSON payload) of one POST /solve over a real connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = body.encode()
+    writer.write(f"POST /solve HTTP/1.1\r\nContent-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def run_requests(*bodies):
+    async def main():
+        service = SolverService(workers=1)
+        await service.warmUp()
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [await request(port, *body) for body in bodies]
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("csv", ["6,6\nX\n", "6,6\nX,2,0,H\n", "6,6\n#,1\n"])
+def test_malformed_csv_row_is_a_bad_request(csv):
+    [(status, payload)] = run_requests((csv,))
+    assert status == 400
+    assert "too few fields" in payload["error"]
+
+
+def test_bad_batch_item_only_fails_its_slot():
+    batch = json.dumps([{"csv": EXAMPLE}, 5, {"csv": EXAMPLE, "algo": "nope"}])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)  # "coroutine was never awaited"
+        [(status, payload)] = run_requests((batch, "application/json"))
+    assert status == 200
+    assert payload[0]["status"] == "solved" and len(payload[0]["solution"]) == 11
+    assert payload[1]["status"] == "error" and "TypeError" in payload[1]["error"]
+    assert payload[2]["status"] == "error" and "ValueError" in payload[2]["error"]
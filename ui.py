@@ -1,10 +1,12 @@
 import pygame
 import os
+import time
 
 from rush_hour import RushHourPuzzle
-from BFS import bfs
-from Astar import astar, h1, h2, h3
 from loader import load_atlas
+from solution_cache import SolutionCache, replay
+from solvers import solver_label
+from background_solver import BackgroundSolver
 
 csv_file = "examples/1.csv"
 
@@ -19,7 +21,7 @@ VCOLOR = (80, 130, 210)
 EXIT_COLOR = (60, 200, 100)
 TXT = (255, 255, 255)
 
-BTN_W, BTN_H = 220, 48
+BTN_W, BTN_H = 170, 48
 BTN_BG = (30, 180, 120)
 BTN_BG_HOVER = (26, 160, 108)
 BTN_BG_DISABLED = (160, 160, 160)
@@ -28,78 +30,135 @@ BTN_RADIUS = 10
 
 
 
-#DRAW FUNCTION
-def draw_board(screen, font, state: RushHourPuzzle, sprites):
-    # Road background
-    ROAD_COLOR = (50, 50, 50)
-    LANE_COLOR = (255, 255, 255)
-    DASH_LENGTH = 20
-
-    screen.fill(ROAD_COLOR)
-
-    # Draw horizontal lanes (dashed)
-    for r in range(state.board_height + 1):
-        y = MARGIN + r * CELL
-        for x in range(MARGIN, MARGIN + state.board_width * CELL, DASH_LENGTH * 2):
-            pygame.draw.line(screen, LANE_COLOR, (x, y), (x + DASH_LENGTH, y), 2)
-
-    # Draw vertical lanes (dashed)
-    for c in range(state.board_width + 1):
-        x = MARGIN + c * CELL
-        for y in range(MARGIN, MARGIN + state.board_height * CELL, DASH_LENGTH * 2):
-            pygame.draw.line(screen, LANE_COLOR, (x, y), (x, y + DASH_LENGTH), 2)
-
-    # Determine exit row (red car)
-    try:
-        X = next(v for v in state.vehicles if v["id"] == "X")
-        exit_row = X["row"]
-    except StopIteration:
-        exit_row = state.board_height // 2
-
-    # Draw exit
-    exit_x = MARGIN + state.board_width * CELL - (PADDING // 2)
-    exit_y = MARGIN + exit_row * CELL + PADDING
-    exit_h = CELL - 2 * PADDING
-    pygame.draw.rect(screen, EXIT_COLOR, (exit_x, exit_y, 12, exit_h), border_radius=6)
-
-    # Draw walls as barriers
-    for (r, c) in state.walls:
-        x = MARGIN + c * CELL
-        y = MARGIN + r * CELL
-        w = CELL
-        h = CELL
-        rect = pygame.Rect(x, y, w, h)
-        pygame.draw.rect(screen, (80, 80, 80), rect, border_radius=10)
-        pygame.draw.rect(screen, (0, 0, 0), rect, 1, border_radius=10)
-
-    # Function to select sprite
-    def get_vehicle_sprite(v):
-        if v["id"] == "X":
-            return sprites["figo2"]
-        elif v["length"] == 3:
-            return sprites["truck2"]
+ROAD_COLOR = (50, 50, 50)
+LANE_COLOR = (255, 255, 255)
+DASH_LENGTH = 20
+
+
+# Every name vehicle_sprite_name returns; the only atlas regions the UI loads
+SPRITE_NAMES = ("figo2", "truck2", "mustang3")
+
+
+def vehicle_sprite_name(v):
+    if v["id"] == "X":
+        return "figo2"
+    elif v["length"] == 3:
+        return "truck2"
+    else:
+        return "mustang3"
+
+
+def vehicle_rect(v):
+    """Screen rectangle covered by a vehicle dict."""
+    w = v["length"] * CELL if v["orientation"] == "H" else CELL
+    h = CELL if v["orientation"] == "H" else v["length"] * CELL
+    return pygame.Rect(MARGIN + v["col"] * CELL, MARGIN + v["row"] * CELL, w, h)
+
+
+class RenderCache:
+    """Static background and vehicle sprites for one puzzle layout, built once.
+
+    Sprites are rotated and scaled once per (sprite, orientation, length)
+    instead of on every frame.
+    """
+
+    def __init__(self, sprites, state: RushHourPuzzle, size):
+        self.sprites = sprites
+        self.scaled = {}
+        self.background = pygame.Surface(size).convert()
+        self._drawBackground(state)
+
+    def _drawBackground(self, state):
+        surface = self.background
+        surface.fill(ROAD_COLOR)
+
+        # Draw horizontal lanes (dashed)
+        for r in range(state.board_height + 1):
+            y = MARGIN + r * CELL
+            for x in range(MARGIN, MARGIN + state.board_width * CELL, DASH_LENGTH * 2):
+                pygame.draw.line(surface, LANE_COLOR, (x, y), (x + DASH_LENGTH, y), 2)
+
+        # Draw vertical lanes (dashed)
+        for c in range(state.board_width + 1):
+            x = MARGIN + c * CELL
+            for y in range(MARGIN, MARGIN + state.board_height * CELL, DASH_LENGTH * 2):
+                pygame.draw.line(surface, LANE_COLOR, (x, y), (x, y + DASH_LENGTH), 2)
+
+        # Determine exit row (red car)
+        try:
+            X = next(v for v in state.vehicles if v["id"] == "X")
+            exit_row = X["row"]
+        except StopIteration:
+            exit_row = state.board_height // 2
+
+        # Draw exit
+        exit_x = MARGIN + state.board_width * CELL - (PADDING // 2)
+        exit_y = MARGIN + exit_row * CELL + PADDING
+        exit_h = CELL - 2 * PADDING
+        pygame.draw.rect(surface, EXIT_COLOR, (exit_x, exit_y, 12, exit_h), border_radius=6)
+
+        # Draw walls as barriers
+        for (r, c) in state.walls:
+            rect = pygame.Rect(MARGIN + c * CELL, MARGIN + r * CELL, CELL, CELL)
+            pygame.draw.rect(surface, (80, 80, 80), rect, border_radius=10)
+            pygame.draw.rect(surface, (0, 0, 0), rect, 1, border_radius=10)
+
+    def vehicleSprite(self, v):
+        key = (vehicle_sprite_name(v), v["orientation"], v["length"])
+        sprite = self.scaled.get(key)
+        if sprite is None:
+            sprite = self.sprites[key[0]]
+            if v["orientation"] == "H":
+                sprite = pygame.transform.rotate(sprite, -90)
+            rect = vehicle_rect(v)
+            sprite = pygame.transform.scale(sprite, rect.size).convert_alpha()
+            self.scaled[key] = sprite
+        return sprite
+
+
+class BoardRenderer:
+    """Draws states through a RenderCache, repainting only vehicles that moved since the last frame."""
+
+    def __init__(self, cache: RenderCache):
+        self.cache = cache
+        self.drawn = None  # vehicle id -> rect on screen, None forces a full redraw
+        self.state = None
+        self.frames = 0
+        self.draw_time = 0.0
+
+    def invalidate(self):
+        self.drawn = None
+
+    def draw(self, screen, state: RushHourPuzzle):
+        """Draw state; returns the list of screen rects that changed."""
+        if state is self.state and self.drawn is not None:
+            return []
+        start = time.perf_counter()
+        rects = {v["id"]: (v, vehicle_rect(v)) for v in state.vehicles}
+        if self.drawn is None:
+            screen.blit(self.cache.background, (0, 0))
+            for v, rect in rects.values():
+                screen.blit(self.cache.vehicleSprite(v), rect)
+            dirty = [screen.get_rect()]
         else:
-            return sprites["mustang3"]
-
-    # Draw vehicles
-    for v in state.vehicles:
-        r, c = v["row"], v["col"]
-        sprite = get_vehicle_sprite(v)
-        if v["orientation"] == "H":
-            w = v["length"] * CELL
-            h = CELL
-            sprite = pygame.transform.rotate(sprite, -90)
-        else:
-            w = CELL
-            h = v["length"] * CELL
-
-        x = MARGIN + c * CELL
-        y = MARGIN + r * CELL
-
-        scaled_sprite = pygame.transform.scale(sprite, (w, h))
-        screen.blit(scaled_sprite, (x, y))
-
-
+            moved = [vid for vid, (_, rect) in rects.items() if self.drawn.get(vid) != rect]
+            dirty = []
+            # Vehicles never overlap, so restoring the background under the old rects
+            # cannot erase a vehicle that stayed put
+            for vid in moved:
+                old = self.drawn.get(vid)
+                if old is not None:
+                    screen.blit(self.cache.background, old, old)
+                    dirty.append(old)
+            for vid in moved:
+                v, rect = rects[vid]
+                screen.blit(self.cache.vehicleSprite(v), rect)
+                dirty.append(rect)
+        self.drawn = {vid: rect for vid, (_, rect) in rects.items()}
+        self.state = state
+        self.frames += 1
+        self.draw_time += time.perf_counter() - start
+        return dirty
 
 
 # BUTTON DRAW
@@ -113,14 +172,24 @@ def draw_button(screen, font, rect, text, enabled=True):
                       rect.y + (rect.height - txt.get_height()) // 2))
 
 
+# Button -> solvers it starts as (display name, algorithm, heuristic); several race each other.
+# "Solve with A*" is anytime (ARA*): a weighted solution within milliseconds, improved
+# towards optimal for up to solvers.ANYTIME_BUDGET seconds; Cancel plays the best so far
+SOLVE_BUTTONS = {
+    "Solve with BFS": [("BFS", "bfs", "h3")],
+    "Solve with A*": [("A*", "arastar", "h3")],
+    "Race BFS vs A*": [("BFS", "bfs", "h3"), ("A*", "astar", "h1")],
+}
+
+
 def run_ui():
     os.environ['SDL_VIDEO_CENTERED'] = '1'
     pygame.init()
 
     pygame.display.set_mode((1, 1))
-    sprites = load_atlas("assets/cars.atlas", "assets/cars.png") 
+    sprites = load_atlas("assets/cars.atlas", "assets/cars.png", SPRITE_NAMES)
     font = pygame.font.SysFont(None, 26)
-
+    cache = SolutionCache()
 
     puzzle = RushHourPuzzle(csv_file=csv_file)
     W = MARGIN * 2 + puzzle.board_width * CELL
@@ -128,17 +197,22 @@ def run_ui():
     screen = pygame.display.set_mode((W, H))
     pygame.display.set_caption("Rush Hour — Solver Visualizer")
     clock = pygame.time.Clock()
+    renderer = BoardRenderer(RenderCache(sprites, puzzle, (W, H)))
+    panel = pygame.Rect(0, MARGIN + puzzle.board_height * CELL, W, H - MARGIN - puzzle.board_height * CELL)
+    panel_key = None
 
     # Buttons
-    bfs_btn = pygame.Rect(W // 2 - BTN_W - 10, MARGIN + puzzle.board_height * CELL + 8, BTN_W, BTN_H)
-    astar_btn = pygame.Rect(W // 2 + 10, MARGIN + puzzle.board_height * CELL + 8, BTN_W, BTN_H)
-    restart_btn = pygame.Rect(W // 2 - BTN_W // 2, MARGIN + puzzle.board_height * CELL + 8, BTN_W, BTN_H)
+    btn_y = MARGIN + puzzle.board_height * CELL + 8
+    solve_btns = {text: pygame.Rect(W // 2 - BTN_W * 3 // 2 - 10 + i * (BTN_W + 10), btn_y, BTN_W, BTN_H)
+                  for i, text in enumerate(SOLVE_BUTTONS)}
+    restart_btn = pygame.Rect(W // 2 - BTN_W // 2, btn_y, BTN_W, BTN_H)
 
     # States
     path = None
     step = 0
     playing = False
-    solving = False
+    solves = []  # (display name, BackgroundSolver) while solving
+    message = None
     algo = None
     STEP_DELAY = 500
     last_step_time = pygame.time.get_ticks()
@@ -146,62 +220,126 @@ def run_ui():
     running = True
     while running:
         current_time = pygame.time.get_ticks()
+        requested = None
+        finished = None  # (display name, move list or None, suboptimality bound or None)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                if not solving and not path:
-                    if bfs_btn.collidepoint(event.pos):
-                        algo = "BFS"
-                        solving = True
-                        node = bfs(puzzle, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal)
-                        if node:
-                            path = node.getPath()
-                        solving = False
-                        playing = True
-                        step = 0
-                    elif astar_btn.collidepoint(event.pos):
-                        algo = "A*"
-                        solving = True
-                        node = astar(puzzle, h1, RushHourPuzzle.successorFunction, RushHourPuzzle.isGoal)
-                        if node:
-                            path = node.getPath()
-                        solving = False
-                        playing = True
-                        step = 0
-                elif path and restart_btn.collidepoint(event.pos):
+                if solves:
+                    if restart_btn.collidepoint(event.pos):
+                        best = min(((name, solver) for name, solver in solves if solver.actions is not None),
+                                   key=lambda item: len(item[1].actions), default=None)
+                        if best is not None:
+                            name, solver = best
+                            finished = (name, solver.actions, solver.bound)
+                        else:
+                            for _, solver in solves:
+                                solver.cancel()
+                            solves = []
+                            message = "Cancelled"
+                elif not path:
+                    requested = next((SOLVE_BUTTONS[text] for text, rect in solve_btns.items()
+                                      if rect.collidepoint(event.pos)), None)
+                elif restart_btn.collidepoint(event.pos):
                     puzzle = RushHourPuzzle(csv_file=csv_file)
                     path = None
                     algo = None
                     playing = False
-                    solving = False
+                    message = None
                     step = 0
 
+        # Start the requested solvers in the background, unless one is already cached
+        if requested:
+            for name, algo_name, heuristic in requested:
+                hit = cache.get(puzzle, solver_label(algo_name, heuristic))
+                if hit is not None:
+                    finished = (name, hit[0], hit[1].get("bound"))
+                    break
+            else:
+                solves = [(name, BackgroundSolver(puzzle, algo_name, heuristic))
+                          for name, algo_name, heuristic in requested]
+                message = None
+
+        # The first solver to finish with a solution wins; the others are cancelled
+        for name, solver in solves:
+            if solver.poll() and finished is None and not solver.error:
+                cache.put(puzzle, solver.label, solver.actions, solver.stats)
+                if solver.actions is not None:
+                    finished = (name, solver.actions, solver.bound)
+        if solves and finished is None and all(solver.done for _, solver in solves):
+            errors = [solver.error for _, solver in solves if solver.error]
+            finished = (None, None, None)
+            message = errors[0] if errors else "No solution"
+        if finished is not None:
+            for _, solver in solves:
+                solver.cancel()
+            solves = []
+            name, actions, bound = finished
+            if actions is not None:
+                path = replay(puzzle, actions).getPath()
+                algo = name if not bound or bound <= 1 else f"{name} (bound {bound:.2f})"
+                playing = True
+                step = 0
+                last_step_time = current_time
+            elif name is not None:
+                message = "No solution"
+
         # Auto-advance
-        if playing and not solving and path and current_time - last_step_time >= STEP_DELAY:
+        if playing and path and current_time - last_step_time >= STEP_DELAY:
             if step < len(path) - 1:
                 step += 1
                 last_step_time = current_time
             else:
                 playing = False
 
-        draw_board(screen, font, puzzle if not path else path[step], sprites)
-
-        if not path:
-            draw_button(screen, font, bfs_btn, "Solve with BFS", enabled=not solving)
-            draw_button(screen, font, astar_btn, "Solve with A*", enabled=not solving)
+        full_redraw = renderer.drawn is None
+        dirty = renderer.draw(screen, puzzle if not path else path[step])
+
+        # The button panel only changes with hover, solver progress, messages and step
+        mouse = pygame.mouse.get_pos()
+        progress = "  |  ".join(f"{name} {solver.stats.get('expanded', 0):,} nodes {solver.elapsed:.1f}s"
+                                + (f" bound {solver.bound:.2f}" if solver.bound else "")
+                                for name, solver in solves)
+        if solves:
+            key = ("solving", restart_btn.collidepoint(mouse), progress)
+        elif not path:
+            key = ("idle", message) + tuple(rect.collidepoint(mouse) for rect in solve_btns.values())
         else:
-            draw_button(screen, font, restart_btn, "Restart", enabled=not solving)
-            info = f"{algo} | Step: {step}/{len(path) - 1}"
-            info_surf = font.render(info, True, TXT)
-            screen.blit(info_surf, (restart_btn.right + 20, restart_btn.centery - info_surf.get_height() // 2))
-            if not playing:
-                done_surf = font.render("Done!", True, TXT)
-                screen.blit(done_surf, (restart_btn.right + 20, restart_btn.centery + info_surf.get_height()))
-
-        pygame.display.flip()
+            key = ("path", restart_btn.collidepoint(mouse), algo, step, playing)
+        if key != panel_key or full_redraw:
+            panel_key = key
+            screen.blit(renderer.cache.background, panel, panel)
+            status = None
+            if solves:
+                # With an ARA* solution in hand, stopping plays it instead of discarding it
+                incumbent = any(solver.actions is not None for _, solver in solves)
+                draw_button(screen, font, restart_btn, "Stop" if incumbent else "Cancel")
+                status = progress
+            elif not path:
+                for text, rect in solve_btns.items():
+                    draw_button(screen, font, rect, text)
+                status = message
+            else:
+                draw_button(screen, font, restart_btn, "Restart")
+                info = f"{algo} | Step: {step}/{len(path) - 1}"
+                info_surf = font.render(info, True, TXT)
+                screen.blit(info_surf, (restart_btn.right + 20, restart_btn.centery - info_surf.get_height() // 2))
+                if not playing:
+                    done_surf = font.render("Done!", True, TXT)
+                    screen.blit(done_surf, (restart_btn.right + 20, restart_btn.centery + info_surf.get_height()))
+            if status:
+                status_surf = font.render(status, True, TXT)
+                screen.blit(status_surf, ((W - status_surf.get_width()) // 2, restart_btn.bottom + 6))
+            dirty.append(panel)
+
+        if dirty:
+            pygame.display.update(dirty)
         clock.tick(30)
 
+    for _, solver in solves:
+        solver.cancel()
+    cache.close()
     pygame.quit()
 
 
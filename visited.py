@@ -0,0 +1,253 @@
+import sys
+from array import array
+
+from canonical import Canonicalizer
+
+
+class SetStore(set):
+    """Visited store backed by a plain Python set (fastest, ~60-100 bytes per state)."""
+
+    def nbytes(self):
+        return sys.getsizeof(self) + sum(sys.getsizeof(key) for key in self)
+
+
+class IntHashStore:
+    """Memory-lean visited store: open-addressing hash table of 64-bit ints.
+
+    Keys must be non-negative ints below 2**64 - 1 (RushHourPuzzle.getStateKey()
+    packs vehicle positions into such an int). Slots hold key + 1 so that 0 marks
+    an empty slot; the table doubles once it is more than max_load full.
+    """
+
+    _MULT = 0x9E3779B97F4A7C15
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity=1 << 10, max_load=0.7):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.max_load = max_load
+        self._alloc(size)
+
+    def _alloc(self, size):
+        self._slots = array("Q", bytes(8 * size))
+        self._shift = 64 - (size.bit_length() - 1)
+        self._limit = int(size * self.max_load)
+        self._len = 0
+
+    def _index(self, key):
+        return ((key * self._MULT) & self._MASK64) >> self._shift
+
+    def add(self, key):
+        """Insert key; returns True if it was not present."""
+        if key >= self._MASK64:
+            raise ValueError(f"key {key} does not fit in 64 bits")
+        slots = self._slots
+        mask = len(slots) - 1
+        stored = key + 1
+        i = self._index(key)
+        while True:
+            current = slots[i]
+            if current == 0:
+                break
+            if current == stored:
+                return False
+            i = (i + 1) & mask
+        slots[i] = stored
+        self._len += 1
+        if self._len > self._limit:
+            self._grow()
+        return True
+
+    def __contains__(self, key):
+        slots = self._slots
+        mask = len(slots) - 1
+        stored = key + 1
+        i = self._index(key)
+        while True:
+            current = slots[i]
+            if current == 0:
+                return False
+            if current == stored:
+                return True
+            i = (i + 1) & mask
+
+    def discard(self, key):
+        """Remove key if present (backward-shift deletion, so lookups never cross stale slots)."""
+        slots = self._slots
+        mask = len(slots) - 1
+        stored = key + 1
+        i = self._index(key)
+        while slots[i] != stored:
+            if slots[i] == 0:
+                return
+            i = (i + 1) & mask
+        # Pull later entries of the probe run back into the hole when their home slot allows it
+        j = i
+        while True:
+            j = (j + 1) & mask
+            current = slots[j]
+            if current == 0:
+                break
+            if (j - self._index(current - 1)) & mask >= (j - i) & mask:
+                slots[i] = current
+                i = j
+        slots[i] = 0
+        self._len -= 1
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return (stored - 1 for stored in self._slots if stored)
+
+    def _grow(self):
+        old = self._slots
+        self._alloc(len(old) * 2)
+        for stored in old:
+            if stored:
+                self.add(stored - 1)
+
+    def nbytes(self):
+        return sys.getsizeof(self) + self._slots.buffer_info()[1] * self._slots.itemsize
+
+
+class IntHashMap:
+    """Memory-lean int -> int map, the IntHashStore table with a parallel value array.
+
+    Holds per-state numbers such as A*'s g costs (see Astar.astar's g_costs):
+    keys as for IntHashStore, values unsigned and below 2**32. Supports the dict
+    operations the searches use: in, [], get, []= and del (backward-shift
+    deletion, so lookups never cross stale slots).
+    """
+
+    _MULT = IntHashStore._MULT
+    _MASK64 = IntHashStore._MASK64
+
+    def __init__(self, capacity=1 << 10, max_load=0.7):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.max_load = max_load
+        self._alloc(size)
+
+    def _alloc(self, size):
+        self._slots = array("Q", bytes(8 * size))
+        self._values = array("I", bytes(4 * size))
+        self._shift = 64 - (size.bit_length() - 1)
+        self._limit = int(size * self.max_load)
+        self._len = 0
+
+    def _index(self, key):
+        return ((key * self._MULT) & self._MASK64) >> self._shift
+
+    def _find(self, key):
+        """Slot holding key, or the empty slot that ends its probe sequence."""
+        slots = self._slots
+        mask = len(slots) - 1
+        stored = key + 1
+        i = self._index(key)
+        while True:
+            current = slots[i]
+            if current == 0 or current == stored:
+                return i
+            i = (i + 1) & mask
+
+    def __setitem__(self, key, value):
+        if key >= self._MASK64:
+            raise ValueError(f"key {key} does not fit in 64 bits")
+        i = self._find(key)
+        self._values[i] = value
+        if self._slots[i] == 0:
+            self._slots[i] = key + 1
+            self._len += 1
+            if self._len > self._limit:
+                self._grow()
+
+    def __getitem__(self, key):
+        i = self._find(key)
+        if self._slots[i] == 0:
+            raise KeyError(key)
+        return self._values[i]
+
+    def get(self, key, default=None):
+        i = self._find(key)
+        return self._values[i] if self._slots[i] else default
+
+    def __contains__(self, key):
+        return self._slots[self._find(key)] != 0
+
+    def __delitem__(self, key):
+        slots, values = self._slots, self._values
+        mask = len(slots) - 1
+        i = self._find(key)
+        if slots[i] == 0:
+            raise KeyError(key)
+        # Pull later entries of the probe run back into the hole when their home slot allows it
+        j = i
+        while True:
+            j = (j + 1) & mask
+            stored = slots[j]
+            if stored == 0:
+                break
+            if (j - self._index(stored - 1)) & mask >= (j - i) & mask:
+                slots[i], values[i] = stored, values[j]
+                i = j
+        slots[i] = values[i] = 0
+        self._len -= 1
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return (stored - 1 for stored in self._slots if stored)
+
+    def _grow(self):
+        slots, values = self._slots, self._values
+        self._alloc(len(slots) * 2)
+        for stored, value in zip(slots, values):
+            if stored:
+                self[stored - 1] = value
+
+    def nbytes(self):
+        return (sys.getsizeof(self) + self._slots.buffer_info()[1] * self._slots.itemsize
+                + self._values.buffer_info()[1] * self._values.itemsize)
+
+
+class CanonicalStore:
+    """Visited store for one layout that treats equivalent states as one (see canonical.py).
+
+    Keys are mapped by Canonicalizer.key before reaching the wrapped store, so a
+    state whose mirror image was visited counts as visited. Only a layout that is
+    its own mirror has such pairs; elsewhere this only costs the key mapping.
+    """
+
+    def __init__(self, layout, store=None):
+        self._key = Canonicalizer.of(layout).key
+        self.store = SetStore() if store is None else store
+
+    def add(self, key):
+        return self.store.add(self._key(key))
+
+    def __contains__(self, key):
+        return self._key(key) in self.store
+
+    def discard(self, key):
+        self.store.discard(self._key(key))
+
+    def __len__(self):
+        return len(self.store)
+
+    def nbytes(self):
+        return self.store.nbytes()
+
+
+BACKENDS = {
+    "set": SetStore,
+    "hash": IntHashStore,
+}
+
+
+def make_store(backend="set"):
+    """Create an empty visited store by backend name ("set" or "hash")."""
+    return BACKENDS[backend]()